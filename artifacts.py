@@ -0,0 +1,157 @@
+# pylint: disable=locally-disabled, line-too-long, logging-fstring-interpolation, broad-exception-caught
+"""
+Failure artifacts.
+
+When a job fails the worker only grabs the screenshot, DOM and browser console (the browser is about to be
+closed); a background thread compresses them into one zip per job id (data/artifacts/<job_id>.zip) and
+keeps the store under its size cap by deleting the least recently used artifacts.
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import zipfile
+
+from clock import get_clock
+
+logger = logging.getLogger('__name__')
+
+
+def capture_failure(driver, job_url, error_message, extra=None):
+    """
+    Grabs what is needed to debug a failed job from a live browser - without compressing or writing anything
+
+    Args:
+        driver: WebDriver instance
+        job_url (str): The failed job
+        error_message (str): Why it failed
+        extra (dict): Any other JSON-serializable details (e.g. the page fingerprint)
+
+    Returns:
+        dict: {file name: bytes or str}
+    """
+    files = {}
+    try:
+        files['screenshot.png'] = driver.get_screenshot_as_png()
+    except Exception as exc:
+        logger.warning(f"Could not capture screenshot: {repr(exc)}")
+    try:
+        files['page.html'] = driver.page_source
+    except Exception as exc:
+        logger.warning(f"Could not capture page source: {repr(exc)}")
+    try:
+        # Only Chrome exposes the console (requires the goog:loggingPrefs capability)
+        files['console.json'] = json.dumps(driver.get_log('browser'), indent=2)
+    except Exception:
+        pass
+
+    current_url = ''
+    try:
+        current_url = driver.current_url
+    except Exception:
+        pass
+    files['failure.json'] = json.dumps({
+        'job_url': job_url,
+        'current_url': current_url,
+        'error_message': error_message,
+        'captured_at': get_clock().now().strftime('%Y-%m-%d %H:%M:%S'),
+        **(extra or {}),
+    }, indent=2, default=str)
+    return files
+
+
+class ArtifactStore:
+    """
+    This class writes failure artifacts in a background thread and evicts the least recently used ones
+    once the store is over max_mb.
+    """
+    def __init__(self, root='data/artifacts', max_mb=200):
+        self.root = root
+        self.max_bytes = max_mb * 1024 * 1024
+        self._queue = queue.Queue()
+        self._submitted = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def path(self, job_id):
+        """
+        Where the artifact of job_id is (or will be) stored
+        """
+        return os.path.join(self.root, f'{job_id}.zip')
+
+    def submit(self, job_id, files):
+        """
+        Queues the files of a failed job for compression and returns the artifact path right away
+        """
+        with self._lock:
+            self._submitted.add(job_id)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='artifact-writer', daemon=True)
+                self._thread.start()
+        self._queue.put((job_id, files))
+        return self.path(job_id)
+
+    def reference(self, job_id):
+        """
+        Returns the artifact path of job_id if one was captured in this run, else ''
+        """
+        with self._lock:
+            return self.path(job_id) if job_id in self._submitted else ''
+
+    def open(self, job_id):
+        """
+        Opens the artifact of job_id for reading and marks it as recently used
+        """
+        path = self.path(job_id)
+        os.utime(path)
+        return zipfile.ZipFile(path)
+
+    def _run(self):
+        while True:
+            job_id, files = self._queue.get()
+            try:
+                self._write(job_id, files)
+                self._evict(keep=self.path(job_id))
+            except Exception as exc:
+                logger.warning(f"Could not store failure artifact of {job_id}: {repr(exc)}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, job_id, files):
+        os.makedirs(self.root, exist_ok=True)
+        path = self.path(job_id)
+        tmp_path = f'{path}.tmp'
+        with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=6) as artifact:
+            for name, content in files.items():
+                # PNGs are already compressed
+                artifact.writestr(name, content, compress_type=zipfile.ZIP_STORED if name.endswith('.png') else zipfile.ZIP_DEFLATED)
+        os.replace(tmp_path, path)
+        logger.info(f"Stored failure artifact {path} ({os.path.getsize(path) // 1024} KB)")
+
+    def _evict(self, keep):
+        entries = []
+        for name in os.listdir(self.root):
+            if name.endswith('.zip'):
+                path = os.path.join(self.root, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            os.remove(path)
+            total -= size
+            logger.info(f"Evicted failure artifact {path}")
+
+    def flush(self, timeout=30):
+        """
+        Waits (up to timeout seconds) until every queued artifact is written
+        """
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.1)
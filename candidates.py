@@ -0,0 +1,96 @@
+# pylint: disable=locally-disabled, line-too-long, logging-fstring-interpolation, broad-exception-caught
+"""
+Candidates.
+
+A candidate is everything that belongs to one applicant: the profile, the Workday credentials, the jobs file
+and the Firefox profile the browsers are cloned from. The default candidate comes from .env and
+data/profile.json; more candidates are listed in data/candidates.json, each with its own .env file for its
+credentials, e.g.
+
+    [
+        {"name": "alice", "profile": "data/candidates/alice/profile.json",
+         "env_file": "data/candidates/alice/.env", "jobs_file": "data/candidates/alice/jobs.csv"}
+    ]
+
+where data/candidates/alice/.env holds USER_EMAIL, USER_PASSWORD and optionally PROFILE_PATH.
+"""
+
+import json
+import logging
+import os
+import re
+
+from dotenv import dotenv_values
+
+from config import LazyProfile
+
+logger = logging.getLogger('__name__')
+
+DEFAULT_NAME = 'default'
+
+
+class Candidate:
+    """
+    This class holds the profile, credentials, jobs file and browser profile of one applicant.
+    """
+    def __init__(self, name, profile_file, email, password, jobs_file='jobs.csv', browser_profile=None, template_dir=None):
+        """
+        Args:
+            name (str): Short name, used in logs and for the Firefox profile template
+            profile_file (str): profile.json of the candidate (read on first use)
+            email (str): Workday account email
+            password (str): Workday account password
+            jobs_file (str): CSV or Excel file with the candidate's jobs
+            browser_profile (str): Real Firefox profile to clone sessions from, None for an empty one
+            template_dir (str): Where the slim Firefox profile template of the candidate is kept
+        """
+        self.name = name
+        self.profile = LazyProfile(profile_file)
+        self.email = email
+        self.password = password
+        self.jobs_file = jobs_file
+        self.browser_profile = browser_profile or None
+        self.template_dir = template_dir
+
+    def __repr__(self):
+        # Never the password
+        return f"Candidate({self.name!r}, {self.email!r})"
+
+
+def default_candidate(template_dir):
+    """
+    The candidate configured in .env (USER_EMAIL, USER_PASSWORD, PROFILE_PATH) with data/profile.json
+    """
+    return Candidate(DEFAULT_NAME, 'data/profile.json', os.getenv('USER_EMAIL'), os.getenv('USER_PASSWORD'),
+                     browser_profile=os.getenv('PROFILE_PATH'), template_dir=template_dir)
+
+
+def load_candidates(file, template_dir):
+    """
+    Reads the candidates listed in file, with the credentials from each candidate's env_file
+
+    Args:
+        file (str): JSON list of {name, profile, env_file, jobs_file}
+        template_dir (str): Template directory of the default candidate, the others get <template_dir>-<name>
+
+    Returns:
+        list: Candidate objects
+    """
+    with open(file, encoding='utf-8') as candidates_file:
+        entries = json.load(candidates_file)
+
+    candidates = []
+    for entry in entries:
+        name = entry['name']
+        if not re.fullmatch(r'[A-Za-z0-9_-]+', name):
+            raise ValueError(f"Invalid candidate name {name!r} in {file} - use letters, digits, _ and -")
+        if name in (candidate.name for candidate in candidates):
+            raise ValueError(f"Candidate {name!r} is listed twice in {file}")
+        settings = dotenv_values(entry['env_file']) if entry.get('env_file') else {}
+        if not settings.get('USER_EMAIL') or not settings.get('USER_PASSWORD'):
+            raise ValueError(f"Candidate {name!r}: USER_EMAIL and USER_PASSWORD must be set in {entry.get('env_file') or 'its env_file'}")
+        candidates.append(Candidate(name, entry['profile'], settings['USER_EMAIL'], settings['USER_PASSWORD'],
+                                    jobs_file=entry.get('jobs_file', f'data/candidates/{name}/jobs.csv'),
+                                    browser_profile=settings.get('PROFILE_PATH'), template_dir=f'{template_dir}-{name}'))
+    logger.info(f"Loaded {len(candidates)} candidate(s) from {file}: {', '.join(candidate.name for candidate in candidates)}")
+    return candidates
@@ -0,0 +1,138 @@
+# pylint: disable=locally-disabled, line-too-long, logging-fstring-interpolation, broad-exception-caught
+"""
+Per-tenant circuit breaker.
+
+When a tenant misbehaves (the page never stops loading, sign-in fails, the form changed) every further job
+of it would fail the same way after minutes of work. The breaker of a tenant opens after a number of
+consecutive failures of the same class; while it is open the tenant's jobs are skipped. After the cool-down
+one job is let through as a probe: if it succeeds the breaker closes, if it fails the breaker opens again
+for twice the cool-down.
+"""
+
+import logging
+import re
+
+from clock import get_clock
+from tenant_cache import get_tenant
+
+logger = logging.getLogger('__name__')
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+# Failure class -> pattern of the error messages of apply_to_job that belong to it (first match wins)
+FAILURE_CLASSES = (
+    ('loading', re.compile(r'stuck at loading', re.IGNORECASE)),
+    ('sign_in', re.compile(r'not logged in|sign in|wrong credentials|locked account|account settings button', re.IGNORECASE)),
+    ('deadline', re.compile(r'exceeded deadline|killed', re.IGNORECASE)),
+    ('form_changed', re.compile(r'button not found|not clickable|stuck on|exceeded \d+ steps|failed to process elements|proceed through application', re.IGNORECASE)),
+)
+# Longest cool-down after repeated failed probes
+MAX_COOLDOWN_FACTOR = 8
+
+
+def classify_failure(error_message):
+    """
+    Failure class of an error message of apply_to_job ('other' if no class matches)
+    """
+    for failure_class, pattern in FAILURE_CLASSES:
+        if pattern.search(error_message or ''):
+            return failure_class
+    return 'other'
+
+
+class CircuitBreaker:
+    """
+    This class keeps one breaker per tenant and decides which of the pending jobs may run.
+    """
+    def __init__(self, threshold=3, cooldown_seconds=1800):
+        """
+        Args:
+            threshold (int): Consecutive failures of one class that open a tenant's breaker (0 = never open)
+            cooldown_seconds (float): How long an opened breaker skips the tenant before a probe
+        """
+        self.threshold = threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.breakers = {}
+
+    def _breaker(self, tenant):
+        return self.breakers.setdefault(tenant, {'state': CLOSED, 'failure_class': None, 'failures': 0, 'opened_at': None,
+                                                 'cooldown': self.cooldown_seconds, 'trips': 0, 'trip_class': None, 'skipped': set()})
+
+    def _state(self, breaker):
+        if breaker['state'] == OPEN and get_clock().monotonic() - breaker['opened_at'] >= breaker['cooldown']:
+            breaker['state'] = HALF_OPEN
+        return breaker['state']
+
+    def allowed(self, job_urls):
+        """
+        The jobs of job_urls that may run now: all jobs of closed tenants, none of open ones and one probe job
+        of each tenant whose cool-down is over
+        """
+        allowed, probing = [], set()
+        for job_url in job_urls:
+            tenant = get_tenant(job_url)
+            breaker = self.breakers.get(tenant)
+            state = self._state(breaker) if breaker else CLOSED
+            if state == CLOSED:
+                allowed.append(job_url)
+            elif state == HALF_OPEN and tenant not in probing:
+                probing.add(tenant)
+                allowed.append(job_url)
+            else:
+                breaker['skipped'].add(job_url)
+        return allowed
+
+    def next_probe_in(self, job_urls):
+        """
+        Seconds until the first open breaker among the tenants of job_urls lets a probe through, None if none
+        of them is open (or all of them are already at the longest cool-down)
+        """
+        waits = []
+        for tenant in {get_tenant(job_url) for job_url in job_urls}:
+            breaker = self.breakers.get(tenant)
+            if breaker and self._state(breaker) == OPEN and breaker['cooldown'] < self.cooldown_seconds * MAX_COOLDOWN_FACTOR:
+                waits.append(breaker['opened_at'] + breaker['cooldown'] - get_clock().monotonic())
+        return max(0.0, min(waits)) if waits else None
+
+    def record(self, job_url, success, error_message=''):
+        """
+        Updates the breaker of the job's tenant with the outcome of the job
+        """
+        tenant = get_tenant(job_url)
+        breaker = self._breaker(tenant)
+        breaker['skipped'].discard(job_url)
+        state = self._state(breaker)
+        if success:
+            if state == HALF_OPEN:
+                logger.info(f"Circuit breaker of {tenant} closed - probe job succeeded")
+            breaker.update(state=CLOSED, failure_class=None, failures=0, cooldown=self.cooldown_seconds)
+            return
+
+        failure_class = classify_failure(error_message)
+        if state == HALF_OPEN:
+            breaker['cooldown'] = min(breaker['cooldown'] * 2, self.cooldown_seconds * MAX_COOLDOWN_FACTOR)
+            self._open(tenant, breaker, failure_class, 'probe job failed')
+            return
+        breaker['failures'] = breaker['failures'] + 1 if failure_class == breaker['failure_class'] else 1
+        breaker['failure_class'] = failure_class
+        if self.threshold and breaker['failures'] >= self.threshold:
+            self._open(tenant, breaker, failure_class, f"{breaker['failures']} consecutive '{failure_class}' failures")
+
+    def _open(self, tenant, breaker, failure_class, reason):
+        breaker.update(state=OPEN, failure_class=failure_class, opened_at=get_clock().monotonic(), trips=breaker['trips'] + 1,
+                       trip_class=failure_class)
+        logger.warning(f"Circuit breaker of {tenant} opened ({reason}) - skipping its jobs for {breaker['cooldown'] / 60:.0f} min")
+
+    def report(self):
+        """
+        Prints the breakers that opened during the run
+        """
+        tripped = {tenant: breaker for tenant, breaker in self.breakers.items() if breaker['trips']}
+        if not tripped:
+            return
+        logger.info("Circuit breakers:")
+        for tenant, breaker in tripped.items():
+            logger.info(f"  {tenant:<40} {self._state(breaker):<9} opened {breaker['trips']}x, last failure class '{breaker['trip_class']}', "
+                        f"{len(breaker['skipped'])} job(s) skipped")
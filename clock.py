@@ -0,0 +1,127 @@
+# pylint: disable=locally-disabled, line-too-long, logging-fstring-interpolation, broad-exception-caught
+"""
+Injectable clock.
+
+All waits, time reads and random delays of the automation go through the clock set here. The real clock
+sleeps and reads the system time; the virtual clock returns from sleep() at once and only moves its own time
+forward, recording how long the run would have waited. With a virtual clock and a seed, orchestration
+(planning, retries, pauses between jobs) over thousands of fake jobs runs in seconds and the same way
+every time:
+
+    with virtual_time(seed=1) as clock:
+        process_all_jobs(...)          # with apply_to_job replaced by a fake
+        print(clock.slept)
+
+Waits on other processes (lock files, browser processes) stay in real time.
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+
+class RealClock:
+    """
+    This class is the system clock with the global random generator.
+    """
+    def __init__(self):
+        self.random = random
+
+    def sleep(self, seconds):
+        """
+        Waits seconds
+        """
+        time.sleep(seconds)
+
+    def monotonic(self):
+        """
+        Seconds for measuring durations
+        """
+        return time.monotonic()
+
+    def now(self):
+        """
+        Current local date and time
+        """
+        return datetime.now()
+
+
+class VirtualClock:
+    """
+    This class is a clock whose time only moves when someone sleeps. Sleeps return immediately and are
+    added up in slept (the sleeps of all threads share one time line).
+    """
+    def __init__(self, start=None, seed=0):
+        """
+        Args:
+            start (datetime): Date and time the clock starts at, now by default
+            seed (int): Seed of the random generator used for delays
+        """
+        self.start = start or datetime.now()
+        self.random = random.Random(seed)
+        self.elapsed = 0.0
+        self.slept = 0.0
+        self.sleeps = 0
+        self._lock = threading.Lock()
+
+    def sleep(self, seconds):
+        """
+        Moves the time seconds forward without waiting
+        """
+        with self._lock:
+            self.elapsed += max(0.0, seconds)
+            self.slept += max(0.0, seconds)
+            self.sleeps += 1
+
+    def advance(self, seconds):
+        """
+        Moves the time forward for work that takes time without sleeping (e.g. a simulated application)
+        """
+        with self._lock:
+            self.elapsed += max(0.0, seconds)
+
+    def monotonic(self):
+        """
+        Seconds since the clock started
+        """
+        return self.elapsed
+
+    def now(self):
+        """
+        Start time plus the time that has passed on this clock
+        """
+        return self.start + timedelta(seconds=self.elapsed)
+
+
+_clock = RealClock()
+
+
+def get_clock():
+    """
+    Returns the clock in use
+    """
+    return _clock
+
+
+def set_clock(clock):
+    """
+    Replaces the clock in use, returns the previous one
+    """
+    global _clock  # pylint: disable=global-statement
+    previous, _clock = _clock, clock
+    return previous
+
+
+@contextmanager
+def virtual_time(start=None, seed=0):
+    """
+    Runs the block on a new VirtualClock and restores the previous clock afterwards
+    """
+    clock = VirtualClock(start, seed)
+    previous = set_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_clock(previous)
@@ -0,0 +1,146 @@
+# pylint: disable=locally-disabled, line-too-long, logging-fstring-interpolation, broad-exception-caught
+"""
+WebDriver command accounting.
+
+Every WebDriver command (find_element(s), execute_script, click, send_keys, get, ...) goes through
+driver.execute(); the profiler wraps it on one driver instance, times each command and attributes it to
+the innermost calling function of the automation code (e.g. safe_send_keys, open_and_click_dropdown).
+Explicit sleeps done through sleep() are attributed the same way, so a job's summary shows how much of
+each function's time is browser round trips and how much is waiting in Python.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+from clock import get_clock
+
+logger = logging.getLogger('__name__')
+
+# Helpers whose cost belongs to their caller
+TRANSPARENT_FUNCTIONS = {'sleep', 'wait_here', '<lambda>', '<listcomp>', '<genexpr>', '<dictcomp>'}
+
+_local = threading.local()
+
+
+def current_profiler():
+    """
+    Returns the profiler active in this thread, None if profiling is off
+    """
+    return getattr(_local, 'profiler', None)
+
+
+def sleep(seconds):
+    """
+    Sleep on the clock in use (see clock.py) that is counted by the active profiler
+    """
+    clock = get_clock()
+    started = clock.monotonic()
+    clock.sleep(seconds)
+    profiler = current_profiler()
+    if profiler:
+        profiler.add_sleep(clock.monotonic() - started)
+
+
+class CommandProfiler:
+    """
+    This class counts and times the WebDriver commands and sleeps of one job per calling function.
+    """
+    def __init__(self, job_url='', source_files=()):
+        """
+        Args:
+            job_url (str): Job being profiled (for the summary)
+            source_files (iterable): Files whose functions commands are attributed to
+        """
+        self.job_url = job_url
+        self.source_files = {os.path.abspath(path) for path in source_files}
+        self.stats = defaultdict(lambda: {'commands': 0, 'command_time': 0.0, 'sleeps': 0, 'sleep_time': 0.0, 'by_command': Counter()})
+        self._lock = threading.Lock()
+
+    def activate(self):
+        """
+        Makes this the profiler of the current thread (used by sleep())
+        """
+        _local.profiler = self
+        return self
+
+    def deactivate(self):
+        """
+        Stops attributing sleeps of the current thread to this profiler
+        """
+        if current_profiler() is self:
+            _local.profiler = None
+
+    def attach(self, driver):
+        """
+        Wraps driver.execute so every command of this driver is counted
+        """
+        execute = driver.execute
+
+        def profiled_execute(driver_command, params=None):
+            started = time.perf_counter()
+            try:
+                return execute(driver_command, params)
+            finally:
+                self.add_command(driver_command, time.perf_counter() - started)
+
+        driver.execute = profiled_execute
+        return driver
+
+    def _caller(self):
+        frame = sys._getframe(2)  # pylint: disable=protected-access
+        while frame is not None:
+            code = frame.f_code
+            if code.co_name not in TRANSPARENT_FUNCTIONS and os.path.abspath(code.co_filename) in self.source_files:
+                return code.co_name
+            frame = frame.f_back
+        return '<other>'
+
+    def add_command(self, command, duration):
+        """
+        Counts one WebDriver command for the calling function
+        """
+        caller = self._caller()
+        with self._lock:
+            stats = self.stats[caller]
+            stats['commands'] += 1
+            stats['command_time'] += duration
+            stats['by_command'][command] += 1
+
+    def add_sleep(self, duration):
+        """
+        Counts one sleep for the calling function
+        """
+        caller = self._caller()
+        with self._lock:
+            stats = self.stats[caller]
+            stats['sleeps'] += 1
+            stats['sleep_time'] += duration
+
+    def totals(self):
+        """
+        Returns the command count, command time and sleep time of the whole job
+        """
+        with self._lock:
+            return {
+                'commands': sum(stats['commands'] for stats in self.stats.values()),
+                'command_time': sum(stats['command_time'] for stats in self.stats.values()),
+                'sleep_time': sum(stats['sleep_time'] for stats in self.stats.values()),
+            }
+
+    def report(self, top=20):
+        """
+        Logs the per-function summary, most expensive functions first
+        """
+        totals = self.totals()
+        logger.info(f"\n=== WebDriver Commands: {self.job_url} ===")
+        logger.info(f"{totals['commands']} commands, {totals['command_time']:.1f}s in the browser, {totals['sleep_time']:.1f}s sleeping")
+        logger.info(f"{'function':<40} {'cmds':>6} {'cmd s':>8} {'sleep s':>8}  most frequent commands")
+        with self._lock:
+            rows = sorted(self.stats.items(), key=lambda item: -(item[1]['command_time'] + item[1]['sleep_time']))
+            for function, stats in rows[:top]:
+                frequent = ', '.join(f'{command} x{count}' for command, count in stats['by_command'].most_common(3))
+                logger.info(f"{function:<40} {stats['commands']:>6} {stats['command_time']:>8.1f} {stats['sleep_time']:>8.1f}  {frequent}")
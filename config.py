@@ -1,5 +1,4 @@
 import json
-import ipdb
 
 class Config:
   def __init__(self, file):
@@ -25,4 +24,29 @@ class Config:
     with open(self.file) as profile_file:
       profile = json.load(profile_file)
     return profile
-  
\ No newline at end of file
+
+
+class LazyProfile:
+  """
+  Profile that is only read from file when it is first used
+  """
+  def __init__(self, file):
+    self.file = file
+    self._profile = None
+
+  def load(self):
+    if self._profile is None:
+      self._profile = Config(self.file).load_profile()
+    return self._profile
+
+  def __getitem__(self, key):
+    return self.load()[key]
+
+  def __setitem__(self, key, value):
+    self.load()[key] = value
+
+  def __contains__(self, key):
+    return key in self.load()
+
+  def get(self, key, default=None):
+    return self.load().get(key, default)
@@ -0,0 +1,123 @@
+# pylint: disable=locally-disabled, line-too-long, logging-fstring-interpolation, broad-exception-caught
+"""
+Lock files shared by processes and machines.
+
+Guards read-modify-write of files that several processes update (the jobs file, the tenant caches), also
+across machines sharing an NFS directory.
+"""
+
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import uuid
+
+logger = logging.getLogger('__name__')
+
+# A lock file older than this is left over from a crashed process
+LOCK_STALE_SECONDS = 60
+
+
+def _read_lock(path):
+    """
+    (owner, mtime) of a lock file, None if there is none
+    """
+    try:
+        with open(path, encoding='utf-8') as lock_file:
+            owner = lock_file.read()
+        return owner, os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+class FileLock:
+    """
+    This class is an exclusive lock between processes, also across machines on NFS: the lock file is created
+    with O_CREAT | O_EXCL, which is atomic there (flock/fcntl locks are not reliable on NFS). While it is held
+    the lock file's mtime is renewed, so only the locks of crashed processes go stale. A stale lock is taken
+    over by renaming it away (only one waiter can) and checking that the renamed file is still the stale one.
+    """
+    def __init__(self, path, timeout=120):
+        self.path = path
+        self.timeout = timeout
+        self.owner = None
+        self._stop = threading.Event()
+        self._renewer = None
+
+    def _take_over(self, stale):
+        """
+        Removes the stale lock (owner, mtime) unless another waiter got to it first
+        """
+        current = _read_lock(self.path)
+        if current != stale:
+            return
+        taken_path = f'{self.path}.{uuid.uuid4().hex}.stale'
+        try:
+            os.rename(self.path, taken_path)
+        except OSError:
+            # Another waiter renamed it first
+            return
+        if _read_lock(taken_path) == stale:
+            logger.warning(f"Removed stale lock {self.path} of {stale[0] or 'unknown owner'}")
+        else:
+            # A fresh lock was created since the check - hand it back (link fails if yet another one exists)
+            try:
+                os.link(taken_path, self.path)
+            except FileExistsError:
+                pass
+            except OSError:
+                if not os.path.exists(self.path):
+                    os.rename(taken_path, self.path)
+                    return
+        try:
+            os.remove(taken_path)
+        except OSError:
+            pass
+
+    def _renew(self):
+        while not self._stop.wait(LOCK_STALE_SECONDS / 4):
+            try:
+                if _read_lock(self.path)[0] != self.owner:
+                    logger.error(f"Lock {self.path} was taken over while held")
+                    return
+                os.utime(self.path)
+            except (OSError, TypeError):
+                return
+
+    def __enter__(self):
+        deadline = time.monotonic() + self.timeout
+        self.owner = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        while True:
+            try:
+                lock_fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(lock_fd, self.owner.encode())
+                os.close(lock_fd)
+                self._stop.clear()
+                self._renewer = threading.Thread(target=self._renew, name='file-lock-renewer', daemon=True)
+                self._renewer.start()
+                return self
+            except FileExistsError:
+                stale = _read_lock(self.path)
+                if stale and time.time() - stale[1] > LOCK_STALE_SECONDS:
+                    self._take_over(stale)
+                    continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Could not lock {self.path} within {self.timeout}s")
+            time.sleep(random.uniform(0.02, 0.1))
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        if self._renewer:
+            self._renewer.join()
+            self._renewer = None
+        # Never remove a lock that is no longer ours
+        current = _read_lock(self.path)
+        if current and current[0] == self.owner:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+        else:
+            logger.error(f"Lock {self.path} was taken over while held")
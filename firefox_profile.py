@@ -0,0 +1,136 @@
+# pylint: disable=locally-disabled, line-too-long, logging-fstring-interpolation, broad-exception-caught
+"""
+Slim Firefox profiles.
+
+webdriver.FirefoxProfile(path) copies the whole real profile (cache, history, ...) on every launch and
+then ships it to geckodriver as a zip. Instead, the files a logged-in session needs (cookies, prefs,
+site storage, certificates) are extracted once into a template, and every launch gets a copy-on-write
+clone of the template that Firefox is started with directly (-profile).
+"""
+
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+
+logger = logging.getLogger('__name__')
+
+# What a session needs - the rest of a real profile (cache2, places, sessionstore, ...) is left out
+PROFILE_ENTRIES = (
+    'cookies.sqlite', 'cookies.sqlite-wal',
+    'prefs.js', 'user.js',
+    'storage', 'storage.sqlite', 'webappsstore.sqlite', 'webappsstore.sqlite-wal',
+    'permissions.sqlite', 'content-prefs.sqlite', 'containers.json',
+    'cert9.db', 'key4.db', 'logins.json', 'pkcs11.txt',
+)
+# Storage of service-worker caches can be large and is not needed for a session
+IGNORED_STORAGE = shutil.ignore_patterns('cache', 'morgue', 'lock', '.parentlock')
+CLONE_PREFIX = 'workday-profile-'
+MARKER_FILE = '.template.json'
+
+_lock = threading.Lock()
+
+
+def template_is_current(template_dir, source_dir):
+    """
+    True if the template was built from source_dir
+    """
+    try:
+        with open(os.path.join(template_dir, MARKER_FILE), encoding='utf-8') as marker_file:
+            return json.load(marker_file).get('source') == (os.path.abspath(source_dir) if source_dir else '')
+    except (OSError, ValueError):
+        return False
+
+
+def build_template(template_dir, source_dir):
+    """
+    (Re)builds the slim template from the real profile in source_dir (an empty profile without one)
+
+    Returns:
+        str: template_dir
+    """
+    tmp_dir = f'{template_dir}.{os.getpid()}.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    for entry in PROFILE_ENTRIES if source_dir else ():
+        source = os.path.join(source_dir, entry)
+        target = os.path.join(tmp_dir, entry)
+        try:
+            if os.path.isdir(source):
+                shutil.copytree(source, target, ignore=IGNORED_STORAGE)
+            elif os.path.isfile(source):
+                shutil.copy2(source, target)
+            else:
+                continue
+        except (OSError, shutil.Error) as exc:
+            logger.warning(f"Could not copy {entry} from the Firefox profile: {repr(exc)}")
+    size = sum(os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(tmp_dir) for name in files)
+
+    with open(os.path.join(tmp_dir, MARKER_FILE), 'w', encoding='utf-8') as marker_file:
+        json.dump({'source': os.path.abspath(source_dir) if source_dir else '', 'built_at': time.strftime('%Y-%m-%d %H:%M:%S')}, marker_file)
+
+    shutil.rmtree(template_dir, ignore_errors=True)
+    os.replace(tmp_dir, template_dir)
+    logger.info(f"Built Firefox profile template {template_dir} from {source_dir or 'an empty profile'} ({size // 1024} KB)")
+    return template_dir
+
+
+def _clone_tree(source, target):
+    """
+    Copy-on-write copy of a directory where the file system supports it, a plain copy otherwise
+    """
+    system = platform.system()
+    if system == 'Darwin':
+        command = ['cp', '-c', '-R', source, target]
+    elif system == 'Linux':
+        command = ['cp', '-R', '--reflink=auto', source, target]
+    else:
+        command = None
+    if command:
+        try:
+            subprocess.run(command, check=True, capture_output=True)
+            return
+        except (OSError, subprocess.CalledProcessError) as exc:
+            logger.warning(f"Copy-on-write clone failed, copying instead: {repr(exc)}")
+            shutil.rmtree(target, ignore_errors=True)
+    shutil.copytree(source, target)
+
+
+def write_user_prefs(profile_dir, preferences):
+    """
+    Appends preferences to the user.js of a profile (applied by Firefox on start)
+    """
+    with open(os.path.join(profile_dir, 'user.js'), 'a', encoding='utf-8') as user_js:
+        for name, value in preferences.items():
+            user_js.write(f'user_pref({json.dumps(name)}, {json.dumps(value)});\n')
+
+
+def clone_profile(template_dir, source_dir, preferences=None, refresh=False):
+    """
+    Makes a fresh profile for one browser from the template, building the template first if it is missing,
+    was made from another profile or refresh is set
+
+    Args:
+        template_dir (str): Where the template is kept
+        source_dir (str): The real Firefox profile (PROFILE_PATH), None for an empty profile
+        preferences (dict): Preferences written to the clone's user.js
+        refresh (bool): Rebuild the template from source_dir first (e.g. after logging in again)
+
+    Returns:
+        str: Path of the clone (inside the temp directory, removed when the worker's browser is released)
+    """
+    with _lock:
+        if refresh or not template_is_current(template_dir, source_dir):
+            build_template(template_dir, source_dir)
+
+    clone_dir = tempfile.mkdtemp(prefix=CLONE_PREFIX)
+    os.rmdir(clone_dir)
+    _clone_tree(template_dir, clone_dir)
+    if preferences:
+        write_user_prefs(clone_dir, preferences)
+    return clone_dir
@@ -0,0 +1,330 @@
+# pylint: disable=locally-disabled, line-too-long, logging-fstring-interpolation, broad-exception-caught
+"""
+Shared jobs ledger.
+
+Lets several processes (on one machine or on several machines sharing an NFS directory) work through one jobs
+file without applying to a job twice. A worker claims a pending job under a lock file by writing its id and a
+lease expiry into the claimed_by / lease_expires columns of the file; a heartbeat thread renews the leases of
+the jobs it holds. Jobs whose worker died become claimable again when their lease expires. Workers can be
+given a stable partition of the tenants (e.g. 0/3, 1/3, 2/3) so each company is handled by one worker.
+
+Exercise it locally with several processes and fake jobs (also checks the takeover of a stale lock file):
+
+    python ledger.py simulate jobs.csv --workers 4
+"""
+
+import argparse
+import logging
+import os
+import random
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+
+from file_lock import LOCK_STALE_SECONDS, FileLock
+from tenant_cache import get_tenant
+
+logger = logging.getLogger('__name__')
+
+CLAIM_COLUMNS = ('claimed_by', 'lease_expires')
+
+
+def jobs_file_lock(file_path):
+    """
+    Lock guarding every read-modify-write of a jobs file
+    """
+    return FileLock(f'{file_path}.lock')
+
+
+def write_jobs_file(df, file_path):
+    """
+    Writes the jobs file atomically, so other processes never read a half-written file
+    """
+    tmp_path = f'{file_path}.{socket.gethostname()}.{os.getpid()}.tmp'
+    if file_path.endswith('.csv'):
+        df.to_csv(tmp_path, index=False)
+    else:
+        df.to_excel(tmp_path, index=False, engine='openpyxl')
+    os.replace(tmp_path, file_path)
+
+
+def parse_partition(text):
+    """
+    '1/3' -> (1, 3); empty -> None
+    """
+    if not text:
+        return None
+    index, count = (int(part) for part in text.split('/'))
+    if not 0 <= index < count:
+        raise ValueError(f"Invalid partition {text} - expected index/count with 0 <= index < count")
+    return index, count
+
+
+def tenant_partition(job_url, count):
+    """
+    Stable partition of a job's tenant (the same on every machine and run)
+    """
+    return zlib.crc32(get_tenant(job_url).encode('utf-8')) % count
+
+
+def utc_now():
+    """
+    Current time in UTC (lease expiries are compared across machines)
+    """
+    return datetime.now(timezone.utc)
+
+
+class JobLedger:
+    """
+    This class claims, renews and releases leases on the jobs of a jobs file for one worker.
+    """
+    def __init__(self, file_path, url_column, worker_id=None, lease_seconds=300, partition=None):
+        """
+        Args:
+            file_path (str): CSV or Excel jobs file shared by the workers
+            url_column (str): Column with the job URLs
+            worker_id (str): Name of this worker in the ledger, host:pid by default
+            lease_seconds (int): How long a claim lasts without a heartbeat
+            partition (tuple): (index, count) to only take tenants of one partition, None for all
+        """
+        self.file_path = file_path
+        self.url_column = url_column
+        self.worker_id = worker_id or f'{socket.gethostname()}:{os.getpid()}'
+        self.lease_seconds = lease_seconds
+        self.partition = partition
+        self.held = set()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _read(self):
+        import pandas as pd
+
+        if self.file_path.endswith('.csv'):
+            df = pd.read_csv(self.file_path, dtype=str, keep_default_na=False)
+        else:
+            df = pd.read_excel(self.file_path, dtype=str).fillna('')
+        for column in ('application_status',) + CLAIM_COLUMNS:
+            if column not in df.columns:
+                df[column] = ''
+        return df
+
+    def _claimable_mask(self, df):
+        now = utc_now().isoformat(timespec='seconds')
+        status = df['application_status'].str.strip()
+        lease_free = (df['claimed_by'] == '') | (df['lease_expires'] < now) | (df['claimed_by'] == self.worker_id)
+        mask = status.isin(['', 'pending']) & lease_free & df[self.url_column].str.contains('http|www', case=False)
+        if self.partition:
+            index, count = self.partition
+            mask &= df[self.url_column].map(lambda job_url: tenant_partition(job_url, count) == index)
+        return mask
+
+    def claimable(self):
+        """
+        Pending jobs of this worker's partition that nobody holds a live lease on
+        """
+        df = self._read()
+        return df.loc[self._claimable_mask(df), self.url_column].tolist()
+
+    def claim(self, job_url):
+        """
+        Atomically claims job_url for this worker
+
+        Returns:
+            bool: False if another worker got it first or it is no longer pending
+        """
+        with jobs_file_lock(self.file_path):
+            df = self._read()
+            mask = (df[self.url_column] == job_url) & self._claimable_mask(df)
+            if not mask.any():
+                return False
+            previous_owner = df.loc[mask, 'claimed_by'].iloc[0]
+            if previous_owner and previous_owner != self.worker_id:
+                logger.warning(f"Reclaiming {job_url} from {previous_owner} - its lease expired")
+            df.loc[mask, 'claimed_by'] = self.worker_id
+            df.loc[mask, 'lease_expires'] = (utc_now() + timedelta(seconds=self.lease_seconds)).isoformat(timespec='seconds')
+            write_jobs_file(df, self.file_path)
+        self.held.add(job_url)
+        return True
+
+    def release(self, job_url):
+        """
+        Stops renewing the lease of job_url (its status was written) and clears the claim if it is still there
+        """
+        self.held.discard(job_url)
+        with jobs_file_lock(self.file_path):
+            df = self._read()
+            mask = (df[self.url_column] == job_url) & (df['claimed_by'] == self.worker_id)
+            if mask.any():
+                df.loc[mask, list(CLAIM_COLUMNS)] = ''
+                write_jobs_file(df, self.file_path)
+
+    def renew(self):
+        """
+        Extends the leases of all jobs this worker holds
+        """
+        if not self.held:
+            return
+        with jobs_file_lock(self.file_path):
+            df = self._read()
+            mask = df[self.url_column].isin(self.held) & (df['claimed_by'] == self.worker_id)
+            df.loc[mask, 'lease_expires'] = (utc_now() + timedelta(seconds=self.lease_seconds)).isoformat(timespec='seconds')
+            write_jobs_file(df, self.file_path)
+
+    def _heartbeat(self):
+        while not self._stop.wait(self.lease_seconds / 3):
+            try:
+                self.renew()
+            except Exception as exc:
+                logger.warning(f"Lease heartbeat failed: {repr(exc)}")
+
+    def start(self):
+        """
+        Starts the heartbeat thread
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._heartbeat, name='ledger-heartbeat', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops the heartbeat and releases every job still held
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        for job_url in list(self.held):
+            self.release(job_url)
+
+
+def _simulated_worker(file_path, url_column, worker_index, lease_seconds, crash_after):
+    ledger = JobLedger(file_path, url_column, worker_id=f'sim-{worker_index}', lease_seconds=lease_seconds).start()
+    done = 0
+    while True:
+        candidates = ledger.claimable()
+        if not candidates:
+            # Jobs still pending are held by other workers - wait in case one of them dies
+            if not ledger._read()['application_status'].isin(['', 'pending']).any():  # pylint: disable=protected-access
+                break
+            time.sleep(0.5)
+            continue
+        job_url = random.choice(candidates)
+        if not ledger.claim(job_url):
+            continue
+        if crash_after and done == crash_after:
+            # Dies holding a claim - another worker must pick the job up once the lease expires
+            os._exit(1)  # pylint: disable=protected-access
+        time.sleep(random.uniform(0.05, 0.2))
+        with jobs_file_lock(file_path):
+            df = ledger._read()  # pylint: disable=protected-access
+            mask = df[url_column] == job_url
+            # Count of applications to this job - must end up being exactly 1
+            df.loc[mask, 'application_status'] = 'applied'
+            df.loc[mask, 'error_message'] = (df.loc[mask, 'error_message'].iloc[0] + f'sim-{worker_index};') if 'error_message' in df.columns else f'sim-{worker_index};'
+            write_jobs_file(df, file_path)
+        ledger.release(job_url)
+        done += 1
+    ledger.stop()
+
+
+def _stale_lock_worker(lock_path, holder_path, start_at):
+    time.sleep(max(0.0, start_at - time.time()))
+    with FileLock(lock_path, timeout=30):
+        # Nobody else may be inside while this process holds the lock
+        try:
+            holder_fd = os.open(holder_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            os._exit(1)  # pylint: disable=protected-access
+        os.close(holder_fd)
+        time.sleep(0.05)
+        os.remove(holder_path)
+
+
+def check_stale_takeover(workers=8, rounds=5):
+    """
+    Plants a stale lock and lets workers processes take it over at the same moment, rounds times
+
+    Returns:
+        bool: True if no two processes ever held the lock together
+    """
+    import multiprocessing
+
+    work_dir = tempfile.mkdtemp(prefix='ledger-lock-')
+    lock_path, holder_path = os.path.join(work_dir, 'jobs.csv.lock'), os.path.join(work_dir, 'holder')
+    overlaps = 0
+    for _ in range(rounds):
+        with open(lock_path, 'w', encoding='utf-8') as lock_file:
+            lock_file.write('crashed-host:1')
+        old = time.time() - LOCK_STALE_SECONDS - 10
+        os.utime(lock_path, (old, old))
+        start_at = time.time() + 0.5
+        processes = [multiprocessing.Process(target=_stale_lock_worker, args=(lock_path, holder_path, start_at)) for _ in range(workers)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        overlaps += sum(process.exitcode != 0 for process in processes)
+    print(f"Stale lock taken over by {workers} processes at once, {rounds} rounds: {overlaps} overlapping holders")
+    return overlaps == 0
+
+
+def simulate(file_path, workers=4, lease_seconds=3):
+    """
+    Runs workers processes against a copy of the jobs file with fake applications (one of them crashes while
+    holding a claim) and checks that every job was applied to exactly once
+
+    Returns:
+        bool: True if no job was applied to twice or left behind
+    """
+    import multiprocessing
+    import pandas as pd
+
+    work_dir = tempfile.mkdtemp(prefix='ledger-sim-')
+    sim_path = os.path.join(work_dir, os.path.basename(file_path))
+    shutil.copy(file_path, sim_path)
+    df = pd.read_csv(sim_path, dtype=str, keep_default_na=False)
+    url_column = df.columns[0]
+    df['application_status'] = 'pending'
+    df['error_message'] = ''
+    write_jobs_file(df, sim_path)
+
+    processes = [multiprocessing.Process(target=_simulated_worker, args=(sim_path, url_column, index, lease_seconds, 1 if index == 0 else 0)) for index in range(workers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    result = pd.read_csv(sim_path, dtype=str, keep_default_na=False)
+    valid = result[url_column].str.contains('http|www', case=False)
+    applications = result.loc[valid, 'error_message'].str.count(';')
+    duplicates = int((applications > 1).sum())
+    missing = int((applications == 0).sum())
+    print(f"{int(valid.sum())} jobs, {workers} workers: {duplicates} applied twice, {missing} not applied ({sim_path})")
+    return duplicates == 0 and missing == 0
+
+
+def main():
+    """
+    Command line entry point
+    """
+    parser = argparse.ArgumentParser(description='Shared jobs ledger tools')
+    commands = parser.add_subparsers(dest='command', required=True)
+    simulate_parser = commands.add_parser('simulate', help='Check claiming with several local processes and fake jobs')
+    simulate_parser.add_argument('file_path')
+    simulate_parser.add_argument('--workers', type=int, default=4)
+    simulate_parser.add_argument('--lease-seconds', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.command == 'simulate':
+        passed = check_stale_takeover(max(args.workers, 2) * 2)
+        passed = simulate(args.file_path, args.workers, args.lease_seconds) and passed
+        raise SystemExit(0 if passed else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+# pylint: disable=locally-disabled, line-too-long, logging-fstring-interpolation, broad-exception-caught
+"""
+Non-blocking logging.
+
+Workers only put records on a queue; a background listener formats them and writes them to the colored
+console and to a rotating JSON-lines file. Every record carries the job context (worker, job id, tenant)
+of the thread that logged it, so interleaved output of several workers can be told apart and filtered.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from datetime import datetime
+
+LOGGER_NAME = '__name__'
+# Relative LOG_FILE paths are taken from the repository root, not from the working directory
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_context = threading.local()
+_listener = None
+
+
+def set_job_context(**context):
+    """
+    Attaches context (e.g. job_id, tenant, candidate) to every record logged by the current thread
+    """
+    _context.values = {key: value for key, value in context.items() if value}
+
+
+def clear_job_context():
+    """
+    Removes the job context of the current thread
+    """
+    _context.values = {}
+
+
+class JobContextFilter(logging.Filter):
+    """
+    This class adds the worker and the job context of the logging thread to each record.
+    """
+    def filter(self, record):
+        context = getattr(_context, 'values', {})
+        record.worker = record.threadName
+        record.job_id = context.get('job_id', '')
+        record.tenant = context.get('tenant', '')
+        record.candidate = context.get('candidate', '')
+        record.job_context = f"[{record.worker} {record.job_id}] " if record.job_id else ''
+        return True
+
+
+class ColoredFormatter(logging.Formatter):
+    """
+    This class handles the coloring of log statements where color is supported on the console.
+    """
+    COLORS = {
+        'DEBUG': '\033[0m',
+        'INFO': '\033[94m',
+        'WARNING': '\033[93m',
+        'ERROR': '\033[91m',
+        'CRITICAL': '\033[95m'
+    }
+    RESET = '\033[0m'
+
+    def format(self, record):
+        log_color = self.COLORS.get(record.levelname, self.RESET)
+        message = super().format(record)
+        return f"{log_color}{message}{self.RESET}"
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    This class writes one JSON object per record.
+    """
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'worker': getattr(record, 'worker', record.threadName),
+            'job_id': getattr(record, 'job_id', ''),
+            'tenant': getattr(record, 'tenant', ''),
+            'candidate': getattr(record, 'candidate', ''),
+            'function': record.funcName,
+            'line': record.lineno,
+            'message': record.getMessage(),
+        }
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """
+    This class hands records to the listener thread. Only the message itself is rendered in the
+    logging thread (its arguments may change afterwards); timestamps, colors and JSON are done by the listener.
+    """
+    def prepare(self, record):
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class LazyRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    This class creates the log directory and opens the file only when the first record is written, so
+    importing the application (e.g. by other tools) leaves no files behind.
+    """
+    def __init__(self, filename, **kwargs):
+        super().__init__(filename, delay=True, **kwargs)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+def _restart_listener_in_child():
+    """
+    Threads do not survive fork() - a forked worker process needs its own listener thread
+    """
+    if _listener is not None:
+        _listener._thread = None  # pylint: disable=protected-access
+        _listener.start()
+
+
+def setup_logging():
+    """
+    Configures the application logger once: queue handler in the caller, console and rotating JSON file
+    written by a background listener (stopped and flushed at exit)
+
+    Returns:
+        logging.Logger: The application logger
+    """
+    global _listener  # pylint: disable=global-statement
+    logger = logging.getLogger(LOGGER_NAME)
+    if _listener is not None:
+        return logger
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(ColoredFormatter('%(asctime)s - %(levelname)s - %(job_context)s%(message)s', datefmt='%m/%d/%Y %H:%M:%S'))
+    handlers = [console_handler]
+
+    log_file = os.getenv('LOG_FILE', 'logs/applier.jsonl')
+    if log_file:
+        file_handler = LazyRotatingFileHandler(os.path.join(ROOT_DIR, log_file), maxBytes=int(os.getenv('LOG_FILE_MAX_MB', '10')) * 1024 * 1024,
+                                               backupCount=int(os.getenv('LOG_FILE_BACKUPS', '5')), encoding='utf-8')
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = ContextQueueHandler(log_queue)
+    queue_handler.addFilter(JobContextFilter())
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=_restart_listener_in_child)
+
+    logger.setLevel(os.getenv('LOG_LEVEL', 'DEBUG').upper())
+    logger.addHandler(queue_handler)
+    logger.propagate = False
+    return logger
@@ -1,62 +1,164 @@
 # pylint: disable=locally-disabled, multiple-statements, fixme, line-too-long, wrong-import-order, too-many-locals, unused-import, unused-wildcard-import, logging-fstring-interpolation, broad-exception-caught, wildcard-import, ungrouped-imports, invalid_name, bare-except, trailing-whitespace, unused-variable
 # pyright: reportOperatorIssue=false, reportOptionalSubscript=false, reportArgumentType=false
 
-from asyncio import exceptions
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.alert import Alert
-# from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
-from selenium.webdriver.support.ui import Select
-from selenium.webdriver.common.keys import Keys  # Add this import
+import argparse
+import importlib
+import subprocess
+import sys
 from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
 
 import json
-import logging
-import time
 from datetime import datetime, timedelta
 import re
 import os
-import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+from collections import Counter
+from contextlib import nullcontext
+from urllib.parse import urlparse
 from dotenv import load_dotenv
-import pandas as pd
-from config import Config
+from candidates import default_candidate, load_candidates
+from snapshots import SnapshotRecorder
+from tenant_cache import TenantCache, get_tenant, posting_path
+from supervisor import BrowserSupervisor
+from planner import RunPlanner
+from circuit_breaker import CircuitBreaker
+from ranking import RelevanceRanker, TermIndex
+from clock import get_clock
+from command_profiler import CommandProfiler, sleep
+from firefox_profile import build_template, clone_profile
+from artifacts import ArtifactStore, capture_failure
+from page_model import NetworkCapture, current_page_model, reset_page_model
+from ledger import JobLedger, jobs_file_lock, parse_partition, write_jobs_file
+from logging_setup import setup_logging, set_job_context, clear_job_context
 
-load_dotenv()
-
-PROFILE_PATH = os.getenv('PROFILE_PATH')
-TESTING = bool(os.getenv('TESTING', 'False')=='True')
 
-PROFILE_DATA = Config('data/profile.json').load_profile()
-
-BROWSER="CHROME" # FIREFOX
 
-class ColoredFormatter(logging.Formatter):
+class LazyImport:
     """
-    This class handles the coloring of log statements where color is supported on the console.
+    This class stands in for a module (or a name inside it) that is only imported on first use.
+    Importing selenium.webdriver loads every browser binding, which most invocations never need.
     """
-    COLORS = {
-        'DEBUG': '\033[0m',
-        'INFO': '\033[94m',
-        'WARNING': '\033[93m',
-        'ERROR': '\033[91m',
-        'CRITICAL': '\033[95m'
-    }
-    RESET = '\033[0m'
+    def __init__(self, module, name=None):
+        self._module = module
+        self._name = name
+        self._target = None
+
+    def _resolve(self):
+        if self._target is None:
+            target = importlib.import_module(self._module)
+            self._target = getattr(target, self._name) if self._name else target
+        return self._target
+
+    def __getattr__(self, attribute):
+        return getattr(self._resolve(), attribute)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
 
-    def format(self, record):
-        log_color = self.COLORS.get(record.levelname, self.RESET)
-        message = super().format(record)
-        return f"{log_color}{message}{self.RESET}"
 
-formatter = ColoredFormatter('%(asctime)s - %(levelname)s - %(message)s', datefmt='%m/%d/%Y %H:%M:%S')
-handler = logging.StreamHandler()
-handler.setFormatter(formatter)
+webdriver = LazyImport('selenium.webdriver')
+By = LazyImport('selenium.webdriver.common.by', 'By')
+EC = LazyImport('selenium.webdriver.support.expected_conditions')
+WebDriverWait = LazyImport('selenium.webdriver.support.wait', 'WebDriverWait')
+Keys = LazyImport('selenium.webdriver.common.keys', 'Keys')
+ActionChains = LazyImport('selenium.webdriver.common.action_chains', 'ActionChains')
 
-logger = logging.getLogger('__name__')
-logger.setLevel(logging.DEBUG)
-logger.addHandler(handler)
+# Cumulative import time of this module that --check-import-time enforces
+IMPORT_TIME_BUDGET_MS = int(os.getenv('IMPORT_TIME_BUDGET_MS', '150'))
+
+# .env is tiny and the settings below are read from it at import
+load_dotenv()
+
+# Pause for a key press after errors and between jobs (only for watching a single run, blocks unattended runs)
+INTERACTIVE_DEBUG = bool(os.getenv('INTERACTIVE_DEBUG', 'False')=='True')
+
+BROWSER="CHROME" # FIREFOX
+
+# Slim copy of PROFILE_PATH (cookies, prefs, storage) that each Firefox launch is cloned from (see firefox_profile.py)
+PROFILE_TEMPLATE_DIR = os.getenv('PROFILE_TEMPLATE_DIR', 'data/cache/firefox_profile')
+
+# The applicant of .env and data/profile.json - other candidates are listed in CANDIDATES_FILE (see candidates.py)
+DEFAULT_CANDIDATE = default_candidate(PROFILE_TEMPLATE_DIR)
+CANDIDATES_FILE = os.getenv('CANDIDATES_FILE', 'data/candidates.json')
+# Browsers running at the same time when several candidates are processed
+CANDIDATE_WORKERS = int(os.getenv('CANDIDATE_WORKERS', '2'))
+
+FIREFOX_PREFERENCES = {
+    # Core cookie preferences
+    "network.cookie.cookieBehavior": 0,
+    "network.cookie.lifetimePolicy": 0,
+    "privacy.clearOnShutdown.cookies": False,
+    "privacy.clearOnShutdown.sessions": False,
+    "browser.privatebrowsing.autostart": False,
+    "dom.storage.enabled": True,
+    "browser.sessionstore.enabled": True,
+
+    # === BASIC STEALTH - Hide automation indicators ===
+
+    # Hide WebDriver presence (most important)
+    "dom.webdriver.enabled": False,
+    "useAutomationExtension": False,
+
+    # Disable marionette (Firefox's automation protocol)
+    "marionette.enabled": False,
+
+    # Set a normal user agent
+    "general.useragent.override": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+}
+
+# Bounds of a single application - stuck wizards and hanging browsers cost seconds instead of hours
+WIZARD_MAX_STEPS = int(os.getenv('WIZARD_MAX_STEPS', '15'))
+WIZARD_MAX_REVISITS = int(os.getenv('WIZARD_MAX_REVISITS', '2'))
+JOB_DEADLINE_SECONDS = int(os.getenv('JOB_DEADLINE_SECONDS', '1800'))
+
+# Limits of a worker's browser (driver + browser + helpers) enforced by the supervisor
+WORKER_MAX_RSS_MB = int(os.getenv('WORKER_MAX_RSS_MB', '4096'))
+WORKER_MAX_AGE_SECONDS = int(os.getenv('WORKER_MAX_AGE_SECONDS', str(JOB_DEADLINE_SECONDS + 300)))
+SUPERVISOR = BrowserSupervisor(WORKER_MAX_RSS_MB, WORKER_MAX_AGE_SECONDS)
+
+# Browsers of upcoming jobs prepared in the background (0 = off), only while this much memory stays free
+PREFETCH_DEPTH = int(os.getenv('PREFETCH_DEPTH', '1'))
+PREFETCH_MIN_FREE_MB = int(os.getenv('PREFETCH_MIN_FREE_MB', '2048'))
+
+# Count and time every WebDriver command and sleep per calling function (see command_profiler.py)
+PROFILE_WEBDRIVER_COMMANDS = bool(os.getenv('PROFILE_WEBDRIVER_COMMANDS', 'False')=='True')
+
+# Read the JSON page definitions through the DevTools protocol to know the fields of a page without probing the DOM (Chrome only, see page_model.py)
+NETWORK_CAPTURE = bool(os.getenv('NETWORK_CAPTURE', 'False')=='True')
+
+# Screenshot, DOM and console of failed jobs, written in the background to a size-capped store (see artifacts.py)
+CAPTURE_FAILURES = bool(os.getenv('CAPTURE_FAILURES', 'True')=='True')
+ARTIFACTS = ArtifactStore(os.getenv('ARTIFACT_DIR', 'data/artifacts'), int(os.getenv('ARTIFACT_STORE_MAX_MB', '200')))
+
+# Save the DOM of every wizard step for offline replay (see snapshots.py)
+RECORD_SNAPSHOTS = bool(os.getenv('RECORD_SNAPSHOTS', 'False')=='True')
+
+# Per-tenant knowledge of the wizard pages: which fields exist and which options the dropdowns offer
+FORM_SCHEMA = TenantCache('data/cache/form_schema.json')
+# Per-tenant resolution of typeahead (prompt) searches, e.g. skill -> taxonomy entry (None when the tenant has no match)
+TYPEAHEAD_CACHE = TenantCache('data/cache/typeahead.json')
+# Per-tenant routes to the application form: learned form URLs of jobs, the URL suffix leading there and how often jumping there worked
+APPLY_ROUTES = TenantCache('data/cache/apply_routes.json')
+# Open the application form straight from its URL instead of clicking through the job page
+DIRECT_APPLY = bool(os.getenv('DIRECT_APPLY', 'True')=='True')
+# Per-tenant durations and outcomes of past applications, used to plan runs with a time budget
+RUN_HISTORY = TenantCache('data/cache/run_history.json')
+# Wall-clock budget of a run in minutes (0 = apply to every pending job)
+RUN_BUDGET_MINUTES = float(os.getenv('RUN_BUDGET_MINUTES', '0'))
+# Average pause between two applications (see process_all_jobs)
+JOB_PAUSE_SECONDS = 7.5
+# A company's jobs are skipped for the cool-down after this many consecutive failures of the same kind (0 = never)
+BREAKER_THRESHOLD = int(os.getenv('BREAKER_THRESHOLD', '3'))
+BREAKER_COOLDOWN_MINUTES = float(os.getenv('BREAKER_COOLDOWN_MINUTES', '30'))
+# Order the queue by how well the job descriptions match the profile, skipping jobs below RANK_MIN_SCORE
+RANK_JOBS = bool(os.getenv('RANK_JOBS', 'False')=='True')
+RANK_MIN_SCORE = float(os.getenv('RANK_MIN_SCORE', '0'))
+# Tokenized job descriptions, fetched once per posting
+JOB_TERM_INDEX = TermIndex('data/cache/job_terms.npz')
+
+logger = setup_logging()
 
 
 def safe_send_keys(driver, xpath, text, max_retries=3):
@@ -163,10 +265,10 @@ def wait_here(min_, max_):
     # Convert float inputs to integers to avoid randint error
     min_int = int(min_)
     max_int = int(max_)
-    wait_time = random.randint(min_int, max_int)
+    wait_time = get_clock().random.randint(min_int, max_int)
     if wait_time > 10:
         logger.info(f"Waiting for {wait_time} seconds...")
-    time.sleep(wait_time)
+    sleep(wait_time)
 
 
 def wait_for_page_loading(driver, wait_count=60):
@@ -178,15 +280,186 @@ def wait_for_page_loading(driver, wait_count=60):
         wait_here(3, 5)
         wait_count -= 1
         if wait_count <= 0:
-            print("Page stuck at loading")
+            logger.error("Page stuck at loading")
             return False
 
     return True
 
 
-def make_options():
+# Single-call description of the current wizard page. Everything the submit loop
+# needs to decide what to do next is collected in one round trip instead of one
+# find_elements per page type.
+PAGE_FINGERPRINT_JS = """
+const isVisible = (el) => !!(el && (el.offsetParent !== null || el.getClientRects().length));
+const headings = Array.from(document.querySelectorAll('h2')).filter(isVisible).map((h) => h.textContent.trim());
+const heading = headings.length ? headings[0] : '';
+const hasHeading = (text) => headings.some((h) => h.indexOf(text) !== -1);
+
+let pageType = 'unknown';
+if (hasHeading('Application Questions')) {
+    pageType = 'application_questions';
+} else if (document.getElementById('selfIdentifiedDisabilityData--name')) {
+    pageType = 'disability';
+} else if (hasHeading('Voluntary Disclosures')) {
+    pageType = 'voluntary_disclosures';
+} else if (hasHeading('My Information')) {
+    pageType = 'my_information';
+} else if (hasHeading('My Experience')) {
+    pageType = 'my_experience';
+} else if (hasHeading('Review')) {
+    pageType = 'review';
+}
+
+const steps = Array.from(document.querySelectorAll('[data-automation-id="progressBar"] li'));
+let stepIndex = steps.findIndex((li) => li.querySelector('[data-automation-id="progressBarActiveStep"]') || li.getAttribute('data-automation-id') === 'progressBarActiveStep');
+if (stepIndex === -1) {
+    const active = document.querySelector('[data-automation-id="progressBarActiveStep"]');
+    stepIndex = active ? steps.indexOf(active.closest('li')) : -1;
+}
+
+const errors = Array.from(document.querySelectorAll('[data-automation-id="errorMessage"], [data-automation-id="errorBanner"] li'))
+    .filter(isVisible).map((e) => e.textContent.trim()).filter((t) => t);
+const errorsFound = Array.from(document.querySelectorAll('h3')).some((h) => isVisible(h) && h.textContent.indexOf('Errors Found') !== -1);
+if (errorsFound && !errors.length) {
+    errors.push('Errors Found');
+}
+
+const nextButton = document.querySelector('button[data-automation-id="pageFooterNextButton"]');
+const fields = Array.from(document.querySelectorAll('[data-automation-id^="formField-"]'))
+    .map((f) => f.getAttribute('data-automation-id'));
+
+return {
+    page_type: pageType,
+    heading: heading,
+    step_index: stepIndex,
+    step_count: steps.length,
+    errors: errors,
+    has_submit: !!(nextButton && nextButton.textContent.indexOf('Submit') !== -1),
+    has_next: !!nextButton,
+    loading: !!document.querySelector('div[data-automation-id="loading"]'),
+    fields: fields,
+    signature: [pageType, stepIndex, heading, fields.join(',')].join('|'),
+};
+"""
+
+PAGE_CHANGE_TIMEOUT = 30
+
+# What the page shows after Submit: the confirmation ("submitted"), errors ("error") or still the wizard ("pending")
+SUBMISSION_STATE_JS = """
+const isVisible = (el) => !!(el && (el.offsetParent !== null || el.getClientRects().length));
+if (document.querySelector('div[data-automation-id="loading"]')) {
+    return {state: 'pending', detail: 'loading', has_submit: false};
+}
+const confirmation = Array.from(document.querySelectorAll('[data-automation-id="congratulationsPopup"], [data-automation-id="applicationSubmitted"]')).find(isVisible);
+const text = document.body ? document.body.innerText.slice(0, 20000) : '';
+const match = text.match(/application (has been |was )?(successfully )?submitted|thank you for (applying|your application)/i);
+if (confirmation || match) {
+    return {state: 'submitted', detail: match ? match[0] : confirmation.getAttribute('data-automation-id'), has_submit: false};
+}
+
+const errors = Array.from(document.querySelectorAll('[data-automation-id="errorMessage"], [data-automation-id="errorBanner"] li'))
+    .filter(isVisible).map((e) => e.textContent.trim()).filter((t) => t);
+const nextButton = document.querySelector('button[data-automation-id="pageFooterNextButton"]');
+const hasSubmit = !!(nextButton && isVisible(nextButton) && nextButton.textContent.indexOf('Submit') !== -1);
+if (errors.length) {
+    return {state: 'error', detail: errors.join('; '), has_submit: hasSubmit};
+}
+// Workday leaves the wizard for the candidate home once the application is in
+if (/\\/userHome/.test(window.location.pathname)) {
+    return {state: 'submitted', detail: 'candidate home', has_submit: false};
+}
+return {state: 'pending', detail: '', has_submit: hasSubmit};
+"""
+SUBMIT_CONFIRM_TIMEOUT = int(os.getenv('SUBMIT_CONFIRM_TIMEOUT', '30'))
+
+
+def get_job_id(job_url):
+    """
+    Stable short id of a job, used to key per-job data (snapshots, artifacts)
+    """
+    return hashlib.sha1(job_url.encode('utf-8')).hexdigest()[:12]
+
+
+def get_page_fingerprint(driver):
+    """
+    Returns page type, step index, visible errors and submit presence of the current page in a single script call
     """
-    Makes options for Selenium driver with basic stealth
+    try:
+        fingerprint = driver.execute_script(PAGE_FINGERPRINT_JS)
+        if fingerprint:
+            return fingerprint
+    except Exception as exc:
+        logger.warning(f"Could not read page fingerprint: {repr(exc)}")
+
+    return {
+        'page_type': 'unknown', 'heading': '', 'step_index': -1, 'step_count': 0, 'errors': [],
+        'has_submit': False, 'has_next': False, 'loading': False, 'fields': [], 'signature': '',
+    }
+
+
+def wait_for_page_change(driver, previous_fingerprint, timeout=PAGE_CHANGE_TIMEOUT):
+    """
+    Waits until the page fingerprint differs from the previous one (or new errors show up) and has settled
+
+    Returns:
+        dict: The latest fingerprint, even when the timeout is hit
+    """
+    state = {'last': previous_fingerprint}
+
+    def page_changed(_driver):
+        fingerprint = get_page_fingerprint(_driver)
+        last, state['last'] = state['last'], fingerprint
+        if fingerprint['loading']:
+            return False
+        new_errors = fingerprint['errors'] and fingerprint['errors'] != previous_fingerprint['errors']
+        if fingerprint['signature'] == previous_fingerprint['signature'] and not new_errors:
+            return False
+        # Only accept once two consecutive polls agree, so half-rendered pages are not handed to the fillers
+        return fingerprint['signature'] == last['signature']
+
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.5).until(page_changed)
+    except TimeoutException:
+        logger.warning(f"Page did not change within {timeout} seconds - {previous_fingerprint['page_type']}")
+
+    return state['last']
+
+
+def wait_for_submission(driver, timeout=SUBMIT_CONFIRM_TIMEOUT):
+    """
+    Waits after Submit until the confirmation or an error shows up
+
+    Returns:
+        dict: state ('submitted', 'error' or 'pending' on timeout), detail and whether Submit is still shown
+    """
+    state = {'last': {'state': 'pending', 'detail': '', 'has_submit': True}}
+
+    def settled(_driver):
+        try:
+            state['last'] = _driver.execute_script(SUBMISSION_STATE_JS) or state['last']
+        except Exception as exc:
+            logger.warning(f"Could not read submission state: {repr(exc)}")
+        return state['last']['state'] != 'pending'
+
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.5).until(settled)
+    except TimeoutException:
+        logger.warning(f"No confirmation or error within {timeout} seconds after Submit")
+
+    return state['last']
+
+
+def debug_pause(message):
+    """
+    Waits for a key press if INTERACTIVE_DEBUG is on, returns at once otherwise
+    """
+    if INTERACTIVE_DEBUG:
+        input(message)
+
+
+def make_options(candidate=DEFAULT_CANDIDATE):
+    """
+    Makes options for Selenium driver with basic stealth (Firefox: a clone of the candidate's profile template)
     """
     if BROWSER == "FIREFOX":
         options = webdriver.FirefoxOptions()
@@ -195,39 +468,22 @@ def make_options():
     
     try:
         if BROWSER == "FIREFOX":
-            # Create Firefox profile with proper cookie settings
-            profile = webdriver.FirefoxProfile(PROFILE_PATH)
-            # profile = webdriver.ChromeProfile()
-            
-            # Core cookie preferences
-            profile.set_preference("network.cookie.cookieBehavior", 0)
-            profile.set_preference("network.cookie.lifetimePolicy", 0)
-            profile.set_preference("privacy.clearOnShutdown.cookies", False)
-            profile.set_preference("privacy.clearOnShutdown.sessions", False)
-            profile.set_preference("browser.privatebrowsing.autostart", False)
-            profile.set_preference("dom.storage.enabled", True)
-            profile.set_preference("browser.sessionstore.enabled", True)
-
-            # === BASIC STEALTH - Hide automation indicators ===
-
-            # Hide WebDriver presence (most important)
-            profile.set_preference("dom.webdriver.enabled", False)
-            profile.set_preference("useAutomationExtension", False)
-            
-            # Disable marionette (Firefox's automation protocol)
-            profile.set_preference("marionette.enabled", False)
-            
-            # Set a normal user agent
-            profile.set_preference("general.useragent.override", "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-            
-            options.profile = profile
+            # Clone of the slim profile template with proper cookie settings - Firefox uses it in place,
+            # instead of FirefoxProfile copying and zipping the whole real profile on every launch
+            profile_dir = clone_profile(candidate.template_dir, candidate.browser_profile, FIREFOX_PREFERENCES)
+            options.add_argument("-profile")
+            options.add_argument(profile_dir)
         
         # Remove Chrome-specific arguments that don't work with Firefox
         # (keeping only the essential one)
         options.add_argument("--disable-blink-features=AutomationControlled")
+
+        if BROWSER != "FIREFOX":
+            # Makes the browser console available to failure capture (and the network events to the page model)
+            options.set_capability('goog:loggingPrefs', {'browser': 'ALL', 'performance': 'ALL'} if NETWORK_CAPTURE else {'browser': 'ALL'})
         
         if BROWSER == "FIREFOX":
-            logger.info(f"Basic stealth Firefox profile loaded from: {PROFILE_PATH}")
+            logger.info(f"Basic stealth Firefox profile cloned from the template of: {candidate.browser_profile}")
         
     except Exception as e:
         logger.error(f"Error setting up Firefox profile: {str(e)}")
@@ -329,53 +585,376 @@ def handle_cookie_consent(driver):
         return False
 
 
-def apply_to_job(job_url):
+class JobWatchdog:
     """
-    Apply to a Job on Workday
-    Returns: tuple (success: bool, error_message: str)
+    This class enforces the wall-clock deadline of a single job. When the deadline passes the worker's browser
+    is released through the supervisor (the only owner of browser teardown) from a timer thread, which makes
+    any blocked WebDriver call in the worker fail straight away.
     """
-    driver = None
-    error_message = ""
+    def __init__(self, worker, deadline_seconds, job_url=''):
+        self.worker = worker
+        self.deadline_seconds = deadline_seconds
+        self.job_url = job_url
+        self.expired = False
+        self._timer = threading.Timer(deadline_seconds, self._expire)
+        self._timer.daemon = True
+
+    def start(self):
+        self._timer.start()
+        return self
 
+    def _expire(self):
+        self.expired = True
+        logger.error(f"Job exceeded deadline of {self.deadline_seconds} seconds - tearing down browser - {self.job_url}")
+        SUPERVISOR.release(self.worker)
+
+    def cancel(self):
+        """
+        Stops the timer - the browser itself is released by the caller through the supervisor
+        """
+        self._timer.cancel()
+
+
+def launch_browser(candidate=DEFAULT_CANDIDATE):
+    """
+    Starts a new browser with the configured options for candidate
+    """
+    if BROWSER == "FIREFOX":
+        return webdriver.Firefox(options=make_options(candidate))
+    return webdriver.Chrome(options=make_options(candidate))
+
+
+def open_job_page(driver, job_url):
+    """
+    Loads the job page and gets it ready for the application: stealth, scrolling and cookie consent
+    """
+    driver.maximize_window()
+
+    # Loading the Job Base Page
+    driver.get(job_url)
+    logger.info(f"---Page Loaded - {job_url}")
+    wait_here(3, 5)
+
+    hide_webdriver(driver)
+
+    # inject_stealth_scripts(driver)
+    random_scroll(driver)
+    wait_here(3, 5)
+
+    # Handle cookie consent banner if present
+    handle_cookie_consent(driver)
+    wait_here(2, 3)
+
+
+# Form URL of a job = its canonical URL + this suffix (unless another one was learned for the tenant)
+DEFAULT_APPLY_SUFFIX = '/apply/applyManually'
+# Tenants whose direct form URL failed this often and never worked are only reached through the buttons
+DIRECT_APPLY_MAX_MISSES = 2
+APPLY_FORM_TIMEOUT = 20
+# True once the page is the application form - or the sign-in / create-account step in front of it
+APPLY_FORM_JS = """
+return !document.querySelector('div[data-automation-id="loading"]') && !!document.querySelector(
+    '[data-automation-id="progressBar"], [data-automation-id="createAccountSubmitButton"], [data-automation-id="signInSubmitButton"]');
+"""
+
+
+def direct_apply_url(job_url):
+    """
+    Returns the URL of the application form of a job - learned from an earlier visit or built from the
+    canonical job URL and the tenant's suffix - or None if direct navigation does not work for the tenant
+    """
+    tenant = get_tenant(job_url)
+    learned = APPLY_ROUTES.get(tenant, 'forms', {}).get(posting_path(job_url))
+    if learned:
+        return learned
+    stats = APPLY_ROUTES.get(tenant, 'direct', {'hits': 0, 'misses': 0})
+    if stats['misses'] >= DIRECT_APPLY_MAX_MISSES and not stats['hits']:
+        return None
+    suffix = APPLY_ROUTES.get(tenant, 'suffix', DEFAULT_APPLY_SUFFIX)
+    # Keeps the query (e.g. ?source=LinkedIn)
+    return urlparse(job_url)._replace(path=posting_path(job_url) + suffix).geturl()
+
+
+def learn_apply_url(job_url, form_url):
+    """
+    Remembers form_url as the application form of job_url and its suffix as the tenant's pattern
+    """
+    tenant = get_tenant(job_url)
+    job_path = posting_path(job_url)
+    form_path = urlparse(form_url).path
+    suffix = form_path[len(job_path):] if form_path.startswith(job_path) else ''
+    if suffix and suffix != APPLY_ROUTES.get(tenant, 'suffix', DEFAULT_APPLY_SUFFIX):
+        # A new pattern gets a fresh chance
+        APPLY_ROUTES.set(tenant, 'suffix', suffix)
+        APPLY_ROUTES.set(tenant, 'direct', {'hits': 0, 'misses': 0})
+    APPLY_ROUTES.update(tenant, 'forms', {job_path: form_url})
+
+
+def open_apply_form(driver, job_url):
+    """
+    Jumps from the job page straight to the application form. If the form does not show up, the job page is
+    loaded again for the button walk and the miss is counted against the tenant
+
+    Returns:
+        bool: True if the browser is on the application form
+    """
+    form_url = direct_apply_url(job_url) if DIRECT_APPLY else None
+    if not form_url:
+        return False
+
+    tenant = get_tenant(job_url)
+    driver.get(form_url)
     try:
-        logger.info("---Loading Driver")
-        if BROWSER == "FIREFOX":
-            driver = webdriver.Firefox(options=make_options())
-        else:
-            driver = webdriver.Chrome(options=make_options())
-        driver.maximize_window()
-        logger.info("---Driver Loaded")
+        WebDriverWait(driver, APPLY_FORM_TIMEOUT, poll_frequency=0.5).until(lambda d: d.execute_script(APPLY_FORM_JS))
+        landed = True
+    except TimeoutException:
+        landed = False
+
+    stats = APPLY_ROUTES.get(tenant, 'direct', {'hits': 0, 'misses': 0})
+    stats['hits' if landed else 'misses'] += 1
+    APPLY_ROUTES.set(tenant, 'direct', stats)
+    if landed:
+        logger.info(f"Navigated directly to the application form - {form_url}")
+        learn_apply_url(job_url, form_url)
+        return True
 
-        # Loading the Job Base Page
-        driver.get(job_url)
-        logger.info(f"---Page Loaded - {job_url}")
-        wait_here(3, 5)
+    logger.warning(f"Application form did not open at {form_url} - going through the job page")
+    driver.get(job_url)
+    wait_here(3, 5)
+    return False
 
-        hide_webdriver(driver)
 
-        # inject_stealth_scripts(driver)
-        random_scroll(driver)
-        wait_here(3, 5)
+class BrowserPrefetcher:
+    """
+    This class launches the browsers of upcoming jobs in the background and opens their job page, so the next job
+    starts on a ready page. At most depth browsers are prepared ahead, and only while enough memory stays free.
+    """
+    def __init__(self, depth, min_free_mb, candidate=DEFAULT_CANDIDATE):
+        self.depth = depth
+        self.min_free_mb = min_free_mb
+        self.candidate = candidate
+        self.pending = {}
+        self._executor = None
+
+    @staticmethod
+    def _key(job_url):
+        return f"prefetch-{get_job_id(job_url)}"
+
+    def _prepare(self, job_url):
+        set_job_context(job_id=get_job_id(job_url), tenant=get_tenant(job_url), candidate=self.candidate.name)
+        key = self._key(job_url)
+        try:
+            driver = launch_browser(self.candidate)
+            SUPERVISOR.register(key, driver)
+            open_job_page(driver, job_url)
+            logger.info(f"Prefetched browser ready for {job_url}")
+            return driver
+        except Exception as exc:
+            logger.warning(f"Prefetch of {job_url} failed: {repr(exc)}")
+            SUPERVISOR.release(key)
+            return None
+        finally:
+            clear_job_context()
+
+    def _has_memory(self):
+        available = SUPERVISOR.available_memory_mb()
+        in_flight = sum(1 for future in self.pending.values() if not future.done())
+        if available is None:
+            # Without psutil the memory is unknown - prepare one browser at a time
+            return in_flight == 0
+        return available - SUPERVISOR.expected_browser_mb() * (in_flight + 1) >= self.min_free_mb
+
+    def schedule(self, job_urls, current_url=None):
+        """
+        Prefetches the first depth jobs of job_urls and drops prefetched browsers of jobs that are no longer next
+        (except the one of current_url, which is about to be taken)
+        """
+        upcoming = job_urls[:self.depth]
+        for job_url in list(self.pending):
+            if job_url not in upcoming and job_url != current_url:
+                self.discard(job_url)
+        for job_url in upcoming:
+            if job_url in self.pending:
+                continue
+            if not self._has_memory():
+                logger.info(f"Not enough free memory to prefetch {job_url}")
+                break
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.depth, thread_name_prefix='prefetch')
+            self.pending[job_url] = self._executor.submit(self._prepare, job_url)
+
+    def take(self, job_url, worker, timeout=120):
+        """
+        Returns the prepared browser of job_url, handed over to worker in the supervisor
+
+        Returns:
+            WebDriver: The browser, None if job_url was not prefetched or the prefetch failed
+        """
+        future = self.pending.get(job_url)
+        if future is None:
+            return None
+        try:
+            driver = future.result(timeout=timeout)
+        except Exception:
+            logger.warning(f"Prefetch of {job_url} not ready after {timeout}s - starting a new browser")
+            self.discard(job_url)
+            return None
+        self.pending.pop(job_url, None)
+        if driver is not None:
+            SUPERVISOR.transfer(self._key(job_url), worker)
+        return driver
+
+    def discard(self, job_url):
+        """
+        Closes the prefetched browser of job_url (once its preparation is done)
+        """
+        future = self.pending.pop(job_url, None)
+        if future is not None:
+            future.add_done_callback(lambda _, key=self._key(job_url): SUPERVISOR.release(key))
+
+    def shutdown(self):
+        """
+        Closes all unused prefetched browsers
+        """
+        for job_url in list(self.pending):
+            self.discard(job_url)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+class ApplicationWizard:
+    """
+    This class drives the application wizard (after My Experience) as an explicit state machine:
+    inspect -> (advance -> fill -> inspect)* -> submit. It is bounded by a maximum number of steps, a maximum
+    number of visits per page fingerprint (stuck pages and cycles) and the job watchdog.
+    """
+    INSPECT = 'inspect'
+    ADVANCE = 'advance'
+    FILL = 'fill'
+    SUBMIT = 'submit'
+
+    def __init__(self, driver, watchdog=None, max_steps=None, max_revisits=None, recorder=None, candidate=DEFAULT_CANDIDATE):
+        self.driver = driver
+        self.candidate = candidate
+        self.watchdog = watchdog
+        self.recorder = recorder
+        self.max_steps = max_steps or WIZARD_MAX_STEPS
+        self.max_revisits = max_revisits or WIZARD_MAX_REVISITS
+        self.visits = Counter()
+        self.steps = 0
+        self.fingerprint = None
+
+    def run(self):
+        """
+        Runs the wizard until it is submitted or gives up
+        Returns: tuple (success: bool, error_message: str)
+        """
+        state = self.INSPECT
+        while True:
+            if self.watchdog and self.watchdog.expired:
+                return False, f"Job exceeded deadline of {self.watchdog.deadline_seconds} seconds"
+
+            if state == self.INSPECT:
+                self.fingerprint = get_page_fingerprint(self.driver)
+                signature = self.fingerprint['signature']
+                self.visits[signature] += 1
+                if self.visits[signature] > self.max_revisits:
+                    return False, f"Stuck on {self.fingerprint['page_type']} page after {self.visits[signature] - 1} attempts - {self.fingerprint['errors']}"
+                self.steps += 1
+                if self.steps > self.max_steps:
+                    return False, f"Application wizard exceeded {self.max_steps} steps"
+                state = self.SUBMIT if self.fingerprint['has_submit'] else self.ADVANCE
+
+            elif state == self.ADVANCE:
+                if not self.fingerprint['has_next']:
+                    return False, "Failed to proceed through application pages - next button not found"
+                if not press_next_button(self.driver):
+                    # Validation errors keep us on the same page - refill it, the visit counter bounds the retries
+                    logger.warning(f"Retrying {self.fingerprint['page_type']} page after errors")
+                state = self.FILL
+
+            elif state == self.FILL:
+                process_the_elements(self.driver, candidate=self.candidate)
+                fingerprint = get_page_fingerprint(self.driver)
+                page_handler = PAGE_HANDLERS.get(fingerprint['page_type'])
+                if self.recorder:
+                    actions = ['process_the_elements'] + ([page_handler.__name__] if page_handler else [])
+                    self.recorder.record(self.driver, fingerprint['page_type'], fingerprint, actions)
+                if page_handler:
+                    logger.info(f"Filling {fingerprint['page_type']} page (step {fingerprint['step_index'] + 1}/{fingerprint['step_count']})")
+                    page_handler(self.driver, self.candidate)
+                state = self.INSPECT
+
+            elif state == self.SUBMIT:
+                debug_pause("Press any key to submit the form ...")
+                submit_button = self.driver.find_element(By.XPATH, '//button[@data-automation-id="pageFooterNextButton"]')
+                self.driver.execute_script("arguments[0].click();", submit_button)
+                return self.confirm_submission()
+
+    def confirm_submission(self):
+        """
+        Checks what Submit led to
+        Returns: tuple (success: bool, message: str) - the message of a success is a note for the jobs file
+        """
+        outcome = wait_for_submission(self.driver)
+        if outcome['state'] == 'submitted':
+            logger.info(f"Application submitted - {outcome['detail']}")
+            return True, ""
+        if outcome['state'] == 'error':
+            return False, f"Submit failed - {outcome['detail']}"
+        if outcome['has_submit']:
+            return False, f"Submit not accepted within {SUBMIT_CONFIRM_TIMEOUT} seconds - still on the review page"
+        # The wizard is gone without a recognized confirmation - most likely submitted, never submit twice
+        logger.warning("Submit went through without a recognized confirmation page")
+        return True, f"Submitted, no confirmation page within {SUBMIT_CONFIRM_TIMEOUT} seconds"
+
+
+def apply_to_job(job_url, prefetcher=None, candidate=DEFAULT_CANDIDATE):
+    """
+    Apply to a Job on Workday as candidate
+    Uses the browser prepared by prefetcher for this job if there is one
+    Returns: tuple (success: bool, error_message: str)
+    """
+    driver = None
+    watchdog = None
+    error_message = ""
+    succeeded = False
+    worker = threading.current_thread().name
+    recorder = SnapshotRecorder(get_job_id(job_url), job_url) if RECORD_SNAPSHOTS else None
+    profiler = CommandProfiler(job_url, [__file__]).activate() if PROFILE_WEBDRIVER_COMMANDS else None
+    set_job_context(job_id=get_job_id(job_url), tenant=get_tenant(job_url), candidate=candidate.name)
 
-        # Handle cookie consent banner if present
-        handle_cookie_consent(driver)
-        wait_here(2, 3)
+    try:
+        driver = prefetcher.take(job_url, worker) if prefetcher else None
+        prefetched = driver is not None
+        if not prefetched:
+            logger.info("---Loading Driver")
+            driver = launch_browser(candidate)
+            SUPERVISOR.register(worker, driver)
+        if profiler:
+            profiler.attach(driver)
+        if NETWORK_CAPTURE:
+            driver.network_capture = NetworkCapture(driver)
+        watchdog = JobWatchdog(worker, JOB_DEADLINE_SECONDS, job_url).start()
+        if prefetched:
+            logger.info("---Using prefetched browser with the job page loaded")
+        else:
+            logger.info("---Driver Loaded")
+            open_job_page(driver, job_url)
 
         # Checking if the user login is valid - otherwise trying to log into the account and then open job url
         account_settings_button = driver.find_elements(By.XPATH, '//button[@id="accountSettingsButton"]/span[2]')
         if account_settings_button:
             login_info = account_settings_button[0].text
-            if login_info == os.getenv('USER_EMAIL'):
+            if login_info == candidate.email:
                 logger.info(f"User {login_info} is logged in")
             else:
-                error_message = f"User {os.getenv('USER_EMAIL')} is not logged in browser"
+                error_message = f"User {candidate.email} is not logged in browser"
                 logger.error(error_message)
-                if driver:
-                    driver.quit()
-                    del driver
                 return False, error_message
         else:
-            logger.error(f"User {os.getenv('USER_EMAIL')} is not logged in browser")
+            logger.error(f"User {candidate.email} is not logged in browser")
 
             account_settings_button = driver.find_elements(By.XPATH, '//button[@data-automation-id="utilityButtonSignIn"]/span[2]')
             if account_settings_button:
@@ -383,9 +962,6 @@ def apply_to_job(job_url):
             else:
                 error_message = "Sign In button not found"
                 logger.error(error_message)
-                if driver:
-                    driver.quit()
-                    del driver
                 return False, error_message
 
             if login_info.lower() == "sign in":
@@ -393,9 +969,6 @@ def apply_to_job(job_url):
             else:
                 error_message = "Sign In button not found"
                 logger.error(error_message)
-                if driver:
-                    driver.quit()
-                    del driver
                 return False, error_message
 
             logger.info("Trying to Log in the user")
@@ -407,22 +980,16 @@ def apply_to_job(job_url):
             logger.info("Clicked on Account Settings button")
             wait_here(3, 5)
             # Replace manual clear/send_keys with safe_send_keys
-            if not safe_send_keys(driver, '//input[contains(@id, "input") and @data-automation-id="email"]', os.getenv('USER_EMAIL')):
+            if not safe_send_keys(driver, '//input[contains(@id, "input") and @data-automation-id="email"]', candidate.email):
                 error_message = "Email input field not found or failed to send keys"
                 logger.error(error_message)
-                if driver:
-                    driver.quit()
-                    del driver
                 return False, error_message
             wait_here(3, 5)
 
             # Replace manual clear/send_keys with safe_send_keys
-            if not safe_send_keys(driver, '//input[contains(@id, "input") and @data-automation-id="password"]', os.getenv('USER_PASSWORD')):
+            if not safe_send_keys(driver, '//input[contains(@id, "input") and @data-automation-id="password"]', candidate.password):
                 error_message = "Password input field not found or failed to send keys"
                 logger.error(error_message)
-                if driver:
-                    driver.quit()
-                    del driver
                 return False, error_message
             wait_here(3, 5)
 
@@ -433,9 +1000,6 @@ def apply_to_job(job_url):
             else:
                 error_message = "Sign In button not found"
                 logger.error(error_message)
-                if driver:
-                    driver.quit()
-                    del driver
                 return False, error_message
             wait_here(3, 5)
 
@@ -447,7 +1011,7 @@ def apply_to_job(job_url):
 
                 wait_here(3, 5)
 
-                make_new_account(driver)
+                make_new_account(driver, candidate=candidate)
 
             # Loading the Job Base Page
             driver.get(job_url)
@@ -458,14 +1022,11 @@ def apply_to_job(job_url):
             account_settings_button = driver.find_elements(By.XPATH, '//button[@id="accountSettingsButton"]/span[2]')
             if account_settings_button:
                 login_info = account_settings_button[0].text
-                if login_info == os.getenv('USER_EMAIL'):
+                if login_info == candidate.email:
                     logger.info(f"User {login_info} is logged in")
                 else:
-                    error_message = f"User {os.getenv('USER_EMAIL')} is not logged in browser after login attempt"
+                    error_message = f"User {candidate.email} is not logged in browser after login attempt"
                     logger.error(error_message)
-                    if driver:
-                        driver.quit()
-                        del driver
                     return False, error_message
             else:
                 signin_button = driver.find_elements(By.XPATH, '//button[@data-automation-id="utilityButtonSignIn"]')
@@ -474,29 +1035,28 @@ def apply_to_job(job_url):
                 if signin_button:
                     logger.info("Sign IN button is there --- trying without signing in")
                 else:
-                    if driver:
-                        driver.quit()
-                        del driver
                     return False, error_message
 
         wait_here(3, 5)
 
         skip_process_elements = False
 
-        apply_manually_button = driver.find_elements(By.XPATH, '//a[@data-automation-id="applyManually"]')
-        if apply_manually_button:
+        # Straight to the form when its URL is known or predictable, the buttons of the job page otherwise
+        on_apply_form = open_apply_form(driver, job_url)
+        apply_manually_button = [] if on_apply_form else driver.find_elements(By.XPATH, '//a[@data-automation-id="applyManually"]')
+        if on_apply_form:
+            pass
+        elif apply_manually_button:
             link_to_follow = apply_manually_button[0].get_attribute('href')
             driver.get(link_to_follow)
             logger.info(f"Navigated to Apply Manually page - {link_to_follow}")
+            learn_apply_url(job_url, link_to_follow)
             wait_here(3, 5)
         else:
             page_loaded = wait_for_page_loading(driver)
             if not page_loaded:
                 error_message = "Page stuck at loading"
                 logger.error(error_message)
-                if driver:
-                    driver.quit()
-                    del driver
                 return False, error_message
             
             logger.error("Apply Manually button not found")
@@ -516,9 +1076,6 @@ def apply_to_job(job_url):
                 if not page_loaded:
                     error_message = "Page stuck at loading"
                     logger.error(error_message)
-                    if driver:
-                        driver.quit()
-                        del driver
                     return False, error_message
 
                 apply_manually_button = driver.find_elements(By.XPATH, '//a[@data-automation-id="applyManually"]')
@@ -526,6 +1083,7 @@ def apply_to_job(job_url):
                     link_to_follow = apply_manually_button[0].get_attribute('href')
                     driver.get(link_to_follow)
                     logger.info(f"Navigated to Apply Manually page - {link_to_follow}")
+                    learn_apply_url(job_url, link_to_follow)
                     wait_here(3, 5)
                 else:
                     error_message = "Apply Manually button not found after continue"
@@ -537,6 +1095,7 @@ def apply_to_job(job_url):
                         link_to_follow = apply_manually_button[0].get_attribute('href')
                         driver.get(link_to_follow)
                         logger.info(f"Navigated to Apply Manually page - {link_to_follow}")
+                        learn_apply_url(job_url, link_to_follow)
                         wait_here(3, 5)
                     else:
                         error_message = "Apply Manually button not found after continue - 2"
@@ -548,91 +1107,73 @@ def apply_to_job(job_url):
                 if not page_loaded:
                     error_message = "Page stuck at loading"
                     logger.error(error_message)
-                    if driver:
-                        driver.quit()
-                        del driver
                     return False, error_message
 
                 if driver.find_elements(By.XPATH, '//button[@data-automation-id="createAccountSubmitButton"]'):
-                    make_new_account(driver, skip_create_link=True)
+                    make_new_account(driver, skip_create_link=True, candidate=candidate)
 
                 page_loaded = wait_for_page_loading(driver)
                 if not page_loaded:
                     error_message = "Page stuck at loading"
                     logger.error(error_message)
-                    if driver:
-                        driver.quit()
-                        del driver
                     return False, error_message
 
             else:
                 logger.error("Continue button not found")
 
                 if driver.find_elements(By.XPATH, '//button[@data-automation-id="createAccountSubmitButton"]'):
-                    make_new_account(driver, skip_create_link=True)
+                    make_new_account(driver, skip_create_link=True, candidate=candidate)
 
                 page_loaded = wait_for_page_loading(driver)
                 if not page_loaded:
                     error_message = "Page stuck at loading"
                     logger.error(error_message)
-                    if driver:
-                        driver.quit()
-                        del driver
                     return False, error_message
 
                 # if TESTING:
                 #     skip_process_elements = True
                 #     error_message = True
                 # else:
-                error_message = process_the_elements(driver, page=1)
+                if recorder:
+                    recorder.record(driver, 'my_information', get_page_fingerprint(driver), ['process_the_elements'])
+                error_message = process_the_elements(driver, page=1, candidate=candidate)
                 if error_message not in [True, False]:
-                    if driver:
-                        driver.quit()
-                        del driver
                     return False, error_message
 
                 if error_message:
                     skip_process_elements = True
                 else:
                     error_message = "Failed to process elements on job page"
-                    if driver:
-                        driver.quit()
-                        del driver
                     return False, error_message
 
         if driver.find_elements(By.XPATH, '//button[@data-automation-id="createAccountSubmitButton"]'):
-            make_new_account(driver, skip_create_link=True)
+            make_new_account(driver, skip_create_link=True, candidate=candidate)
 
         page_loaded = wait_for_page_loading(driver)
         if not page_loaded:
             error_message = "Page stuck at loading"
             logger.error(error_message)
-            if driver:
-                driver.quit()
-                del driver
             return False, error_message
 
         # if TESTING:
         #     pass
         # else:
         if not skip_process_elements:
-            error_message = process_the_elements(driver, page=1)
+            if recorder:
+                recorder.record(driver, 'my_information', get_page_fingerprint(driver), ['process_the_elements'])
+            error_message = process_the_elements(driver, page=1, candidate=candidate)
             if error_message not in [True, False]:
-                if driver:
-                    driver.quit()
-                    del driver
                 return False, error_message
 
         # input("Press any key to continue to Page 2...")
         is_success = press_next_button(driver)
         if not is_success:
             error_message = "Failed to proceed to next page - next button not found or not clickable"
-            if driver:
-                driver.quit()
-                del driver
             return False, error_message
 
-        process_data_insertion_page2(driver)
+        if recorder:
+            recorder.record(driver, 'my_experience', get_page_fingerprint(driver), ['process_data_insertion_page2'])
+        process_data_insertion_page2(driver, candidate)
 
         # if TESTING:
         #     return True, "Page 2 completed successfully"
@@ -641,67 +1182,53 @@ def apply_to_job(job_url):
         # https://pureinsurance.wd5.myworkdayjobs.com/en-US/PURE/job/Remote---US/Sr-Data-Scientist_R2430/apply/applyManually?source=LinkedIn
         # https://reliaquest.wd5.myworkdayjobs.com/en-US/ReliaQuest_Careers/job/Dublin/Data-Scientist_R14215/apply?source=LinkedIn
 
-        while True:
-            try:
-                wait_here(1, 2)  # Small wait before getting element
-                submit_button = driver.find_element(By.XPATH, '//button[@data-automation-id="pageFooterNextButton" and contains(text(), "Submit")]')
-            except:
-                submit_button = None
-            
-            if submit_button:
-                # input("Press any key to submit the form ...")
-                driver.execute_script("arguments[0].click();", submit_button)
-                break
-
-            is_success = press_next_button(driver)
-            if not is_success:
-                error_message = "Failed to proceed through application pages - next button not found"
-                if driver:
-                    driver.quit()
-                    del driver
-                return False, error_message
-
-            process_the_elements(driver)
-
-            if is_application_questions_page(driver):
-                check_and_fill_application_questions(driver)
-
-            elif is_disability_page(driver):
-                check_and_fill_disability(driver)
-                wait_here(3, 5)
-
-            elif is_voluntry_disclosures_page(driver):
-                check_and_fill_voluntry_disclosures(driver)
-                wait_here(3, 5)
-
-        input('Press any key to close browser...')
+        is_success, error_message = ApplicationWizard(driver, watchdog, recorder=recorder, candidate=candidate).run()
+        if not is_success:
+            logger.error(error_message)
+            return False, error_message
 
-        # closing driver
+        # closing driver right away, the next job does not wait for it
         logger.info("---Closing the Automation Window")
-        driver.quit()
-        del driver
+        SUPERVISOR.release(worker)
         logger.info("---Automation Window Closed")
 
-        return True, ""
+        succeeded = True
+        return True, error_message
 
     except Exception as exc:
-        error_message = f"Exception during job application: {str(exc)}"
-        logger.error(error_message, exc_info=True)
-
-        if TESTING:
-            input("Testing system ---- waiting for user input")
-
-        if driver:
-            driver.quit()
-            del driver
-            driver = None
+        if watchdog and watchdog.expired:
+            error_message = f"Job exceeded deadline of {JOB_DEADLINE_SECONDS} seconds"
+            logger.error(error_message)
+        elif SUPERVISOR.kill_reason(worker):
+            error_message = SUPERVISOR.kill_reason(worker)
+            logger.error(error_message)
+        else:
+            error_message = f"Exception during job application: {str(exc)}"
+            logger.error(error_message, exc_info=True)
+
+            debug_pause("Testing system ---- waiting for user input")
+
+    finally:
+        # Only grabbing happens here, compressing and writing is done by the artifact writer thread
+        browser_alive = not (watchdog and watchdog.expired) and not SUPERVISOR.kill_reason(worker)
+        if CAPTURE_FAILURES and not succeeded and driver is not None and browser_alive:
+            ARTIFACTS.submit(get_job_id(job_url), capture_failure(driver, job_url, error_message))
+
+        # Releases the browser on every exit path (early returns, exceptions, deadline, resource limits)
+        if watchdog:
+            watchdog.cancel()
+        if profiler:
+            profiler.deactivate()
+            profiler.report()
+        SUPERVISOR.release(worker)
+        clear_job_context()
 
     return False, error_message
 
 
-def make_new_account(driver, skip_create_link=False):
+def make_new_account(driver, skip_create_link=False, candidate=DEFAULT_CANDIDATE):
     """
-    Make new account on workday
+    Make new account on workday with the credentials of candidate
     """
     try:
         if not skip_create_link:
@@ -711,19 +1238,19 @@ def make_new_account(driver, skip_create_link=False):
             wait_here(2, 4)
 
         # Replace manual clear/send_keys with safe_send_keys
-        if not safe_send_keys(driver, '//input[@data-automation-id="email"]', os.getenv('USER_EMAIL')):
+        if not safe_send_keys(driver, '//input[@data-automation-id="email"]', candidate.email):
             logger.error("Failed to enter email in account creation")
             return False
         
         wait_here(2, 4)
         # Replace manual clear/send_keys with safe_send_keys
-        if not safe_send_keys(driver, '//input[@data-automation-id="password"]', os.getenv('USER_PASSWORD')):
+        if not safe_send_keys(driver, '//input[@data-automation-id="password"]', candidate.password):
             logger.error("Failed to enter password in account creation")
             return False
         
         wait_here(2, 4)
         # Replace manual clear/send_keys with safe_send_keys
-        if not safe_send_keys(driver, '//input[@data-automation-id="verifyPassword"]', os.getenv('USER_PASSWORD')):
+        if not safe_send_keys(driver, '//input[@data-automation-id="verifyPassword"]', candidate.password):
             logger.error("Failed to enter verify password in account creation")
             return False
         
@@ -747,36 +1274,6 @@ def make_new_account(driver, skip_create_link=False):
         logger.error(f"Exception: {exc}", exc_info=True)
 
 
-def delete_experience_from_page2(driver):
-    """
-    Deletes work experience from Page 2
-    """
-    try:
-        delete_work_experiences = driver.find_elements(By.XPATH, '//h4[contains(@id, "Work-Experience")]/following-sibling::button[contains(text(), "Delete")]')
-        i = 1
-        while i <= len(delete_work_experiences):
-            driver.find_element(By.XPATH, "//h4[contains(@id, 'Work-Experience')]/following-sibling::button[contains(text(), 'Delete')]").click()
-            i = i+1
-            time.sleep(1)
-    except Exception as exc:
-        logger.error(f"Exception: {exc}", exc_info=True)
-
-
-def delete_education_from_page2(driver):
-    """
-    Deletes education from Page 2
-    """
-    try:
-        delete_work_experiences = driver.find_elements(By.XPATH, '//h4[contains(@id, "Education")]/following-sibling::button[contains(text(), "Delete")]')
-        i = 1
-        while i <= len(delete_work_experiences):
-            driver.find_element(By.XPATH, '//h4[contains(@id, "Education")]/following-sibling::button[contains(text(), "Delete")]').click()
-            i = i+1
-            time.sleep(1)
-    except Exception as exc:
-        logger.error(f"Exception: {exc}", exc_info=True)
-
-
 def escape_xpath_text(text):
     """
     Escapes text for use in an XPath expression.
@@ -792,19 +1289,160 @@ def escape_xpath_text(text):
         return f"'{text}'"
 
 
+# Waits for the open listbox, scores its options against the wanted values and clicks the best one - all in the page.
+# Resolves with the status, the clicked text and every option text (cached per tenant).
+MATCH_LISTBOX_OPTION_JS = """
+const values = arguments[0].map((v) => String(v).trim());
+const timeoutMs = arguments[1];
+const done = arguments[arguments.length - 1];
+const started = Date.now();
+const isVisible = (el) => !!(el && (el.offsetParent !== null || el.getClientRects().length));
+const score = (text) => {
+    let best = 0;
+    const lower = text.toLowerCase();
+    for (const value of values) {
+        const wanted = value.toLowerCase();
+        if (text === value) { best = Math.max(best, 4); }
+        else if (lower === wanted) { best = Math.max(best, 3); }
+        else if (lower.startsWith(wanted)) { best = Math.max(best, 2); }
+        else if (lower.indexOf(wanted) !== -1) { best = Math.max(best, 1); }
+    }
+    return best;
+};
+const waitClosed = (listbox, result) => {
+    if (!listbox.isConnected || !isVisible(listbox) || Date.now() - started > timeoutMs) { return done(result); }
+    setTimeout(() => waitClosed(listbox, result), 50);
+};
+const attempt = () => {
+    const listbox = Array.from(document.querySelectorAll('[role="listbox"]')).filter(isVisible).pop();
+    const options = listbox ? Array.from(listbox.querySelectorAll('[role="option"]')).filter(isVisible) : [];
+    if (!options.length) {
+        if (Date.now() - started > timeoutMs) { return done({status: listbox ? 'no_options' : 'no_listbox', options: []}); }
+        return setTimeout(attempt, 100);
+    }
+    const texts = options.map((o) => o.textContent.trim());
+    let bestIndex = -1;
+    let bestScore = 0;
+    texts.forEach((text, index) => {
+        const optionScore = score(text);
+        if (optionScore > bestScore) { bestScore = optionScore; bestIndex = index; }
+    });
+    if (bestIndex === -1) { return done({status: 'no_match', options: texts}); }
+    const option = options[bestIndex];
+    option.scrollIntoView({block: 'nearest'});
+    (option.querySelector('div') || option).click();
+    waitClosed(listbox, {status: 'clicked', text: texts[bestIndex], score: bestScore, options: texts});
+};
+attempt();
+"""
+
+DROPDOWN_TIMEOUT_MS = 8000
+# Learned dropdown options are trusted (a missing answer skips the dropdown) for this many days, then read again
+DROPDOWN_OPTIONS_MAX_AGE_DAYS = float(os.getenv('DROPDOWN_OPTIONS_MAX_AGE_DAYS', '7'))
+
+# Scrolls a dropdown button into view and returns its value and the fingerprint of its question
+# (form field id and legend/label text), which identifies the question better than the xpath used to find it
+DROPDOWN_STATE_JS = """
+const button = arguments[0];
+button.scrollIntoView({block: 'center'});
+const normalize = (text) => (text || '').replace(/\\s+/g, ' ').trim().toLowerCase();
+const field = button.closest('[data-automation-id^="formField-"]');
+const fieldset = button.closest('fieldset');
+const label = fieldset && fieldset.querySelector('legend') ? fieldset.querySelector('legend').textContent
+    : (field && field.querySelector('label') ? field.querySelector('label').textContent : button.getAttribute('aria-label'));
+const parts = [field ? field.getAttribute('data-automation-id') : '', button.id || button.getAttribute('name') || '', normalize(label)];
+return {value: button.textContent.trim(), question: parts.some((part) => part) ? parts.join('|') : ''};
+"""
+
+
+def score_option(text, values):
+    """
+    Scores an option text against the wanted values: exact 4, case-insensitive 3, prefix 2, contains 1, no match 0
+    (same rules as MATCH_LISTBOX_OPTION_JS)
+    """
+    text = text.strip()
+    lower = text.lower()
+    best = 0
+    for value in values:
+        value = str(value).strip()
+        wanted = value.lower()
+        if text == value:
+            best = max(best, 4)
+        elif lower == wanted:
+            best = max(best, 3)
+        elif lower.startswith(wanted):
+            best = max(best, 2)
+        elif wanted in lower:
+            best = max(best, 1)
+    return best
+
+
 def open_and_click_dropdown(driver, xpath_to_search, value_to_click, text_to_print):
     """
     Performs the clicks on Dropdowns
     """
     error = 'dropdown not found'
     xpath_to_use = ''
+    values = value_to_click if isinstance(value_to_click, list) else [value_to_click]
     try:
-        driver.execute_script("arguments[0].scrollIntoView(true);", driver.find_element(By.XPATH, xpath_to_search))
-        wait_here(2, 5)
+        tenant = get_tenant(driver.current_url)
+
+        # Questions located by their legend can be looked up in the captured page definition of this page
+        question_text = re.search(r'legend\[contains\(\.//text\(\), "([^"]+)"\)', xpath_to_search)
+        model = current_page_model(driver) if question_text else None
+        if model and model.has_questions():
+            question = model.find_question(question_text.group(1))
+            if question is None:
+                logger.info(f"{text_to_print} - Status: not on this page (page definition)")
+                return False
+            if question['options'] and not any(score_option(option, values) for option in question['options']):
+                error = f"none of {values} in options {question['options']} (page definition)"
+                logger.info(f"{text_to_print} - Status: {error}")
+                return False
+
+        dropdown_button = driver.find_element(By.XPATH, xpath_to_search)
+        state = driver.execute_script(DROPDOWN_STATE_JS, dropdown_button)
+        current_value = state['value']
+        if current_value and score_option(current_value, values) >= 3:
+            logger.info(f"{text_to_print} - Status: already set to {current_value}")
+            return True
+
+        # Options learned for this question on earlier jobs answer a miss without opening the dropdown
+        # while they are fresh - older ones (or entries without a stamp) are read again
+        question_key = state['question'] or xpath_to_search
+        known = FORM_SCHEMA.get(tenant, 'dropdown_options', {}).get(question_key)
+        if isinstance(known, dict) and known.get('options') and not any(score_option(option, values) for option in known['options']):
+            learned_at = datetime.strptime(known['learned_at'], '%Y-%m-%d %H:%M:%S')
+            if get_clock().now() - learned_at <= timedelta(days=DROPDOWN_OPTIONS_MAX_AGE_DAYS):
+                error = f"none of {values} in known options {known['options']}"
+                logger.info(f"{text_to_print} - Status: {error}")
+                return False
+            logger.info(f"{text_to_print} - none of {values} in known options learned {known['learned_at']}, reading the dropdown again")
+
         error = "element found - not clicked"
-        driver.find_element(By.XPATH, xpath_to_search).click()
-        wait_here(5, 10)
+        dropdown_button.click()
         error = "element clicked - dropdown value not found"
+        result = driver.execute_async_script(MATCH_LISTBOX_OPTION_JS, values, DROPDOWN_TIMEOUT_MS)
+        if result.get('options'):
+            FORM_SCHEMA.update(tenant, 'dropdown_options', {question_key: {
+                'options': result['options'],
+                'learned_at': get_clock().now().strftime('%Y-%m-%d %H:%M:%S'),
+            }})
+
+        if result['status'] == 'clicked':
+            logger.info(f"Selected {result['text']} for {values}")
+            return True
+
+        if result['status'] == 'no_match':
+            logger.info(f"{text_to_print} - Status: none of {values} in {result['options']}")
+            try:
+                dropdown_button.send_keys(Keys.ESCAPE)
+            except Exception:
+                pass
+            return False
+
+        # No listbox rendered - fall back to searching the whole document
+        logger.info(f"{text_to_print} - listbox not found, searching the page")
         if isinstance(value_to_click, list):
             xpath_to_use =  "//div["
             for index_, val_ in enumerate(value_to_click):
@@ -828,45 +1466,381 @@ def open_and_click_dropdown(driver, xpath_to_search, value_to_click, text_to_pri
                     if value_to_click in ad_.text:
                         if value_to_click == ad_.text:
                             best_match = ind_
-                        # driver.execute_script("arguments[0].click();", ad_)
-                        # wait_here(1, 2)
-                        # break
 
             ad[best_match].click()
-        wait_here(3, 5)
+        wait_here(1, 2)
         return True
     except Exception as exc:
         logger.info(f"{text_to_print} - Status: {error} - {repr(exc)} - {xpath_to_use}")
     return False
 
 
-def process_data_insertion_page2(driver):
+# Waits for the typeahead results of the current search and clicks the best one.
+# Results identical to the previous search (arguments[1]) are treated as not refreshed yet.
+# Nothing is clicked when no result matches any of the values at all.
+SELECT_PROMPT_OPTION_JS = """
+const values = arguments[0].map((v) => String(v).trim().toLowerCase());
+const previous = arguments[1].join('|');
+const timeoutMs = arguments[2];
+const done = arguments[arguments.length - 1];
+const started = Date.now();
+const isVisible = (el) => !!(el && (el.offsetParent !== null || el.getClientRects().length));
+let lastSeen = null;
+const pick = (nodes, texts, status) => {
+    const candidates = texts.map((text, index) => [text, index]).filter(([text]) => text.indexOf('No Items.') === -1);
+    if (!candidates.length) { return done({status: 'no_match', options: texts}); }
+    const score = (text) => {
+        const lower = text.toLowerCase();
+        return Math.max(...values.map((v) => (lower === v ? 3 : (lower.startsWith(v) ? 2 : (lower.indexOf(v) !== -1 ? 1 : 0)))));
+    };
+    candidates.sort((a, b) => score(b[0]) - score(a[0]));
+    const [text, index] = candidates[0];
+    const best = score(text);
+    if (best === 0) {
+        // Settled results without a match mean the tenant has none; timed-out ones may still be stale
+        return done({status: status === 'clicked' ? 'no_match' : 'no_confident_match', options: texts});
+    }
+    nodes[index].click();
+    done({status: status, text: text, score: best, options: texts});
+};
+const attempt = () => {
+    const nodes = Array.from(document.querySelectorAll('[data-automation-id="promptLeafNode"]')).filter(isVisible);
+    const texts = nodes.map((n) => n.textContent.trim());
+    const seen = texts.join('|');
+    const timedOut = Date.now() - started > timeoutMs;
+    if (nodes.length && seen !== previous && seen === lastSeen) { return pick(nodes, texts, 'clicked'); }
+    if (timedOut) {
+        return nodes.length ? pick(nodes, texts, 'clicked_unconfirmed') : done({status: 'timeout', options: []});
+    }
+    lastSeen = seen;
+    setTimeout(attempt, 150);
+};
+attempt();
+"""
+
+TYPEAHEAD_TIMEOUT_MS = 6000
+
+
+def select_prompt_option(driver, values, previous_options=None, timeout_ms=TYPEAHEAD_TIMEOUT_MS):
+    """
+    Picks the best typeahead result for values once the results have settled
+
+    Returns:
+        dict: status ('clicked', 'clicked_unconfirmed', 'no_match', 'no_confident_match', 'timeout'), clicked text,
+        its score (3 exact, 2 prefix, 1 contains) and all option texts
+    """
+    try:
+        return driver.execute_async_script(SELECT_PROMPT_OPTION_JS, list(values), list(previous_options or []), timeout_ms)
+    except Exception as exc:
+        logger.warning(f"Could not select prompt option for {values}: {repr(exc)}")
+        return {'status': 'timeout', 'options': []}
+
+
+def fill_skills(driver, candidate=DEFAULT_CANDIDATE):
+    """
+    Enters the profile skills into the skills typeahead.
+    Skills the tenant's taxonomy does not know are skipped and known ones are typed as their resolved entry.
+    """
+    skills_input = driver.find_elements(By.XPATH, '//div[@data-automation-id="formField-skills"]//input')
+    if not skills_input:
+        return
+
+    tenant = get_tenant(driver.current_url)
+    known_skills = TYPEAHEAD_CACHE.get(tenant, 'skills', {})
+    resolved = {}
+    previous_options = []
+
+    driver.execute_script("arguments[0].click();", skills_input[0])
+    for skill in candidate.profile['skills']:
+        if skill in known_skills and known_skills[skill] is None:
+            logger.info(f"Skipping skill {skill} - not in {tenant} taxonomy")
+            continue
+
+        search_text = known_skills.get(skill) or skill
+        skills_input[0].send_keys(search_text)
+        skills_input[0].send_keys(Keys.ENTER)
+        result = select_prompt_option(driver, [search_text, skill], previous_options)
+        previous_options = result['options']
+
+        # Only confirmed outcomes are remembered - a slow search must not mark a skill as unknown
+        if result['status'] == 'clicked' and result.get('score', 0) > 0:
+            resolved[skill] = result['text']
+        elif result['status'] == 'no_match':
+            resolved[skill] = None
+            logger.info(f"Skill {skill} has no match on {tenant}")
+            skills_input[0].clear()
+        elif result['status'] == 'no_confident_match':
+            logger.info(f"Skill {skill} - none of the results {result['options']} matches")
+            skills_input[0].clear()
+
+    if resolved:
+        TYPEAHEAD_CACHE.update(tenant, 'skills', resolved)
+
+
+# Reads what the My Experience page already holds (tenants remember earlier applications) in one call
+READ_PAGE2_SECTIONS_JS = """
+const value = (root, selector) => { const el = root.querySelector(selector); return el ? (el.value || el.getAttribute('aria-valuenow') || el.textContent || '').trim() : ''; };
+const number = (root, selector) => { const parsed = parseInt(value(root, selector), 10); return isNaN(parsed) ? null : parsed; };
+const panels = (prefix) => Array.from(document.querySelectorAll('[aria-labelledby^="' + prefix + '-"][aria-labelledby$="-panel"]'))
+    .map((panel) => [parseInt(panel.getAttribute('aria-labelledby').slice(prefix.length + 1), 10), panel])
+    .filter(([index]) => !isNaN(index));
+
+const work = panels('Work-Experience').map(([index, panel]) => ({
+    index: index,
+    job_title: value(panel, 'input[name="jobTitle"]'),
+    company: value(panel, 'input[name="companyName"]'),
+    location: value(panel, 'input[name="location"]'),
+    role_description: value(panel, 'textarea[id*="roleDescription"]'),
+    start_month: number(panel, 'input[id*="startDate-dateSectionMonth"]'),
+    start_year: number(panel, 'input[id*="startDate-dateSectionYear"]'),
+    end_month: number(panel, 'input[id*="endDate-dateSectionMonth"]'),
+    end_year: number(panel, 'input[id*="endDate-dateSectionYear"]'),
+}));
+
+// Searchable school pickers show the chosen school as a pill (the field's own text also holds the label)
+const selectedItem = (root) => {
+    const item = root.querySelector('[data-automation-id="formField-school"] [data-automation-id="selectedItem"]');
+    if (!item) { return ''; }
+    const option = item.querySelector('[data-automation-id="promptOption"]') || item;
+    return (option.getAttribute('data-automation-label') || option.getAttribute('title') || option.textContent || '').trim();
+};
+const education = panels('Education').map(([index, panel]) => {
+    return {
+        index: index,
+        school: value(panel, 'input[name="schoolName"]') || selectedItem(panel),
+        degree: value(panel, 'button[name="degree"]'),
+        year: number(panel, 'input[id*="lastYearAttended-dateSectionYear"]'),
+    };
+});
+
+const resumeSection = document.querySelector('[aria-labelledby="Resume/CV-section"]');
+const resumes = resumeSection ? Array.from(resumeSection.querySelectorAll('[data-automation-id="file-upload-item"]')).map((item, index) => {
+    const nameEl = item.querySelector('[data-automation-id="file-upload-item-name"]');
+    const sizeMatch = item.textContent.match(/([0-9]+(?:[.,][0-9]+)?)\\s*(bytes|B|KB|MB)\\b/i);
+    return {
+        index: index,
+        name: (nameEl ? nameEl.textContent : item.textContent).trim(),
+        size_text: sizeMatch ? sizeMatch[0] : '',
+    };
+}) : [];
+
+return {work: work, education: education, resumes: resumes};
+"""
+
+# Clicks the Delete button of panel <prefix>-<index>
+DELETE_PANEL_JS = """
+const [prefix, index] = arguments;
+const header = Array.from(document.querySelectorAll('h4')).find((h) => h.id === prefix + '-' + index + '-panel' || h.id === prefix + '-' + index);
+const button = header ? Array.from(header.parentElement.querySelectorAll('button')).find((b) => b.textContent.indexOf('Delete') !== -1) : null;
+if (button) { button.click(); }
+return !!button;
+"""
+
+
+def read_page2_sections(driver):
+    """
+    Returns the work experiences, educations and resumes already present on the My Experience page
+    """
+    try:
+        return driver.execute_script(READ_PAGE2_SECTIONS_JS)
+    except Exception as exc:
+        logger.warning(f"Could not read existing page 2 entries - {repr(exc)}")
+        return {'work': [], 'education': [], 'resumes': []}
+
+
+def normalize_text(text):
+    """
+    Lower-cases text and collapses whitespace for comparisons
+    """
+    return ' '.join(str(text or '').lower().split())
+
+
+def work_experience_matches(existing, work_experience):
+    """
+    Checks if an entry on the page already holds this work experience
+    """
+    for key in ('job_title', 'company', 'location'):
+        if normalize_text(existing[key]) != normalize_text(work_experience[key]):
+            return False
+    if existing['role_description'] and normalize_text(existing['role_description']) != normalize_text(work_experience['role_description']):
+        return False
+    for key in ('start_month', 'start_year', 'end_month', 'end_year'):
+        if existing[key] != work_experience[key]:
+            return False
+    return True
+
+
+def education_matches(existing, education, known_schools):
+    """
+    Checks if an entry on the page already holds this education
+    """
+    school_names = [education['institution']] + education.get('aliases', [])
+    school_names += [known_schools[name] for name in school_names if known_schools.get(name)]
+    if normalize_text(existing['school']) not in [normalize_text(name) for name in school_names]:
+        return False
+    if existing['year'] != education['year']:
+        return False
+    return any(normalize_text(degree_type) in normalize_text(existing['degree']) for degree_type in education['type'])
+
+
+def count_panels(driver, prefix):
+    """
+    Number of entries (panels) in a section
+    """
+    return len(driver.find_elements(By.XPATH, f'//div[starts-with(@aria-labelledby, "{prefix}-") and contains(@aria-labelledby, "-panel")]'))
+
+
+def delete_panels(driver, prefix, indexes):
+    """
+    Deletes the given entries of a section, highest index first so the remaining indexes stay valid
+    """
+    for index in sorted(indexes, reverse=True):
+        panels_before = count_panels(driver, prefix)
+        if not driver.execute_script(DELETE_PANEL_JS, prefix, index):
+            logger.warning(f"Delete button not found for {prefix}-{index}")
+            continue
+        try:
+            WebDriverWait(driver, 10, poll_frequency=0.25).until(lambda d: count_panels(d, prefix) < panels_before)
+        except TimeoutException:
+            logger.warning(f"{prefix}-{index} still present after delete")
+        logger.info(f"Deleted {prefix} {index}")
+
+
+def add_panel(driver, prefix, section_label):
+    """
+    Adds an empty entry to a section and returns its xpath and element
+    """
+    panel_count = count_panels(driver, prefix)
+    button_text = "Add Another" if panel_count else "Add"
+    add_button = driver.find_element(By.XPATH, f'//div[@aria-labelledby="{section_label}"]//button[@data-automation-id="add-button" and contains(.//text(), "{button_text}")]')
+    driver.execute_script("arguments[0].click();", add_button)
+
+    panel_xpath = f'//div[@aria-labelledby="{section_label}"]//div[@aria-labelledby="{prefix}-{panel_count + 1}-panel"]'
+    panel_div = WebDriverWait(driver, 10, poll_frequency=0.25).until(EC.presence_of_element_located((By.XPATH, panel_xpath)))
+    return panel_xpath, panel_div
+
+
+def sync_work_experiences(driver, existing_entries, candidate=DEFAULT_CANDIDATE):
+    """
+    Brings the Work Experience section in line with the profile: entries that already match are kept,
+    stale ones are deleted and only missing ones are added
+    """
+    missing = list(candidate.profile['work_experiences'])
+    stale = []
+    for existing in existing_entries:
+        match = next((work_experience for work_experience in missing if work_experience_matches(existing, work_experience)), None)
+        if match:
+            missing.remove(match)
+        else:
+            stale.append(existing['index'])
+
+    logger.info(f"Work Experience - keeping {len(existing_entries) - len(stale)}, deleting {len(stale)}, adding {len(missing)}")
+    delete_panels(driver, 'Work-Experience', stale)
+
+    for work_experience in missing:
+        logger.info(f"Adding Work Experience {work_experience['job_title']} at {work_experience['company']}")
+        try:
+            work_experience_xpath, work_experience_div = add_panel(driver, 'Work-Experience', 'Work-Experience-section')
+        except Exception as exc:
+            logger.error(f"Could not add work experience - {repr(exc)}")
+            continue
+        work_experience.update({'div': work_experience_div, 'xpath': work_experience_xpath})
+        fill_work_experience(driver, work_experience)
+
+
+def sync_education(driver, existing_entries, candidate=DEFAULT_CANDIDATE):
+    """
+    Brings the Education section in line with the profile: entries that already match are kept,
+    stale ones are deleted and only missing ones are added
+    """
+    known_schools = TYPEAHEAD_CACHE.get(get_tenant(driver.current_url), 'schools', {})
+    missing = list(candidate.profile['education_details'])
+    stale = []
+    for existing in existing_entries:
+        match = next((education for education in missing if education_matches(existing, education, known_schools)), None)
+        if match:
+            missing.remove(match)
+        else:
+            stale.append(existing['index'])
+
+    logger.info(f"Education - keeping {len(existing_entries) - len(stale)}, deleting {len(stale)}, adding {len(missing)}")
+    delete_panels(driver, 'Education', stale)
+
+    for education in missing:
+        logger.info(f"Adding Education {education['institution']}")
+        try:
+            education_xpath, education_div = add_panel(driver, 'Education', 'Education-section')
+        except Exception as exc:
+            logger.error(f"Could not add education - {repr(exc)}")
+            continue
+        education.update({'div': education_div, 'xpath': education_xpath})
+        # A school that cannot be picked leaves an empty entry behind, removed with the other empty ones
+        fill_education(driver, education)
+
+
+def parse_file_size(size_text):
+    """
+    Converts a displayed file size ("245.3 KB") into bytes, None if it cannot be read
+    """
+    match = re.match(r'([0-9]+(?:[.,][0-9]+)?)\s*(bytes|B|KB|MB)', size_text or '', re.IGNORECASE)
+    if not match:
+        return None
+    multiplier = {'bytes': 1, 'b': 1, 'kb': 1024, 'mb': 1024 * 1024}[match.group(2).lower()]
+    return float(match.group(1).replace(',', '.')) * multiplier
+
+
+def sync_resume(driver, existing_resumes, candidate=DEFAULT_CANDIDATE):
+    """
+    Keeps an uploaded resume that matches the profile resume (file name and size), otherwise replaces it
+    """
+    resume_path = candidate.profile['resume_path']
+    resume_name = os.path.basename(resume_path)
+    resume_size = os.path.getsize(resume_path) if os.path.exists(resume_path) else None
+
+    keep_index = None
+    for resume in existing_resumes:
+        if resume_name not in resume['name']:
+            continue
+        shown_size = parse_file_size(resume['size_text'])
+        # Sizes are shown rounded, allow 2% (or 1 KB) of difference - an unknown size is uploaded again
+        if shown_size is not None and resume_size is not None and abs(shown_size - resume_size) <= max(1024, resume_size * 0.02):
+            keep_index = resume['index']
+            break
+
+    delete_xpath = '//div[@aria-labelledby="Resume/CV-section"]//button[@data-automation-id="delete-file"]'
+    for index in sorted(range(len(driver.find_elements(By.XPATH, delete_xpath))), reverse=True):
+        if index == keep_index:
+            continue
+        # Re-read the buttons every time, the list re-renders after each deletion
+        delete_buttons = driver.find_elements(By.XPATH, delete_xpath)
+        if index < len(delete_buttons):
+            driver.execute_script("arguments[0].click();", delete_buttons[index])
+            logger.info(f"Deleted resume {index + 1}")
+
+    if keep_index is not None:
+        logger.info(f"Resume {resume_name} already uploaded - keeping it")
+        return
+
+    file_input = driver.find_element(By.CSS_SELECTOR, "input[type='file']")
+    file_input.send_keys(os.path.abspath(resume_path))
+    try:
+        WebDriverWait(driver, 30, poll_frequency=0.5).until(lambda d: any(resume_name in resume['name'] for resume in read_page2_sections(d)['resumes']))
+        logger.info(f"Uploaded resume {resume_name}")
+    except TimeoutException:
+        logger.warning(f"Resume {resume_name} upload not confirmed after 30 seconds")
+
+
+def process_data_insertion_page2(driver, candidate=DEFAULT_CANDIDATE):
     """
     Processes Data Insertion
     """
     is_success = True
     try:
-        delete_experience_from_page2(driver)
-        for work_experience_index, work_experience in enumerate(PROFILE_DATA['work_experiences']):
-            logger.info(f"Work Experience {work_experience_index+1}")
-            if work_experience_index == 0:
-                try:
-                    add_button = driver.find_element(By.XPATH, '//div[@aria-labelledby="Work-Experience-section"]//button[@data-automation-id="add-button" and contains(.//text(), "Add")]')
-                    driver.execute_script("arguments[0].click();", add_button)
-                except:
-                    print("Exception: 'Add button not found'")
-            else:
-                add_another_button = driver.find_element(By.XPATH, '//div[@aria-labelledby="Work-Experience-section"]//button[@data-automation-id="add-button" and contains(.//text(), "Add Another")]')
-                driver.execute_script("arguments[0].click();", add_another_button)
-                time.sleep(2)
-
-            time.sleep(2)
-            work_experience_xpath = '//div[@aria-labelledby="Work-Experience-section"]//div[@aria-labelledby="Work-Experience-' + str(work_experience_index+1)+'-panel"]'
-            work_experience_div = driver.find_element(By.XPATH, work_experience_xpath)
-            work_experience.update({'div': work_experience_div, 'xpath': work_experience_xpath})
-            fill_work_experience(driver, work_experience)
-            time.sleep(2)
-        
+        sections = read_page2_sections(driver)
+        logger.info(f"Found {len(sections['work'])} work experiences, {len(sections['education'])} educations and {len(sections['resumes'])} resumes on the page")
+
+        sync_work_experiences(driver, sections['work'], candidate)
+
         # deleting empty work experience
         try:
             xpath_for_deletion = '//input[@name="jobTitle" and @value=""]/parent::div/parent::div/parent::div[@data-fkit-id]/parent::div[@data-fkit-id]/preceding-sibling::div[1]/h4[contains(@id, "Work-Experience")]/following-sibling::button[contains(text(), "Delete")]'
@@ -874,69 +1848,23 @@ def process_data_insertion_page2(driver):
             if delete_work_experiences:
                 # perform click using javascript
                 driver.execute_script("arguments[0].click();", driver.find_element(By.XPATH, xpath_for_deletion))
-                time.sleep(2)
+                sleep(2)
         except Exception as exc:
             logger.error(f"Exception: {exc}", exc_info=True)
 
-        resume_section = driver.find_element(By.XPATH, '//div[@aria-labelledby="Resume/CV-section"]')
-        resume_section.location_once_scrolled_into_view
-        time.sleep(2)
-
-        delete_resumes = driver.find_elements(By.XPATH, '//div[@aria-labelledby="Resume/CV-section"]//button[@data-automation-id="delete-file"]')
-        i = 1
-        while i <= len(delete_resumes):
-            driver.find_element(By.XPATH, '//div[@aria-labelledby="Resume/CV-section"]//button[@data-automation-id="delete-file"]').click()
-            i = i+1
-            time.sleep(1)
-
-        delete_education_from_page2(driver)
-        education_running_index = 0
-        for education_index, education in enumerate(PROFILE_DATA['education_details']):
-            logger.info(f"Education {education_index+1}")
-            if education_index == 0:
-                try:
-                    add_button = driver.find_element(By.XPATH, '//div[@aria-labelledby="Education-section"]//button[@data-automation-id="add-button" and contains(.//text(), "Add")]')
-                    driver.execute_script("arguments[0].click();", add_button)
-                except:
-                    print("Exception: 'Add button not found'")
-            else:
-                add_another_button = driver.find_element(By.XPATH, '//div[@aria-labelledby="Education-section"]//button[@data-automation-id="add-button" and contains(.//text(), "Add Another")]')
-                driver.execute_script("arguments[0].click();", add_another_button)
-                time.sleep(2)
-
-            time.sleep(2)
-            education_xpath = '//div[@aria-labelledby="Education-section"]//div[@aria-labelledby="Education-' + str(education_index+1)+'-panel"]'
-            education_div = driver.find_element(By.XPATH, education_xpath)
-            PROFILE_DATA['education_details'][education_running_index].update({'div': education_div, 'xpath': education_xpath})
-            if fill_education(driver, PROFILE_DATA['education_details'][education_running_index]):
-                education_running_index += 1
-            time.sleep(2)
-
-        file_input = driver.find_element(By.CSS_SELECTOR, "input[type='file']")
-        file_input.send_keys(PROFILE_DATA['resume_path'])
-        time.sleep(10)
+        sync_education(driver, sections['education'], candidate)
+
+        sync_resume(driver, sections['resumes'], candidate)
 
         try:
             linkedin_question = driver.find_element(By.CSS_SELECTOR, "input[type='text'][data-automation-id='linkedinQuestion']")
             linkedin_question.clear()
-            linkedin_question.send_keys(PROFILE_DATA['linkedin_url'])
+            linkedin_question.send_keys(candidate.profile['linkedin_url'])
         except:
-            print("Exception: 'No Linkedin input'")
+            logger.warning("Exception: 'No Linkedin input'")
 
         try:
-            skills_field = '//div[@data-automation-id="formField-skills"]//input'
-            skills_input = driver.find_elements(By.XPATH, skills_field)
-            if skills_input:
-                driver.execute_script("arguments[0].click();", skills_input[0])
-                for skill in PROFILE_DATA['skills']:
-                    skills_input[0].send_keys(skill)
-                    skills_input[0].send_keys(Keys.ENTER)
-                    wait_here(1, 2)
-                    leaf_node = driver.find_elements(By.XPATH, '//div[@data-automation-id="promptLeafNode"]')
-                    if leaf_node:
-                        direct_click = driver.find_element(By.XPATH, '//div[@data-automation-id="promptLeafNode"]')
-                        if direct_click:
-                            driver.execute_script("arguments[0].click();", direct_click)
+            fill_skills(driver, candidate)
         except Exception as exc:
             logger.error(f"Exception while adding skills: {exc}", exc_info=True)
 
@@ -968,10 +1896,10 @@ def process_data_insertion_page2(driver):
                 del_ind = 0
                 while True:
                     driver.execute_script("arguments[0].click();", driver.find_element(By.XPATH, xpath_for_deletion))
-                    print(f"----Deleted Education {del_ind+1}")
+                    logger.info(f"----Deleted Education {del_ind+1}")
                     wait_here(2, 4)
                     del_ind += 1
-                time.sleep(2)
+                sleep(2)
         except Exception as exc:
             logger.error(f"Exception: {exc}", exc_info=True)
 
@@ -1007,24 +1935,62 @@ def fill_work_experience(driver, work_experience):
 def add_value_to_search_field(driver, xpath_to_use, value_to_add):
     """
     Adds value to a search field - particularly in education
+
+    Returns:
+        dict: Outcome of the search as returned by select_prompt_option (status, text)
     """
+    result = {'status': 'timeout', 'options': []}
     try:
         search_field = driver.find_element(By.XPATH, xpath_to_use)
         driver.execute_script("arguments[0].click();", search_field)
         search_field.clear()
         search_field.send_keys(value_to_add)
         search_field.send_keys(Keys.ENTER)
-        wait_here(1, 2)
-        leaf_node = driver.find_elements(By.XPATH, '//div[@data-automation-id="promptLeafNode" and not(contains(./div/text(), "No Items."))]')
-        if leaf_node:
-            driver.execute_script("arguments[0].click();", leaf_node[0])
-            return True
-        search_field = driver.find_element(By.XPATH, xpath_to_use)
-        search_field.clear()
+        result = select_prompt_option(driver, [value_to_add])
+        if result['status'] != 'clicked':
+            search_field = driver.find_element(By.XPATH, xpath_to_use)
+            search_field.clear()
     except Exception as exc:
         logger.error(f"Exception while adding value to search field: {exc}", exc_info=True)
 
-    return False
+    return result
+
+
+def fill_school_search(driver, xpath_to_use, education):
+    """
+    Picks the institution in a searchable school field.
+    Tries the pick remembered for this tenant first, then the institution name and its aliases in order,
+    never searching again for names the tenant is known not to have.
+    """
+    tenant = get_tenant(driver.current_url)
+    known_schools = TYPEAHEAD_CACHE.get(tenant, 'schools', {})
+    institution = education['institution']
+
+    candidates = []
+    if known_schools.get(institution):
+        candidates.append(known_schools[institution])
+    for name in [institution] + education.get('aliases', []):
+        if name not in candidates and not (name in known_schools and known_schools[name] is None):
+            candidates.append(name)
+
+    learned = {}
+    picked = None
+    for name in candidates:
+        result = add_value_to_search_field(driver, xpath_to_use, name)
+        # Only a result that matches the name counts - otherwise the next alias is tried
+        if result['status'] == 'clicked' and result.get('score', 0) > 0:
+            picked = result['text']
+            learned.update({name: picked, institution: picked})
+            break
+        if result['status'] == 'no_match':
+            learned[name] = None
+            logger.info(f"School {name} not found on {tenant}")
+
+    if learned:
+        TYPEAHEAD_CACHE.update(tenant, 'schools', learned)
+    if not picked:
+        logger.error(f"Could not pick any of {candidates} for {institution}")
+    return bool(picked)
 
 
 def fill_education(driver, education):
@@ -1036,7 +2002,7 @@ def fill_education(driver, education):
         safe_send_keys(education['div'], './/input[@name="schoolName"]', education['institution'])
     else:
         # f'{education["xpath"]}//div[@data-automation-id="formField-school"]//input'
-        if not add_value_to_search_field(driver, f'{education["xpath"]}//div[@data-automation-id="formField-school"]//input', education['institution']):
+        if not fill_school_search(driver, f'{education["xpath"]}//div[@data-automation-id="formField-school"]//input', education):
             return False
 
     # TODO: Handle university name -> https://generalmotors.wd5.myworkdayjobs.com/en-US/Careers_GM/job/Austin%2C-Texas%2C-United-States-of-America/Data-Scientist_JR-202500570/apply?source=LinkedIn
@@ -1056,19 +2022,19 @@ def change_value_of_date(driver, xpath_to_use, default_value, value_to_set):
         driver.execute_script("arguments[0].click();", driver.find_element(By.XPATH, f'{xpath_to_use}/preceding-sibling::div'))
         md_ = driver.find_element(By.XPATH, f'{xpath_to_use}')
         # md_.send_keys(Keys.DELETE)
-        time.sleep(0.2)
+        sleep(0.2)
         if default_value != 0:
             md_.send_keys(Keys.UP)
-            time.sleep(0.1)
+            sleep(0.1)
 
         if value_to_set > default_value:
             for i in range(default_value, (value_to_set-default_value)):
                 md_.send_keys(Keys.UP)
-                time.sleep(0.1)
+                sleep(0.1)
         else:
             for i in range(default_value, value_to_set, -1):
                 md_.send_keys(Keys.DOWN)
-                time.sleep(0.1)
+                sleep(0.1)
     except Exception as exc:
         logger.error(f"Unable to change value of date ----- Exception: {exc}")
 
@@ -1079,39 +2045,103 @@ def press_next_button(driver):
     """
     is_success = True
     try:
-        print("Moving to next page....")
+        logger.info("Moving to next page....")
+        previous_fingerprint = get_page_fingerprint(driver)
+        reset_page_model(driver)
         try:
-            wait_here(1, 2)  # Small wait before getting element
             button = driver.find_element(By.XPATH, '//button[@data-automation-id="pageFooterNextButton"]')
             driver.execute_script("arguments[0].click();", button)
         except:
             logger.error(" ----- Unable to click next button -----")
             return is_success
 
-        wait_here(2, 4)
-
-        try:
-            error_button = driver.find_elements(By.XPATH, "//h3[contains(./button/div/text(), 'Errors Found')]")
-            if error_button:
-                logger.error(" ----- Unable to fill all fields -----")
-                is_success = False
-
-                if TESTING:
-                    input("----------- Error Encountered - Press any key to continue........")
-        except Exception as exc:
-            logger.info(f"No Errors Found - {repr(exc)}")
-
-        wait_here(10, 15)
+        # Wait for the wizard to move on (or report errors) instead of sleeping a fixed time
+        fingerprint = wait_for_page_change(driver, previous_fingerprint)
+        if fingerprint['errors']:
+            logger.error(f" ----- Unable to fill all fields ----- {fingerprint['errors']}")
+            is_success = False
+            debug_pause("----------- Error Encountered - Press any key to continue........")
     except Exception as exc:
         logger.error(f"Exception in pressing next button: {exc}", exc_info=True)
         is_success = False
-        if TESTING:
-            input("----------- Error Encountered - Press any key to continue........")
+        debug_pause("----------- Error Encountered - Press any key to continue........")
 
     return is_success
 
 
-def process_the_elements(driver, page=None):
+# Fields of the "My Information" page, name -> xpath of the field (presence is learned per tenant)
+PAGE1_FIELDS = {
+    'source': '//div[@data-automation-id="formField-source"]',
+    'country': "//button[@id='country--country']",
+    'previousWorker': '//div[@data-automation-id="formField-candidateIsPreviousWorker"]',
+    'firstName': '//div[@data-automation-id="formField-legalName--firstName"]//input',
+    'lastName': '//div[@data-automation-id="formField-legalName--lastName"]//input',
+    'phoneType': '//div[@data-automation-id="formField-phoneType"]//button',
+    'countryPhoneCode': '//input[@id="phoneNumber--countryPhoneCode"]',
+    'phoneNumber': '//input[@id="phoneNumber--phoneNumber"]',
+    'emailAddress': '//div[@data-automation-id="formField-emailAddress"]//input',
+}
+# Address fields of the "My Information" page - which of them exist depends on the selected country,
+# so they are probed after the country is set and learned per country
+PAGE1_ADDRESS_FIELDS = {
+    'addressLine1': '//input[@id="address--addressLine1"]',
+    'city': '//div[@data-automation-id="formField-city"]//input',
+    'countryRegion': "//div[@data-automation-id='formField-countryRegion']//button",
+    'postalCode': '//input[@id="address--postalCode"]',
+}
+
+PROBE_FIELDS_JS = """
+const present = {};
+for (const [name, xpath] of Object.entries(arguments[0])) {
+    present[name] = !!document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+return present;
+"""
+
+
+def probe_fields(driver, fields):
+    """
+    Checks which of the fields (name -> xpath) exist on the page in a single script call
+    """
+    try:
+        return driver.execute_script(PROBE_FIELDS_JS, fields)
+    except Exception as exc:
+        logger.warning(f"Could not probe fields - assuming all are present - {repr(exc)}")
+        return {name: True for name in fields}
+
+
+def get_page_schema(driver, page_key, fields, country=None):
+    """
+    Returns the names of the fields present on this page for the current tenant.
+    The schema is learned on the first visit and reused while the page fingerprint (and the selected
+    country, for fields that depend on it) stays the same.
+    """
+    tenant = get_tenant(driver.current_url)
+    signature = get_page_fingerprint(driver)['signature']
+    schema = FORM_SCHEMA.get(tenant, page_key)
+    if schema and schema.get('signature') == signature and schema.get('country') == country and set(schema.get('probed', [])) >= set(fields):
+        logger.info(f"Using known {page_key} schema for {tenant} - {len(schema['fields'])} fields")
+        return set(schema['fields']) & set(fields)
+
+    model = current_page_model(driver)
+    if model:
+        present = {name: model.has_field(name) for name in fields}
+    if not model or not any(present.values()):
+        present = probe_fields(driver, fields)
+    known_fields = [name for name, is_present in present.items() if is_present]
+    FORM_SCHEMA.update(tenant, page_key, {
+        'signature': signature,
+        'fields': known_fields,
+        'probed': list(fields),
+        'country': country,
+        'learned_at': get_clock().now().strftime('%Y-%m-%d %H:%M:%S'),
+    })
+    missing = [name for name, is_present in present.items() if not is_present]
+    logger.info(f"Learned {page_key} schema for {tenant} - skipping absent fields: {missing}")
+    return set(known_fields)
+
+
+def process_the_elements(driver, page=None, candidate=DEFAULT_CANDIDATE):
     """
     Process the elements on the page
     """
@@ -1124,85 +2154,103 @@ def process_the_elements(driver, page=None):
 
         wait_here(3, 5)
 
-        try:
-            if driver.find_elements(By.XPATH, '//div[@data-automation-id="formField-source"]//button'):
-                if open_and_click_dropdown(driver, xpath_to_search='//div[@data-automation-id="formField-source"]//button', value_to_click='LinkedIn', text_to_print='Where did you hear -- not found'):
-                    wait_here(3, 5)
+        fields = get_page_schema(driver, 'my_information', PAGE1_FIELDS)
 
-            driver.find_element(By.XPATH, '//div[@data-automation-id="formField-source"]//input').click()
-            wait_here(2, 4)
-            if driver.find_elements(By.XPATH, '//div[@data-automation-id="promptLeafNode"]'):
-                while True:
-                    direct_click = driver.find_element(By.XPATH, '//div[@data-automation-id="promptLeafNode"]')
-                    if direct_click:
-                        driver.execute_script("arguments[0].click();", direct_click)
-                        wait_here(2, 4)
-                    else:
-                        break
+        if 'source' in fields:
+            try:
+                if driver.find_elements(By.XPATH, '//div[@data-automation-id="formField-source"]//button'):
+                    if open_and_click_dropdown(driver, xpath_to_search='//div[@data-automation-id="formField-source"]//button', value_to_click='LinkedIn', text_to_print='Where did you hear -- not found'):
+                        wait_here(3, 5)
 
-            safe_send_keys(driver, '//div[@data-automation-id="formField-source"]//input', 'LinkedIn')
-            wait_here(1, 1)
-            driver.find_element(By.XPATH, '//div[@data-automation-id="formField-source"]//input').send_keys(Keys.ENTER)
-            wait_here(2, 4)
+                driver.find_element(By.XPATH, '//div[@data-automation-id="formField-source"]//input').click()
+                wait_here(2, 4)
+                if driver.find_elements(By.XPATH, '//div[@data-automation-id="promptLeafNode"]'):
+                    while True:
+                        direct_click = driver.find_element(By.XPATH, '//div[@data-automation-id="promptLeafNode"]')
+                        if direct_click:
+                            driver.execute_script("arguments[0].click();", direct_click)
+                            wait_here(2, 4)
+                        else:
+                            break
 
-        except Exception as exc:
-            logger.error(f"Where did you hear? - Not found - {repr(exc)}", exc_info=True)
+                safe_send_keys(driver, '//div[@data-automation-id="formField-source"]//input', 'LinkedIn')
+                wait_here(1, 1)
+                driver.find_element(By.XPATH, '//div[@data-automation-id="formField-source"]//input').send_keys(Keys.ENTER)
+                wait_here(2, 4)
 
-        if open_and_click_dropdown(driver, xpath_to_search="//button[@id='country--country']", value_to_click=PROFILE_DATA["country"], text_to_print="Country not found"):
-            wait_here(3, 5)
+            except Exception as exc:
+                logger.error(f"Where did you hear? - Not found - {repr(exc)}", exc_info=True)
 
-        try:
-            elem_to_click = driver.find_element(By.XPATH, '//div[@data-automation-id="formField-candidateIsPreviousWorker"]//input[@value="false"]')
-            elem_to_click.click()
-        except Exception as exc:
-            print("Exception: 'No previousWorker--candidateIsPreviousWorker' found - ", repr(exc))
+        if 'country' in fields:
+            if open_and_click_dropdown(driver, xpath_to_search="//button[@id='country--country']", value_to_click=candidate.profile["country"], text_to_print="Country not found"):
+                wait_here(3, 5)
 
-        try:
-            safe_send_keys(driver, '//div[@data-automation-id="formField-legalName--firstName"]//input', PROFILE_DATA["first_name"])
-        except Exception as exc:
-            print("Exception: 'name--legalName--firstName' not found - ", repr(exc))
+        # Only now the address fields of the selected country are on the page
+        fields |= get_page_schema(driver, 'my_information_address', PAGE1_ADDRESS_FIELDS, country=candidate.profile["country"])
 
-        try:
-            safe_send_keys(driver, '//div[@data-automation-id="formField-legalName--lastName"]//input', PROFILE_DATA["last_name"])
-        except Exception as exc:
-            print("Exception: 'LastName' not found - ", repr(exc))
-        
-        try:
-            safe_send_keys(driver, '//input[@id="address--addressLine1"]', PROFILE_DATA["address_line_1"])
-        except Exception as exc:
-            print("Exception: 'address--addressLine1' not found - ", repr(exc))
+        if 'previousWorker' in fields:
+            try:
+                elem_to_click = driver.find_element(By.XPATH, '//div[@data-automation-id="formField-candidateIsPreviousWorker"]//input[@value="false"]')
+                elem_to_click.click()
+            except Exception as exc:
+                logger.warning(f"Exception: 'No previousWorker--candidateIsPreviousWorker' found - {repr(exc)}")
 
-        try:
-            safe_send_keys(driver, '//div[@data-automation-id="formField-city"]//input', PROFILE_DATA["address_city"])
-        except Exception as exc:
-            print("Exception: 'address--city' not found - ", repr(exc))
+        if 'firstName' in fields:
+            try:
+                safe_send_keys(driver, '//div[@data-automation-id="formField-legalName--firstName"]//input', candidate.profile["first_name"])
+            except Exception as exc:
+                logger.warning(f"Exception: 'name--legalName--firstName' not found - {repr(exc)}")
 
-        if open_and_click_dropdown(driver, xpath_to_search="//div[@data-automation-id='formField-countryRegion']//button", value_to_click=PROFILE_DATA["address_state"], text_to_print="State not found"):
-            wait_here(3, 5)
+        if 'lastName' in fields:
+            try:
+                safe_send_keys(driver, '//div[@data-automation-id="formField-legalName--lastName"]//input', candidate.profile["last_name"])
+            except Exception as exc:
+                logger.warning(f"Exception: 'LastName' not found - {repr(exc)}")
 
-        try:
-            safe_send_keys(driver, '//input[@id="address--postalCode"]', PROFILE_DATA["address_postal_code"])
-        except Exception as exc:
-            print("Exception: 'address--postalCode' not found - ", repr(exc))
+        if 'addressLine1' in fields:
+            try:
+                safe_send_keys(driver, '//input[@id="address--addressLine1"]', candidate.profile["address_line_1"])
+            except Exception as exc:
+                logger.warning(f"Exception: 'address--addressLine1' not found - {repr(exc)}")
 
-        if open_and_click_dropdown(driver, xpath_to_search='//div[@data-automation-id="formField-phoneType"]//button', value_to_click='Mobile', text_to_print="Mobile Type not found"):
-            wait_here(3, 5)
+        if 'city' in fields:
+            try:
+                safe_send_keys(driver, '//div[@data-automation-id="formField-city"]//input', candidate.profile["address_city"])
+            except Exception as exc:
+                logger.warning(f"Exception: 'address--city' not found - {repr(exc)}")
 
-        try:
-            safe_send_keys(driver, '//input[@id="phoneNumber--countryPhoneCode"]', PROFILE_DATA["phone_country_code"])
-            driver.find_element(By.XPATH, '//input[@id="phoneNumber--countryPhoneCode"]').send_keys(Keys.ENTER)
-        except Exception as exc:
-            print("Exception: 'phoneNumber--countryPhoneCode' not found - ", repr(exc))
+        if 'countryRegion' in fields:
+            if open_and_click_dropdown(driver, xpath_to_search="//div[@data-automation-id='formField-countryRegion']//button", value_to_click=candidate.profile["address_state"], text_to_print="State not found"):
+                wait_here(3, 5)
 
-        try:
-            safe_send_keys(driver, '//input[@id="phoneNumber--phoneNumber"]', PROFILE_DATA["phone_number"])
-        except Exception as exc:
-            print("Exception: 'phoneNumber--phoneNumber' not found - ", repr(exc))
+        if 'postalCode' in fields:
+            try:
+                safe_send_keys(driver, '//input[@id="address--postalCode"]', candidate.profile["address_postal_code"])
+            except Exception as exc:
+                logger.warning(f"Exception: 'address--postalCode' not found - {repr(exc)}")
 
-        try:
-            safe_send_keys(driver, '//div[@data-automation-id="formField-emailAddress"]//input', PROFILE_DATA["email"])
-        except Exception as exc:
-            print("Exception: 'emailAddress--emailAddress' not found - ", repr(exc))
+        if 'phoneType' in fields:
+            if open_and_click_dropdown(driver, xpath_to_search='//div[@data-automation-id="formField-phoneType"]//button', value_to_click='Mobile', text_to_print="Mobile Type not found"):
+                wait_here(3, 5)
+
+        if 'countryPhoneCode' in fields:
+            try:
+                safe_send_keys(driver, '//input[@id="phoneNumber--countryPhoneCode"]', candidate.profile["phone_country_code"])
+                driver.find_element(By.XPATH, '//input[@id="phoneNumber--countryPhoneCode"]').send_keys(Keys.ENTER)
+            except Exception as exc:
+                logger.warning(f"Exception: 'phoneNumber--countryPhoneCode' not found - {repr(exc)}")
+
+        if 'phoneNumber' in fields:
+            try:
+                safe_send_keys(driver, '//input[@id="phoneNumber--phoneNumber"]', candidate.profile["phone_number"])
+            except Exception as exc:
+                logger.warning(f"Exception: 'phoneNumber--phoneNumber' not found - {repr(exc)}")
+
+        if 'emailAddress' in fields:
+            try:
+                safe_send_keys(driver, '//div[@data-automation-id="formField-emailAddress"]//input', candidate.profile["email"])
+            except Exception as exc:
+                logger.warning(f"Exception: 'emailAddress--emailAddress' not found - {repr(exc)}")
 
         wait_here(3, 5)
 
@@ -1211,124 +2259,106 @@ def process_the_elements(driver, page=None):
     return False
 
 
-def read_jobs_from_excel_with_status(file_path='jobs.xlsx'):
+# Columns checked (in order) for the job URLs when JOB_URL_COLUMN is not set
+POSSIBLE_URL_COLUMNS = ['url', 'URL', 'job_url', 'Job URL', 'link', 'Link', 'job_link', 'Job Link']
+# Explicit name of the URL column in the jobs file, skips the guessing above
+JOB_URL_COLUMN = os.getenv('JOB_URL_COLUMN') or None
+# CSV files are read (and validated) this many rows at a time
+JOB_FILE_CHUNK_ROWS = int(os.getenv('JOB_FILE_CHUNK_ROWS', '50000'))
+# A valid job URL contains http or www - also rejects empty cells, which pandas turns into NaN ('nan')
+JOB_URL_PATTERN = re.compile(r'http|www', re.IGNORECASE)
+STATUS_COLUMNS = {'application_status': 'pending', 'error_message': '', 'applied_date': '', 'failure_artifact': '', 'claimed_by': '', 'lease_expires': ''}
+# Several processes share the jobs file and claim jobs with leases (see ledger.py)
+SHARED_LEDGER = bool(os.getenv('SHARED_LEDGER', 'False')=='True')
+LEDGER_LEASE_SECONDS = int(os.getenv('LEDGER_LEASE_SECONDS', '300'))
+# Tenant partition of this process, e.g. 0/3 (empty = all tenants)
+LEDGER_PARTITION = os.getenv('LEDGER_PARTITION', '')
+
+
+def find_url_column(columns, url_column=None):
     """
-    Read job URLs from Excel file and return DataFrame with status tracking
-    
-    Args:
-        file_path (str): Path to the Excel file containing job URLs
-        
-    Returns:
-        pandas.DataFrame: DataFrame with job URLs and status columns
+    Returns the URL column - the explicit one if given, else the first known name, else the first column
     """
-    try:
-        # Read the Excel file
-        df = pd.read_excel(file_path)
+    if url_column:
+        if url_column not in columns:
+            raise ValueError(f"URL column '{url_column}' not found in jobs file columns {list(columns)}")
+        return url_column
+    for col in POSSIBLE_URL_COLUMNS:
+        if col in columns:
+            return col
+    # If no standard column name found, use the first column
+    logger.warning(f"No standard URL column found. Using first column: {columns[0]}")
+    return columns[0]
 
-        # Log the column names to understand the structure
-        logger.info(f"Excel file columns: {df.columns.tolist()}")
 
-        # Try to find URL column (common names)
-        url_column = None
-        possible_url_columns = ['url', 'URL', 'job_url', 'Job URL', 'link', 'Link', 'job_link', 'Job Link']
+def prepare_job_rows(df, url_column, validate=True):
+    """
+    Adds the status columns and keeps only rows with a valid URL, in one vectorized pass over the URL column
+    """
+    for column, default in STATUS_COLUMNS.items():
+        if column not in df.columns:
+            df[column] = default
+        elif df[column].dtype != object:
+            # An all-empty column is read as float, which cannot take the text written by update_job_status
+            df[column] = df[column].astype(object)
+    # Fill missing/empty application_status values with 'pending'
+    status = df['application_status']
+    df['application_status'] = status.where(status.notna() & (status.astype(str).str.strip() != ''), 'pending')
 
-        for col in possible_url_columns:
-            if col in df.columns:
-                url_column = col
-                break
+    if validate:
+        df = df[df[url_column].astype(str).str.contains(JOB_URL_PATTERN, na=False)]
+    return df
 
-        if url_column is None:
-            # If no standard column name found, use the first column
-            url_column = df.columns[0]
-            logger.warning(f"No standard URL column found. Using first column: {url_column}")
 
-        # Add status columns if they don't exist
-        if 'application_status' not in df.columns:
-            df['application_status'] = 'pending'
-        if 'error_message' not in df.columns:
-            df['error_message'] = ''
-        if 'applied_date' not in df.columns:
-            df['applied_date'] = ''
+def iter_job_chunks(file_path, url_column=JOB_URL_COLUMN, validate=True):
+    """
+    Reads the jobs file in chunks of JOB_FILE_CHUNK_ROWS rows (Excel files in one piece)
 
-        # Filter out rows with invalid URLs
-        df = df[df[url_column].notna()]
-        df = df[df[url_column].astype(str).str.strip() != '']
-        df = df[df[url_column].astype(str).str.lower() != 'nan']
-        df = df[df[url_column].astype(str).str.contains('http|www', case=False, na=False)]
+    Yields:
+        tuple: (DataFrame chunk with status columns, url_column)
+    """
+    import pandas as pd
 
-        logger.info(f"Found {len(df)} valid job entries in Excel file")
-        return df, url_column
+    if file_path.endswith('.csv'):
+        chunks = pd.read_csv(file_path, chunksize=JOB_FILE_CHUNK_ROWS)
+    else:
+        chunks = [pd.read_excel(file_path)]
 
-    except FileNotFoundError:
-        logger.error(f"Excel file not found: {file_path}")
-        return pd.DataFrame(), None
-    except Exception as exc:
-        logger.error(f"Error reading Excel file: {exc}", exc_info=True)
-        return pd.DataFrame(), None
+    for chunk in chunks:
+        url_column = find_url_column(chunk.columns, url_column)
+        yield prepare_job_rows(chunk, url_column, validate), url_column
 
 
-def read_jobs_from_csv_with_status(file_path='jobs.csv'):
+def read_jobs_with_status(file_path='jobs.csv', url_column=JOB_URL_COLUMN, validate=True):
     """
-    Read job URLs from CSV file and return DataFrame with status tracking
+    Read job URLs from a CSV or Excel file and return DataFrame with status tracking
     
     Args:
-        file_path (str): Path to the CSV file containing job URLs
+        file_path (str): Path to the CSV or Excel file containing job URLs
+        url_column (str): Name of the URL column, guessed from POSSIBLE_URL_COLUMNS if not given
+        validate (bool): Drop rows without a valid URL
         
     Returns:
-        pandas.DataFrame: DataFrame with job URLs and status columns
+        tuple: (pandas.DataFrame with job URLs and status columns, url_column) - empty DataFrame and None on errors
     """
-    try:
-        # Read the CSV file
-        df = pd.read_csv(file_path)
-
-        # Log the column names to understand the structure
-        logger.info(f"CSV file columns: {df.columns.tolist()}")
-
-        # Try to find URL column (common names)
-        url_column = None
-        possible_url_columns = ['url', 'URL', 'job_url', 'Job URL', 'link', 'Link', 'job_link', 'Job Link']
-
-        for col in possible_url_columns:
-            if col in df.columns:
-                url_column = col
-                break
-
-        if url_column is None:
-            # If no standard column name found, use the first column
-            url_column = df.columns[0]
-            logger.warning(f"No standard URL column found. Using first column: {url_column}")
-
-        # Add status columns if they don't exist
-        if 'application_status' not in df.columns:
-            df['application_status'] = 'pending'
-        else:
-            # Fill missing/empty application_status values with 'pending'
-            df['application_status'] = df['application_status'].fillna('pending')
-            df.loc[df['application_status'].astype(str).str.strip() == '', 'application_status'] = 'pending'
-            
-        if 'error_message' not in df.columns:
-            df['error_message'] = ''
-        if 'applied_date' not in df.columns:
-            df['applied_date'] = ''
-
-        # Filter out rows with invalid URLs
-        df = df[df[url_column].notna()]
-        df = df[df[url_column].astype(str).str.strip() != '']
-        df = df[df[url_column].astype(str).str.lower() != 'nan']
-        df = df[df[url_column].astype(str).str.contains('http|www', case=False, na=False)]
+    import pandas as pd
 
-        logger.info(f"Found {len(df)} valid job entries in CSV file")
-        return df, url_column
+    try:
+        chunks = list(iter_job_chunks(file_path, url_column, validate))
+        if not chunks:
+            return pd.DataFrame(), None
+        df = pd.concat([chunk for chunk, _ in chunks]) if len(chunks) > 1 else chunks[0][0]
+        return df, chunks[0][1]
 
     except FileNotFoundError:
-        logger.error(f"CSV file not found: {file_path}")
+        logger.error(f"Jobs file not found: {file_path}")
         return pd.DataFrame(), None
     except Exception as exc:
-        logger.error(f"Error reading CSV file: {exc}", exc_info=True)
+        logger.error(f"Error reading jobs file: {exc}", exc_info=True)
         return pd.DataFrame(), None
 
 
-def update_job_status(file_path, job_url, status, error_message=''):
+def update_job_status(file_path, job_url, status, error_message='', artifact=''):
     """
     Update the status of a job application in the Excel or CSV file
     
@@ -1337,37 +2367,33 @@ def update_job_status(file_path, job_url, status, error_message=''):
         job_url (str): The job URL to update
         status (str): Status - 'applied', 'failed', or 'error'
         error_message (str): Error message if status is 'error' or 'failed'
+        artifact (str): Path of the failure artifact (screenshot, DOM, console) if one was captured
     """
     try:
-        # Determine file type and read accordingly
-        if file_path.endswith('.csv'):
-            df, url_column = read_jobs_from_csv_with_status(file_path)
-            file_type = 'csv'
-        else:
-            df, url_column = read_jobs_from_excel_with_status(file_path)
-            file_type = 'excel'
-            
-        if df.empty or url_column is None:
-            logger.error(f"Could not read {file_type.upper()} file for status update")
-            return False
+        # Other processes may update the same file (shared ledger)
+        with jobs_file_lock(file_path):
+            # Rows are written back as they are, so there is nothing to validate
+            df, url_column = read_jobs_with_status(file_path, validate=False)
+            if df.empty or url_column is None:
+                logger.error(f"Could not read jobs file {file_path} for status update")
+                return False
 
-        # Find the row with matching URL
-        mask = df[url_column] == job_url
-        if not mask.any():
-            logger.warning(f"Job URL not found in {file_type.upper()} file: {job_url}")
-            return False
+            # Find the row with matching URL
+            mask = df[url_column] == job_url
+            if not mask.any():
+                logger.warning(f"Job URL not found in jobs file: {job_url}")
+                return False
 
-        # Update the status
-        df.loc[mask, 'application_status'] = status
-        df.loc[mask, 'error_message'] = error_message
-        df.loc[mask, 'applied_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            # Update the status (a finished job is no longer claimed)
+            df.loc[mask, 'application_status'] = status
+            df.loc[mask, 'error_message'] = error_message
+            df.loc[mask, 'failure_artifact'] = artifact
+            df.loc[mask, 'applied_date'] = get_clock().now().strftime('%Y-%m-%d %H:%M:%S')
+            df.loc[mask, ['claimed_by', 'lease_expires']] = ''
+
+            # Save back to file
+            write_jobs_file(df, file_path)
 
-        # Save back to file
-        if file_type == 'csv':
-            df.to_csv(file_path, index=False)
-        else:
-            df.to_excel(file_path, index=False)
-            
         logger.info(f"Updated job status: {job_url} -> {status}")
         return True
 
@@ -1376,84 +2402,97 @@ def update_job_status(file_path, job_url, status, error_message=''):
         return False
 
 
-def read_jobs_from_excel(file_path='jobs.xlsx'):
+def read_pending_jobs(file_path='jobs.csv', url_column=JOB_URL_COLUMN):
     """
-    Read job URLs from Excel file, excluding already applied jobs
+    Read job URLs from a CSV or Excel file, excluding already applied jobs. CSV files are streamed in chunks,
+    only the pending URLs are kept in memory.
     
     Args:
-        file_path (str): Path to the Excel file containing job URLs
+        file_path (str): Path to the CSV or Excel file containing job URLs
+        url_column (str): Name of the URL column, guessed if not given
         
     Returns:
         list: List of job URLs that haven't been applied to yet
     """
+    valid_urls = []
+    total_jobs = 0
     try:
-        df, url_column = read_jobs_from_excel_with_status(file_path)
-        if df.empty or url_column is None:
-            return []
+        for chunk, chunk_url_column in iter_job_chunks(file_path, url_column):
+            total_jobs += len(chunk)
+            # Filter out jobs that have already been applied to successfully
+            valid_urls.extend(chunk.loc[chunk['application_status'] == 'pending', chunk_url_column].tolist())
 
-        # Filter out jobs that have already been applied to successfully
-        pending_jobs = df[df['application_status'] == 'pending']
-        
-        # Extract URLs
-        valid_urls = pending_jobs[url_column].tolist()
-        
-        logger.info(f"Found {len(valid_urls)} pending job applications (out of {len(df)} total jobs)")
+        logger.info(f"Found {len(valid_urls)} pending job applications (out of {total_jobs} total jobs)")
         return valid_urls
 
+    except FileNotFoundError:
+        logger.error(f"Jobs file not found: {file_path}")
+        return []
     except Exception as exc:
-        logger.error(f"Error reading Excel file: {exc}", exc_info=True)
+        logger.error(f"Error reading jobs file: {exc}", exc_info=True)
         return []
 
 
-def read_jobs_from_csv(file_path='jobs.csv'):
+def open_ledger(file_path, partition=LEDGER_PARTITION):
     """
-    Read job URLs from CSV file, excluding already applied jobs
-    
-    Args:
-        file_path (str): Path to the CSV file containing job URLs
-        
+    Starts a shared ledger on the jobs file
+
     Returns:
-        list: List of job URLs that haven't been applied to yet
+        JobLedger: The started ledger, None if the jobs file cannot be read
     """
     try:
-        df, url_column = read_jobs_from_csv_with_status(file_path)
-        if df.empty or url_column is None:
-            return []
-
-        # Filter out jobs that have already been applied to successfully
-        pending_jobs = df[df['application_status'] == 'pending']
-        
-        # Extract URLs
-        valid_urls = pending_jobs[url_column].tolist()
-        
-        logger.info(f"Found {len(valid_urls)} pending job applications (out of {len(df)} total jobs)")
-        return valid_urls
-
+        _, url_column = next(iter_job_chunks(file_path))
+    except FileNotFoundError:
+        logger.error(f"Jobs file not found: {file_path}")
+        return None
+    except StopIteration:
+        logger.error(f"Jobs file is empty: {file_path}")
+        return None
     except Exception as exc:
-        logger.error(f"Error reading CSV file: {exc}", exc_info=True)
-        return []
+        logger.error(f"Error reading jobs file: {exc}", exc_info=True)
+        return None
+    ledger = JobLedger(file_path, url_column, lease_seconds=LEDGER_LEASE_SECONDS, partition=parse_partition(partition)).start()
+    logger.info(f"Shared ledger: working as {ledger.worker_id}{' on partition ' + partition if partition else ''}")
+    return ledger
 
 
-def process_all_jobs(file_path='jobs.csv'):
+def run_job_queue(file_path='jobs.csv', budget_minutes=RUN_BUDGET_MINUTES, shared=SHARED_LEDGER, partition=LEDGER_PARTITION, rank=RANK_JOBS, min_score=RANK_MIN_SCORE,
+                  candidate=DEFAULT_CANDIDATE, pool=None, prefetch_depth=PREFETCH_DEPTH):
     """
-    Process all jobs from the CSV or Excel file with status tracking
-    
+    Applies to the pending jobs of one jobs file as candidate, with status tracking
+
     Args:
         file_path (str): Path to the CSV or Excel file containing job URLs
-    """
-    logger.info("=== Starting Job Application Process ===")
+        budget_minutes (float): Time budget of the run, jobs that do not fit stay pending (0 = no limit)
+        shared (bool): Claim jobs with leases so several processes can work on the same file
+        partition (str): Only take the tenants of this partition in shared mode, e.g. '0/3'
+        rank (bool): Apply to the jobs that match the profile best first
+        min_score (float): With rank, leave jobs whose relevance is below this pending
+        candidate (Candidate): Who applies
+        pool (threading.Semaphore): Browser slots shared with the queues of other candidates, None for no limit
+        prefetch_depth (int): Number of upcoming jobs whose browser is prepared ahead (0 = off)
 
-    # Read job URLs from file (only pending ones)
-    if file_path.endswith('.csv'):
-        job_urls = read_jobs_from_csv(file_path)
-        file_type = 'CSV'
+    Returns:
+        dict: Counts of the run (processed, successful, failed, error, pending)
+    """
+    # Read job URLs from file (only pending ones - and in shared mode not claimed by another process)
+    ledger = None
+    if shared:
+        ledger = open_ledger(file_path, partition)
+        job_urls = ledger.claimable() if ledger else []
     else:
-        job_urls = read_jobs_from_excel(file_path)
-        file_type = 'Excel'
+        job_urls = read_pending_jobs(file_path)
 
     if not job_urls:
-        logger.error(f"No pending job URLs found in {file_type} file. Exiting.")
-        return
+        logger.error(f"No pending job URLs found in {file_path}. Exiting.")
+        if ledger:
+            ledger.stop()
+        return {'processed': 0, 'successful': 0, 'failed': 0, 'error': 0, 'pending': 0}
+
+    ranker = RelevanceRanker(candidate.profile.load(), JOB_TERM_INDEX, min_score=min_score) if rank else None
+    if ranker:
+        job_urls = ranker.rank(job_urls)
+        ranker.log_ranking(job_urls)
 
     logger.info(f"Processing {len(job_urls)} pending job applications")
 
@@ -1461,55 +2500,196 @@ def process_all_jobs(file_path='jobs.csv'):
     failed_applications = 0
     error_applications = 0
 
-    for i, job_url in enumerate(job_urls):
+    # Re-planned after every job with its actual duration, without the companies whose circuit breaker is open
+    planner = RunPlanner(RUN_HISTORY, budget_minutes * 60, JOB_PAUSE_SECONDS)
+    breaker = CircuitBreaker(BREAKER_THRESHOLD, BREAKER_COOLDOWN_MINUTES * 60)
+    pending_urls = list(job_urls)
+    plan = planner.plan(pending_urls)
+    planner.log_plan(plan, len(pending_urls))
+    job_urls = []
+    prefetcher = BrowserPrefetcher(prefetch_depth, PREFETCH_MIN_FREE_MB, candidate) if prefetch_depth > 0 else None
+
+    while plan or pending_urls:
+        if not plan:
+            # Everything left belongs to companies whose circuit breaker is open - wait for the first probe if it fits
+            wait_seconds = breaker.next_probe_in(pending_urls) if not breaker.allowed(pending_urls) else None
+            remaining = planner.remaining_seconds()
+            if wait_seconds is None or (remaining is not None and wait_seconds >= remaining):
+                break
+            logger.info(f"Only jobs of companies with an open circuit breaker are left - waiting {wait_seconds / 60:.0f} min for the next probe")
+            get_clock().sleep(wait_seconds)
+            if ledger:
+                pending_urls = ranker.rank(ledger.claimable()) if ranker else ledger.claimable()
+            runnable_urls = breaker.allowed(pending_urls)
+            plan = planner.plan(runnable_urls)
+            planner.log_plan(plan, len(runnable_urls))
+            if not plan:
+                break
+            continue
+
+        job_url = plan[0]['url']
         try:
-            logger.info(f"\n=== Processing Job {i+1}/{len(job_urls)} ===")
+            claimed = ledger.claim(job_url) if ledger else True
+        except TimeoutError as exc:
+            # The jobs file stayed locked - leave the job to whoever holds it and carry on with the others
+            logger.error(f"Could not claim {job_url} - {exc}")
+            claimed = False
+        if not claimed:
+            # Another process claimed it first
+            pending_urls = ranker.rank(ledger.claimable()) if ranker else ledger.claimable()
+            if job_url in pending_urls:
+                pending_urls.remove(job_url)
+            plan = planner.plan(breaker.allowed(pending_urls))
+            continue
+        pending_urls.remove(job_url)
+        if prefetcher:
+            # Prepares the browsers of the jobs after this one while it runs
+            prefetcher.schedule([job['url'] for job in plan[1:]], job_url)
+        job_urls.append(job_url)
+        i = len(job_urls) - 1
+        started = None
+        success = False
+        failure_message = ''
+        try:
+            logger.info(f"\n=== Processing Job {i+1}/{i+1+len(pending_urls)} ===")
             logger.info(f"Job URL: {job_url}")
 
-            # Apply to the job -> calling main function
-            success, error_message = apply_to_job(job_url)
+            # Apply to the job -> calling main function (once a browser slot is free)
+            with pool or nullcontext():
+                # Waiting for the browser slot is not part of the tenant's duration
+                started = get_clock().monotonic()
+                success, error_message = apply_to_job(job_url, prefetcher, candidate)
 
             if success:
                 successful_applications += 1
                 logger.info(f"✅ Successfully processed job {i+1}")
-                # Update file with success status
-                update_job_status(file_path, job_url, 'applied')
+                # Update file with success status (and the note of a submit without confirmation page)
+                update_job_status(file_path, job_url, 'applied', error_message)
             else:
+                failure_message = error_message or 'Application failed without specific error'
                 if error_message:
                     error_applications += 1
                     logger.error(f"❌ Error processing job {i+1}: {error_message}")
                     # Update file with error status
-                    update_job_status(file_path, job_url, 'error', error_message)
+                    update_job_status(file_path, job_url, 'error', error_message, ARTIFACTS.reference(get_job_id(job_url)))
                 else:
                     failed_applications += 1
                     logger.error(f"❌ Failed to process job {i+1}")
                     # Update file with failed status
-                    update_job_status(file_path, job_url, 'failed', 'Application failed without specific error')
-
-            # Add a delay between applications to avoid being detected
-            if i < len(job_urls) - 1:  # Don't wait after the last job
-                wait_here(5, 10)  # Wait 5-10 seconds between applications
-
-            if TESTING:
-                input("Press any button to go to next job...")
+                    update_job_status(file_path, job_url, 'failed', 'Application failed without specific error', ARTIFACTS.reference(get_job_id(job_url)))
 
         except Exception as exc:
             error_applications += 1
             error_msg = f"Exception processing job {i+1}: {str(exc)}"
+            failure_message = error_msg
             logger.error(error_msg, exc_info=True)
             # Update file with error status
-            update_job_status(file_path, job_url, 'error', error_msg)
-            # Continue with next job even if current one fails
-            continue
+            update_job_status(file_path, job_url, 'error', error_msg, ARTIFACTS.reference(get_job_id(job_url)))
+
+        if started is not None:
+            planner.record(job_url, get_clock().monotonic() - started, success)
+        breaker.record(job_url, success, failure_message)
+        if ledger:
+            try:
+                ledger.release(job_url)
+            except TimeoutError as exc:
+                # The claim expires with its lease
+                logger.error(f"Could not release {job_url} - {exc}")
+            # Picks up jobs freed by processes that died and drops the ones others took
+            pending_urls = ranker.rank(ledger.claimable()) if ranker else ledger.claimable()
+        runnable_urls = breaker.allowed(pending_urls)
+        plan = planner.plan(runnable_urls)
+        planner.log_plan(plan, len(runnable_urls))
+
+        # Add a delay between applications to avoid being detected
+        if plan:  # Don't wait after the last job
+            wait_here(5, 10)  # Wait 5-10 seconds between applications
+
+        debug_pause("Press any button to go to next job...")
 
     # Summary
-    logger.info("\n=== Job Application Summary ===")
+    logger.info(f"\n=== Job Application Summary{'' if candidate is DEFAULT_CANDIDATE else ' - ' + candidate.name} ===")
     logger.info(f"Total jobs processed: {len(job_urls)}")
     logger.info(f"Successful applications: {successful_applications}")
     logger.info(f"Failed applications: {failed_applications}")
     logger.info(f"Error applications: {error_applications}")
+    if pending_urls:
+        logger.info(f"Left pending (over budget or circuit breaker open): {len(pending_urls)}")
     if len(job_urls) > 0:
         logger.info(f"Success rate: {(successful_applications/len(job_urls)*100):.1f}%")
+    breaker.report()
+
+    if prefetcher:
+        prefetcher.shutdown()
+    if ledger:
+        ledger.stop()
+    return {'processed': len(job_urls), 'successful': successful_applications, 'failed': failed_applications,
+            'error': error_applications, 'pending': len(pending_urls)}
+
+
+def start_run():
+    """
+    Cleans up after earlier (crashed) runs and starts watching the browsers
+    """
+    logger.info("=== Starting Job Application Process ===")
+
+    # Browsers and temp profiles left behind by an earlier (crashed) run
+    SUPERVISOR.reap_orphans()
+    SUPERVISOR.clean_temp_profiles()
+    SUPERVISOR.start()
+
+
+def finish_run():
+    """
+    Prints the resource usage and waits for the failure artifacts to be written
+    """
+    SUPERVISOR.report()
+    SUPERVISOR.stop()
+    ARTIFACTS.flush()
+
+
+def process_all_jobs(file_path='jobs.csv', budget_minutes=RUN_BUDGET_MINUTES, shared=SHARED_LEDGER, partition=LEDGER_PARTITION, rank=RANK_JOBS, min_score=RANK_MIN_SCORE):
+    """
+    Process all jobs from the CSV or Excel file with status tracking, as the default candidate (see run_job_queue)
+    """
+    start_run()
+    try:
+        run_job_queue(file_path, budget_minutes, shared, partition, rank, min_score, prefetch_depth=PREFETCH_DEPTH)
+    finally:
+        finish_run()
+
+
+def process_candidates(candidates, workers=CANDIDATE_WORKERS, budget_minutes=RUN_BUDGET_MINUTES, shared=SHARED_LEDGER, partition=LEDGER_PARTITION, rank=RANK_JOBS, min_score=RANK_MIN_SCORE):
+    """
+    Runs the job queues of several candidates at the same time. Every candidate's queue is worked through in
+    order by its own thread (one job per candidate at a time), while at most workers browsers run in total.
+    Browser prefetching is off, it would start browsers outside of the shared slots.
+
+    Args:
+        candidates (list): Candidate objects, each with its own jobs file, profile and credentials
+        workers (int): Browsers running at the same time
+    """
+    start_run()
+    pool = threading.BoundedSemaphore(max(1, workers))
+
+    def run(candidate):
+        threading.current_thread().name = f"candidate-{candidate.name}"
+        return run_job_queue(candidate.jobs_file, budget_minutes, shared, partition, rank, min_score, candidate=candidate, pool=pool, prefetch_depth=0)
+
+    try:
+        logger.info(f"Processing the jobs of {len(candidates)} candidates with {workers} browser(s) at a time")
+        with ThreadPoolExecutor(max_workers=len(candidates)) as executor:
+            futures = {candidate.name: executor.submit(run, candidate) for candidate in candidates}
+        logger.info("\n=== Candidates Summary ===")
+        for name, future in futures.items():
+            try:
+                counts = future.result()
+                logger.info(f"{name:<20} processed {counts['processed']}, successful {counts['successful']}, failed {counts['failed']}, "
+                            f"error {counts['error']}, pending {counts['pending']}")
+            except Exception as exc:
+                logger.error(f"{name:<20} stopped: {repr(exc)}", exc_info=exc)
+    finally:
+        finish_run()
 
 
 def inject_stealth_scripts(driver):
@@ -1568,27 +2748,24 @@ def inject_stealth_scripts(driver):
         logger.warning(f"Could not inject stealth scripts: {str(e)}")
 
 
-import random
-from selenium.webdriver.common.action_chains import ActionChains
-
 def human_like_click(driver, element):
     """
     Perform human-like click with random delays and movements
     """
     try:
         # Random delay before action
-        time.sleep(random.uniform(0.5, 1.5))
+        sleep(get_clock().random.uniform(0.5, 1.5))
         
         # Move to element with slight randomness
         actions = ActionChains(driver)
         actions.move_to_element_with_offset(element, 
-            random.randint(-5, 5), random.randint(-5, 5))
-        actions.pause(random.uniform(0.1, 0.3))
+            get_clock().random.randint(-5, 5), get_clock().random.randint(-5, 5))
+        actions.pause(get_clock().random.uniform(0.1, 0.3))
         actions.click()
         actions.perform()
         
         # Random delay after action
-        time.sleep(random.uniform(0.3, 0.8))
+        sleep(get_clock().random.uniform(0.3, 0.8))
         
     except Exception as e:
         # Fallback to regular click
@@ -1601,19 +2778,19 @@ def human_like_type(element, text):
     element.clear()
     for char in text:
         element.send_keys(char)
-        time.sleep(random.uniform(0.05, 0.15))
+        sleep(get_clock().random.uniform(0.05, 0.15))
     
     # Random pause after typing
-    time.sleep(random.uniform(0.5, 1.0))
+    sleep(get_clock().random.uniform(0.5, 1.0))
 
 def random_scroll(driver):
     """
     Perform random scrolling to mimic human behavior
     """
-    scroll_amount = random.randint(100, 500)
-    direction = random.choice([1, -1])
+    scroll_amount = get_clock().random.randint(100, 500)
+    direction = get_clock().random.choice([1, -1])
     driver.execute_script(f"window.scrollBy(0, {scroll_amount * direction});")
-    time.sleep(random.uniform(0.5, 1.5))
+    sleep(get_clock().random.uniform(0.5, 1.5))
 
 
 def hide_webdriver(driver):
@@ -1631,43 +2808,7 @@ def hide_webdriver(driver):
         logger.warning(f"Could not hide webdriver: {str(e)}")
 
 
-def is_disability_page(driver):
-    """
-    Checks if the current page is the disability page.
-    """
-    try:
-        disability_field = driver.find_elements(By.XPATH, '//input[@id="selfIdentifiedDisabilityData--name"]')
-        return bool(disability_field)
-    except Exception as e:
-        logger.warning(f"Could not check disability page: {str(e)}")
-        return False
-
-
-def is_voluntry_disclosures_page(driver):
-    """
-    Checks if the current page is the application questions page.
-    """
-    try:
-        application_questions_field = driver.find_elements(By.XPATH, '//h2[contains(text(), "Voluntary Disclosures")]')
-        return bool(application_questions_field)
-    except Exception as e:
-        logger.warning(f"Could not check application questions page: {str(e)}")
-        return False
-
-
-def is_application_questions_page(driver):
-    """
-    Checks if the current page is the application questions page.
-    """
-    try:
-        application_questions_field = driver.find_elements(By.XPATH, '//h2[contains(text(), "Application Questions")]')
-        return bool(application_questions_field)
-    except Exception as e:
-        logger.warning(f"Could not check application questions page: {str(e)}")
-        return False
-
-
-def check_and_fill_application_questions(driver):
+def check_and_fill_application_questions(driver, candidate=DEFAULT_CANDIDATE):
     """
     Checks and fills the application questions
     """
@@ -1719,9 +2860,9 @@ def check_and_fill_application_questions(driver):
 
         # get date of first of next month
         # use datetime in below
-        next_month = datetime.now().month + 1
-        next_month_day = (datetime.now() + timedelta(days=30)).day
-        next_month_year = (datetime.now() + timedelta(days=30)).year
+        next_month = get_clock().now().month + 1
+        next_month_day = (get_clock().now() + timedelta(days=30)).day
+        next_month_year = (get_clock().now() + timedelta(days=30)).year
 
         change_value_of_date(driver, '//legend[contains(.//text(), "What is your desired start date?") or contains(.//text(), "When are you available to begin?")]/following-sibling::div//input[contains(@id, "dateSectionMonth")]', 0, next_month)
         change_value_of_date(driver, '//legend[contains(.//text(), "What is your desired start date?") or contains(.//text(), "When are you available to begin?")]/following-sibling::div//input[contains(@id, "dateSectionDay")]', 0, next_month_day)
@@ -1745,21 +2886,21 @@ def check_and_fill_application_questions(driver):
     except Exception as e:
         logger.warning(f"Could not fill application questions field: {str(e)}")
 
-def check_and_fill_disability(driver):
+def check_and_fill_disability(driver, candidate=DEFAULT_CANDIDATE):
     """
     Checks if the disability field is present on the page and fills it if it is.
     """
     try:
         # Replace manual clear/send_keys with safe_send_keys
-        safe_send_keys(driver, '//input[@id="selfIdentifiedDisabilityData--name"]', PROFILE_DATA['complete_name'])
+        safe_send_keys(driver, '//input[@id="selfIdentifiedDisabilityData--name"]', candidate.profile['complete_name'])
         logger.info("Disability Name Field filled with name")
         
         wait_here(2, 4)
         # Replace manual clear/send_keys with safe_send_keys
 
-        month = datetime.now().month
-        day = (datetime.now()).day
-        year = (datetime.now()).year
+        month = get_clock().now().month
+        day = (get_clock().now()).day
+        year = (get_clock().now()).year
 
         change_value_of_date(driver, '//input[@id="selfIdentifiedDisabilityData--dateSignedOn-dateSectionMonth-input"]', 0, month)
         change_value_of_date(driver, '//input[@id="selfIdentifiedDisabilityData--dateSignedOn-dateSectionDay-input"]', 0, day)
@@ -1780,7 +2921,7 @@ def check_and_fill_disability(driver):
         logger.warning(f"Could not fill disability field: {str(e)}")
 
 
-def check_and_fill_voluntry_disclosures(driver):
+def check_and_fill_voluntry_disclosures(driver, candidate=DEFAULT_CANDIDATE):
     """
     Check and Fill Voluntry Disclosure
     """
@@ -1792,7 +2933,7 @@ def check_and_fill_voluntry_disclosures(driver):
             asian_field = driver.find_element(By.XPATH, '//label[contains(text(), "Asian")]/preceding-sibling::div//input')
             driver.execute_script("arguments[0].click();", asian_field)
         except Exception as e:
-            print(f"Asian field not found - {repr(e)}")
+            logger.warning(f"Asian field not found - {repr(e)}")
 
         if open_and_click_dropdown(driver, xpath_to_search='//button[@id="personalInfoUS--gender"]', value_to_click=['Male'], text_to_print='Not Found - I am not a veteran'):
             wait_here(3, 5)
@@ -1809,6 +2950,68 @@ def check_and_fill_voluntry_disclosures(driver):
     return
 
 
+# Page type (as reported by get_page_fingerprint) -> filler for that wizard page
+PAGE_HANDLERS = {
+    'application_questions': check_and_fill_application_questions,
+    'disability': check_and_fill_disability,
+    'voluntary_disclosures': check_and_fill_voluntry_disclosures,
+}
+
+
+def check_import_time(runs=3):
+    """
+    Measures the cumulative import time of this module in a fresh interpreter (best of runs)
+    and compares it against IMPORT_TIME_BUDGET_MS
+
+    Returns:
+        bool: True if the import is within budget
+    """
+    module_name = os.path.splitext(os.path.basename(__file__))[0]
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module_name}'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True, check=False)
+        for line in result.stderr.splitlines():
+            parts = [part.strip() for part in line.split('|')]
+            if len(parts) == 3 and parts[2] == module_name:
+                timings.append(int(parts[1]) / 1000)
+
+    if not timings:
+        logger.error(f"Could not measure import time of {module_name}")
+        return False
+
+    import_time_ms = min(timings)
+    if import_time_ms > IMPORT_TIME_BUDGET_MS:
+        logger.error(f"Import of {module_name} took {import_time_ms:.0f} ms - over budget of {IMPORT_TIME_BUDGET_MS} ms")
+        return False
+    logger.info(f"Import of {module_name} took {import_time_ms:.0f} ms - budget {IMPORT_TIME_BUDGET_MS} ms")
+    return True
+
+
 if __name__ == '__main__':
-    # Process all jobs from the CSV file
-    process_all_jobs('jobs.csv')
+    parser = argparse.ArgumentParser(description='Apply to the Workday jobs listed in a CSV or Excel file')
+    parser.add_argument('file_path', nargs='?', default='jobs.csv', help='CSV or Excel file with the job URLs (default: jobs.csv)')
+    parser.add_argument('--budget-minutes', type=float, default=RUN_BUDGET_MINUTES, help='Only run the jobs expected to fit in this many minutes (default: RUN_BUDGET_MINUTES)')
+    parser.add_argument('--shared', action='store_true', default=SHARED_LEDGER, help='Share the jobs file with other processes by claiming jobs with leases (default: SHARED_LEDGER)')
+    parser.add_argument('--partition', default=LEDGER_PARTITION, help='With --shared, only take the companies of this partition, e.g. 0/3 (default: LEDGER_PARTITION)')
+    parser.add_argument('--rank', action='store_true', default=RANK_JOBS, help='Apply to the jobs whose descriptions match the profile best first (default: RANK_JOBS)')
+    parser.add_argument('--min-score', type=float, default=RANK_MIN_SCORE, help='With --rank, leave jobs with a lower relevance (0-1) pending (default: RANK_MIN_SCORE)')
+    parser.add_argument('--candidates', action='store_true', help='Apply for every candidate of CANDIDATES_FILE, each with its own jobs file (file_path is ignored)')
+    parser.add_argument('--workers', type=int, default=CANDIDATE_WORKERS, help='With --candidates, browsers running at the same time (default: CANDIDATE_WORKERS)')
+    parser.add_argument('--refresh-profile-template', action='store_true', help='Rebuild the Firefox profile template from PROFILE_PATH (e.g. after logging in again)')
+    parser.add_argument('--check-import-time', action='store_true', help='Fail if importing this module is slower than IMPORT_TIME_BUDGET_MS')
+    args = parser.parse_args()
+
+    if args.check_import_time:
+        sys.exit(0 if check_import_time() else 1)
+
+    candidates = load_candidates(CANDIDATES_FILE, PROFILE_TEMPLATE_DIR) if args.candidates else [DEFAULT_CANDIDATE]
+    if args.refresh_profile_template:
+        for candidate in candidates:
+            build_template(candidate.template_dir, candidate.browser_profile)
+
+    if args.candidates:
+        process_candidates(candidates, args.workers, args.budget_minutes, args.shared, args.partition, args.rank, args.min_score)
+    else:
+        # Process all jobs from the CSV file
+        process_all_jobs(args.file_path, args.budget_minutes, args.shared, args.partition, args.rank, args.min_score)
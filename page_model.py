@@ -0,0 +1,179 @@
+# pylint: disable=locally-disabled, line-too-long, logging-fstring-interpolation, broad-exception-caught
+"""
+Form model from captured network traffic (Chrome only).
+
+Workday's application pages are rendered from JSON page definitions that the SPA fetches. With Chrome's
+performance log enabled, the JSON responses are read through the DevTools protocol and turned into a model
+of the page - fields, questions and their options - so fillers can tell what is on a page without probing
+the DOM. The page definitions are not a documented format: fields are recognized by their shape (an input
+widget/type with an id or label), and whenever no usable model exists the callers fall back to the DOM.
+"""
+
+import json
+import logging
+import re
+from urllib.parse import urlparse
+
+logger = logging.getLogger('__name__')
+
+# Keys naming the kind of input of a node in a page definition
+WIDGET_KEYS = ('widget', 'type', 'inputType', 'fieldType')
+# Keys identifying a field
+ID_KEYS = ('id', 'propertyName', 'automationId', 'name', 'ecid', 'iid', 'fieldId')
+LABEL_KEYS = ('label', 'labelText', 'question', 'text', 'descriptor')
+OPTION_LIST_KEYS = ('values', 'options', 'instances', 'items', 'answers')
+OPTION_TEXT_KEYS = ('text', 'label', 'descriptor', 'displayValue', 'value')
+INPUT_WIDGETS = re.compile(r'input|select|prompt|radio|checkbox|text|date|dropdown|multiselect|boolean|file', re.IGNORECASE)
+# A response is a page definition if it describes at least this many fields
+MIN_PAGE_FIELDS = 3
+MAX_BODY_BYTES = 5 * 1024 * 1024
+
+
+def _first(node, keys):
+    for key in keys:
+        value = node.get(key)
+        if isinstance(value, (str, int)) and str(value).strip():
+            return str(value).strip()
+    return ''
+
+
+def _options(node):
+    for key in OPTION_LIST_KEYS:
+        values = node.get(key)
+        if isinstance(values, list):
+            options = [_first(value, OPTION_TEXT_KEYS) for value in values if isinstance(value, dict)]
+            options = [option for option in options if option]
+            if options:
+                return options
+    return []
+
+
+def extract_fields(payload):
+    """
+    Walks a JSON payload and returns the nodes that look like form fields
+
+    Returns:
+        list: Dicts with id, label, widget, required and options
+    """
+    fields = []
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+            continue
+        if not isinstance(node, dict):
+            continue
+        widget = _first(node, WIDGET_KEYS)
+        field_id = _first(node, ID_KEYS)
+        label = _first(node, LABEL_KEYS)
+        if widget and INPUT_WIDGETS.search(widget) and (field_id or label):
+            fields.append({
+                'id': field_id,
+                'label': label,
+                'widget': widget,
+                'required': bool(node.get('required')),
+                'options': _options(node),
+            })
+        stack.extend(value for value in node.values() if isinstance(value, (dict, list)))
+    return fields
+
+
+class PageModel:
+    """
+    This class answers what is on the current page from the fields of its page definition.
+    """
+    def __init__(self, fields, source_url=''):
+        self.fields = fields
+        self.source_url = source_url
+
+    def has_field(self, name):
+        """
+        True if a field id ends with name (Workday ids look like legalName--firstName), case-insensitive
+        """
+        name = name.lower()
+        return any(field['id'].lower().endswith(name) for field in self.fields if field['id'])
+
+    def has_questions(self):
+        """
+        True if the definition describes choice questions (fields with options) - only then can the absence
+        of a question be trusted
+        """
+        return any(field['options'] for field in self.fields)
+
+    def find_question(self, text):
+        """
+        Returns the field whose label contains text (case-insensitive), None if there is none
+        """
+        text = text.lower()
+        for field in self.fields:
+            if text in field['label'].lower():
+                return field
+        return None
+
+
+class NetworkCapture:
+    """
+    This class reads the JSON responses of the current tenant from Chrome's performance log and keeps the
+    model of the most recent page definition.
+    """
+    def __init__(self, driver):
+        self.driver = driver
+        self.model = None
+        self.enabled = True
+
+    def poll(self):
+        """
+        Processes the responses received since the last poll
+
+        Returns:
+            PageModel: Model of the latest page definition, None if none was captured
+        """
+        if not self.enabled:
+            return self.model
+        try:
+            entries = self.driver.get_log('performance')
+            tenant = urlparse(self.driver.current_url).netloc
+        except Exception as exc:
+            # Not Chrome, or the performance log was not requested - DOM probing only from now on
+            logger.info(f"Network capture not available - {repr(exc)}")
+            self.enabled = False
+            return None
+
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+                if message.get('method') != 'Network.responseReceived':
+                    continue
+                response = message['params']['response']
+                if 'json' not in response.get('mimeType', '') or urlparse(response['url']).netloc != tenant:
+                    continue
+                if int(response.get('encodedDataLength') or 0) > MAX_BODY_BYTES:
+                    continue
+                body = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': message['params']['requestId']})
+                fields = extract_fields(json.loads(body.get('body') or 'null'))
+                if len(fields) >= MIN_PAGE_FIELDS:
+                    self.model = PageModel(fields, response['url'])
+                    logger.info(f"Captured page definition with {len(fields)} fields from {response['url']}")
+            except Exception:
+                # Bodies of finished navigations are no longer available - skip them
+                continue
+        return self.model
+
+
+def reset_page_model(driver):
+    """
+    Forgets the model of the current page - call right before leaving it, so a stale model is never used
+    """
+    capture = getattr(driver, 'network_capture', None)
+    if capture:
+        capture.poll()
+        capture.model = None
+
+
+def current_page_model(driver):
+    """
+    Returns the model of the current page if network capture is on for driver, else None
+    """
+    capture = getattr(driver, 'network_capture', None)
+    return capture.poll() if capture else None
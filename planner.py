@@ -0,0 +1,148 @@
+# pylint: disable=locally-disabled, line-too-long, logging-fstring-interpolation, broad-exception-caught
+"""
+Deadline-aware run planning.
+
+Every finished job records its duration and outcome for its tenant. Before and during a run the planner
+estimates the cost and success probability of each pending job from that history and picks the jobs that
+give the most expected applications within the time budget, cheapest expected success first.
+"""
+
+import logging
+import statistics
+from datetime import timedelta
+
+from clock import get_clock
+from tenant_cache import get_tenant
+
+logger = logging.getLogger('__name__')
+
+# Durations kept per tenant - recent runs reflect the current form best
+HISTORY_SIZE = 20
+# Estimate for a tenant (and a run) without any history
+DEFAULT_DURATION_SECONDS = 600
+# Weight (in pseudo-attempts) of the overall success rate in a tenant's estimate
+PRIOR_WEIGHT = 2
+
+
+class RunPlanner:
+    """
+    This class estimates job costs from past runs and plans which pending jobs fit in the remaining time.
+    """
+    def __init__(self, history, budget_seconds=0, overhead_seconds=0):
+        """
+        Args:
+            history (TenantCache): Store of the per-tenant run statistics
+            budget_seconds (float): Wall-clock budget of the run, 0 for no limit
+            overhead_seconds (float): Time spent between two jobs (e.g. the pause between applications)
+        """
+        self.history = history
+        self.overhead_seconds = overhead_seconds
+        self.deadline = get_clock().monotonic() + budget_seconds if budget_seconds else None
+        self.last_plan = None
+
+    def record(self, job_url, duration, success):
+        """
+        Adds the outcome of a finished job to its tenant's statistics
+        """
+        tenant = get_tenant(job_url)
+        stats = self.history.get(tenant, 'runs', {'durations': [], 'attempts': 0, 'successes': 0})
+        stats['durations'] = (stats['durations'] + [round(duration, 1)])[-HISTORY_SIZE:]
+        stats['attempts'] += 1
+        stats['successes'] += int(bool(success))
+        self.history.set(tenant, 'runs', stats)
+
+    def _all_stats(self, tenants):
+        return {tenant: self.history.get(tenant, 'runs') for tenant in tenants}
+
+    def estimate(self, job_url, overall=None):
+        """
+        Expected duration (s) and success probability of a job
+
+        Args:
+            job_url (str): The job
+            overall (dict): Pooled statistics of all tenants, see _pooled()
+
+        Returns:
+            tuple: (duration_seconds, success_probability)
+        """
+        overall = overall or self._pooled([job_url])
+        stats = self.history.get(get_tenant(job_url), 'runs')
+        if not stats or not stats['attempts']:
+            return overall['duration'], overall['success_rate']
+        duration = statistics.median(stats['durations']) if stats['durations'] else overall['duration']
+        success_rate = (stats['successes'] + PRIOR_WEIGHT * overall['success_rate']) / (stats['attempts'] + PRIOR_WEIGHT)
+        return duration, success_rate
+
+    def _pooled(self, job_urls):
+        """
+        Statistics over every known tenant, used for tenants without history
+        """
+        durations, attempts, successes = [], 0, 0
+        tenants = set(self.history.tenants()) | {get_tenant(job_url) for job_url in job_urls}
+        for stats in self._all_stats(tenants).values():
+            if stats:
+                durations.extend(stats['durations'])
+                attempts += stats['attempts']
+                successes += stats['successes']
+        return {
+            'duration': statistics.median(durations) if durations else DEFAULT_DURATION_SECONDS,
+            # Laplace smoothing keeps a first run from planning with 0 % or 100 %
+            'success_rate': (successes + 1) / (attempts + 2),
+        }
+
+    def remaining_seconds(self):
+        """
+        Time left until the deadline, None without a budget
+        """
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - get_clock().monotonic())
+
+    def plan(self, job_urls):
+        """
+        Chooses and orders the jobs to run in the remaining time
+
+        Without a budget every job is planned in file order. With a budget jobs are taken greedily by
+        expected successes per second until the time is used up.
+
+        Returns:
+            list: One dict per planned job with url, tenant, duration and success_rate
+        """
+        overall = self._pooled(job_urls)
+        candidates = []
+        for position, job_url in enumerate(job_urls):
+            duration, success_rate = self.estimate(job_url, overall)
+            candidates.append({'url': job_url, 'tenant': get_tenant(job_url), 'duration': duration, 'success_rate': success_rate, 'position': position})
+
+        remaining = self.remaining_seconds()
+        if remaining is None:
+            return candidates
+
+        candidates.sort(key=lambda job: (-job['success_rate'] / (job['duration'] + self.overhead_seconds), job['position']))
+        planned, used = [], 0.0
+        for job in candidates:
+            cost = job['duration'] + (self.overhead_seconds if planned else 0)
+            if used + cost <= remaining:
+                planned.append(job)
+                used += cost
+        return planned
+
+    def log_plan(self, plan, total_pending):
+        """
+        Prints the plan with the expected successes and ETA when it differs from the previous one
+        """
+        urls = [job['url'] for job in plan]
+        if urls == self.last_plan:
+            return
+        self.last_plan = urls
+
+        seconds = sum(job['duration'] for job in plan) + self.overhead_seconds * max(0, len(plan) - 1)
+        eta = (get_clock().now() + timedelta(seconds=seconds)).strftime('%H:%M')
+        remaining = self.remaining_seconds()
+        budget_text = f" of {timedelta(seconds=round(remaining))} left" if remaining is not None else ''
+        logger.info(f"\n=== Run Plan: {len(plan)}/{total_pending} jobs, ~{sum(job['success_rate'] for job in plan):.1f} expected applications, "
+                    f"~{timedelta(seconds=round(seconds))}{budget_text}, ETA {eta} ===")
+        for index, job in enumerate(plan):
+            logger.info(f"{index + 1:>3}. {job['tenant']:<40} ~{job['duration'] / 60:.1f} min, {job['success_rate'] * 100:.0f}% success")
+        if len(plan) < total_pending:
+            logger.info(f"{total_pending - len(plan)} job(s) do not fit in the budget and stay pending")
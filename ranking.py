@@ -0,0 +1,333 @@
+# pylint: disable=locally-disabled, line-too-long, logging-fstring-interpolation, broad-exception-caught
+"""
+Job-to-profile relevance ranking.
+
+Before applying, the description of every pending job is fetched and tokenized once (kept in a term index
+on disk) and compared with the profile (skills, work experiences, projects) by TF-IDF cosine similarity. The whole
+queue is scored in one pass of NumPy array operations, so thousands of cached postings rank in well under a
+second. Jobs asking for clearly more years of experience than the profile has are scored down. The fetcher is
+any callable job_url -> description text, so it can be replaced (e.g. by a stub returning fixed texts).
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from tenant_cache import get_tenant, posting_path
+
+logger = logging.getLogger('__name__')
+
+TOKEN_PATTERN = re.compile(r'[a-z][a-z0-9+#]*(?:\.[a-z]+)?')
+STOP_WORDS = frozenset((
+    'a an and are as at be been by for from has have in is it its of on or our that the their this to was were will with '
+    'you your we us who what which while within work working team teams role job including such other all any can may must '
+    'able new more well across strong experience years year'
+).split())
+# "5+ years", "3-5 years", "7 or more years"
+YEARS_PATTERN = re.compile(r'(\d{1,2})\s*(?:\+|-\s*\d{1,2}|or more)?\s*years?', re.IGNORECASE)
+MAX_PLAUSIBLE_YEARS = 20
+# Years a job may ask for beyond the profile before it is scored down, and by how much
+EXPERIENCE_SLACK_YEARS = 2
+EXPERIENCE_PENALTY = 0.5
+FETCH_WORKERS = 8
+FETCH_TIMEOUT = 20
+
+
+def posting_key(job_url):
+    """
+    Key of a posting in the term index: tenant and posting path
+    """
+    return get_tenant(job_url) + posting_path(job_url)
+
+
+def fetch_workday_description(job_url):
+    """
+    Default fetcher: reads the posting from the JSON endpoint the Workday career site itself uses
+
+    Returns:
+        str: Title and description as plain text
+    """
+    import urllib.request
+    from bs4 import BeautifulSoup
+
+    parsed = urlparse(job_url)
+    parts = [part for part in posting_path(job_url).split('/') if part]
+    # Optional locale prefix, e.g. /en-US/External/job/...
+    if parts and re.fullmatch(r'[a-z]{2}-[A-Z]{2}', parts[0]):
+        parts = parts[1:]
+    if len(parts) < 3 or parts[1] != 'job':
+        raise ValueError(f"Not a Workday job posting URL: {job_url}")
+    company = parsed.netloc.split('.')[0]
+    api_url = f"{parsed.scheme}://{parsed.netloc}/wday/cxs/{company}/{parts[0]}/{'/'.join(parts[1:])}"
+
+    request = urllib.request.Request(api_url, headers={'Accept': 'application/json', 'User-Agent': 'Mozilla/5.0'})
+    with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT) as response:
+        posting = json.load(response).get('jobPostingInfo', {})
+    description = BeautifulSoup(posting.get('jobDescription', ''), 'html.parser').get_text(' ')
+    return f"{posting.get('title', '')}\n{description}"
+
+
+def profile_text(profile):
+    """
+    The parts of the profile a job description is compared with
+    """
+    parts = list(profile.get('skills', []))
+    for experience in profile.get('work_experiences', []):
+        parts.extend([experience.get('job_title', ''), experience.get('role_description', '')])
+    for project in profile.get('projects', []):
+        parts.extend([project.get('title', ''), project.get('description', '')] + list(project.get('technologies', [])))
+    return '\n'.join(part for part in parts if part)
+
+
+def parse_years(text):
+    """
+    '5+' -> 5, '' -> None
+    """
+    match = re.search(r'\d+', str(text or ''))
+    return int(match.group()) if match else None
+
+
+def required_years(description):
+    """
+    Highest plausible "N years" a description asks for, None if it names none
+    """
+    years = [int(value) for value in YEARS_PATTERN.findall(description) if 0 < int(value) <= MAX_PLAUSIBLE_YEARS]
+    return max(years) if years else None
+
+
+def tokenize(text):
+    """
+    Lowercase terms of a text without stop words (keeps c++, c#, node.js)
+    """
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS and len(token) > 1]
+
+
+class TermIndex:
+    """
+    This class keeps the tokenized descriptions of all fetched postings in one NumPy file: a vocabulary and,
+    per posting, its term ids and counts (a sparse row) and the years of experience it asks for. Loading it is
+    a few array reads, so cached postings are never tokenized again. Rankers of several threads share one index
+    by holding lock while they use it.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.RLock()
+        self._rows = None
+        self._vocabulary = None
+        self._terms = []
+        self._counts = []
+        self._years = []
+        self._dirty = False
+
+    def _load(self):
+        with self.lock:
+            if self._rows is None:
+                self._read()
+
+    def _read(self):
+        import numpy as np
+
+        self._rows, self._vocabulary, vocabulary = {}, {}, []
+        try:
+            with np.load(self.path, allow_pickle=False) as index:
+                keys = index['keys'].tolist()
+                vocabulary = index['vocabulary'].tolist()
+                offsets = index['offsets'][1:-1]
+                self._terms = np.split(index['terms'], offsets)
+                self._counts = np.split(index['counts'], offsets)
+                self._years = index['years'].tolist()
+            self._rows = {key: row for row, key in enumerate(keys)}
+        except FileNotFoundError:
+            pass
+        except Exception as exc:
+            logger.warning(f"Could not read term index {self.path}, starting empty - {repr(exc)}")
+            self._rows, vocabulary = {}, []
+            self._terms, self._counts, self._years = [], [], []
+        self._vocabulary = {term: term_id for term_id, term in enumerate(vocabulary)}
+
+    def __contains__(self, key):
+        self._load()
+        return key in self._rows
+
+    def term_ids(self, text):
+        """
+        Vocabulary ids of the terms of text (new terms are added to the vocabulary)
+        """
+        import numpy as np
+
+        self._load()
+        vocabulary = self._vocabulary
+        return np.fromiter((vocabulary.setdefault(token, len(vocabulary)) for token in tokenize(text)), dtype=np.int32)
+
+    def add(self, key, text):
+        """
+        Tokenizes text and stores it as the row of key
+        """
+        import numpy as np
+
+        terms, counts = np.unique(self.term_ids(text), return_counts=True)
+        self._rows[key] = len(self._terms)
+        self._terms.append(terms.astype(np.int32))
+        self._counts.append(counts.astype(np.int32))
+        self._years.append(required_years(text) or 0)
+        self._dirty = True
+
+    def vocabulary_size(self):
+        """
+        Number of distinct terms seen so far
+        """
+        self._load()
+        return len(self._vocabulary)
+
+    def rows(self, keys):
+        """
+        Sparse rows of keys, flattened
+
+        Returns:
+            tuple: (document index, term id, count) arrays of all (document, term) pairs, and the years asked per document
+        """
+        import numpy as np
+
+        self._load()
+        rows = [self._rows[key] for key in keys]
+        terms = [self._terms[row] for row in rows]
+        documents = np.repeat(np.arange(len(rows)), [len(row_terms) for row_terms in terms])
+        years = np.array([self._years[row] for row in rows])
+        return documents, np.concatenate(terms), np.concatenate([self._counts[row] for row in rows]), years
+
+    def save(self):
+        """
+        Writes the index atomically if postings were added
+        """
+        if not self._dirty:
+            return
+        import numpy as np
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        keys = sorted(self._rows, key=self._rows.get)
+        offsets = np.cumsum([0] + [len(terms) for terms in self._terms])
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as index_file:
+            np.savez(index_file, keys=np.array(keys, dtype=str), vocabulary=np.array(sorted(self._vocabulary, key=self._vocabulary.get), dtype=str),
+                     offsets=offsets, terms=np.concatenate(self._terms), counts=np.concatenate(self._counts), years=np.array(self._years, dtype=np.int16))
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+
+class RelevanceRanker:
+    """
+    This class scores pending jobs against the profile and orders or filters the queue by that score.
+    """
+    def __init__(self, profile, index, fetcher=fetch_workday_description, min_score=0.0):
+        """
+        Args:
+            profile (dict): The applicant profile
+            index (TermIndex): Store of the fetched (tokenized) descriptions
+            fetcher (callable): job_url -> description text
+            min_score (float): Jobs scoring below this are dropped from the queue (0 = reorder only)
+        """
+        self.profile = profile
+        self.index = index
+        self.fetcher = fetcher
+        self.min_score = min_score
+        self.scores = {}
+        # Jobs whose description could not be fetched in this run
+        self._unavailable = set()
+
+    def fetch_missing(self, job_urls):
+        """
+        Fetches (in parallel) and indexes the descriptions of job_urls that are not in the index yet
+        """
+        missing = [job_url for job_url in job_urls if posting_key(job_url) not in self.index and job_url not in self._unavailable]
+        if not missing:
+            return
+
+        def fetch(job_url):
+            try:
+                return self.fetcher(job_url)
+            except Exception as exc:
+                logger.warning(f"Could not fetch description of {job_url}: {repr(exc)}")
+                return None
+
+        logger.info(f"Fetching {len(missing)} job description(s)")
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix='description') as executor:
+            texts = list(executor.map(fetch, missing))
+        with self.index.lock:
+            for job_url, text in zip(missing, texts):
+                if text:
+                    self.index.add(posting_key(job_url), text)
+                else:
+                    self._unavailable.add(job_url)
+            self.index.save()
+
+    def score(self, job_urls):
+        """
+        Scores job_urls against the profile: cosine similarity of log-scaled TF-IDF vectors, with the IDF
+        taken over the queue itself
+
+        Returns:
+            dict: {job_url: score between 0 and 1}, jobs without a description are left out
+        """
+        import numpy as np
+
+        self.fetch_missing(job_urls)
+        with self.index.lock:
+            urls = [job_url for job_url in job_urls if posting_key(job_url) in self.index]
+            if not urls:
+                return {}
+            profile_terms = self.index.term_ids(profile_text(self.profile))
+            documents, terms, counts, years = self.index.rows([posting_key(job_url) for job_url in urls])
+            vocabulary_size = self.index.vocabulary_size()
+
+        document_frequency = np.bincount(terms, minlength=vocabulary_size)
+        idf = np.log((1 + len(urls)) / (1 + document_frequency)) + 1
+        weights = (1 + np.log(counts)) * idf[terms]
+
+        profile_weights = np.zeros(vocabulary_size)
+        profile_counts = np.bincount(profile_terms, minlength=vocabulary_size)
+        present = profile_counts > 0
+        profile_weights[present] = (1 + np.log(profile_counts[present])) * idf[present]
+
+        dots = np.bincount(documents, weights=weights * profile_weights[terms], minlength=len(urls))
+        norms = np.sqrt(np.bincount(documents, weights=weights ** 2, minlength=len(urls)))
+        similarity = dots / np.maximum(norms * np.linalg.norm(profile_weights), 1e-12)
+
+        profile_years = parse_years(self.profile.get('years_of_experience'))
+        if profile_years is not None:
+            similarity = np.where(years > profile_years + EXPERIENCE_SLACK_YEARS, similarity * EXPERIENCE_PENALTY, similarity)
+
+        scores = dict(zip(urls, similarity.round(4).tolist()))
+        self.scores.update(scores)
+        return scores
+
+    def rank(self, job_urls):
+        """
+        Orders job_urls by score (best first) and drops the ones below min_score. Jobs without a description
+        keep their relative order after the scored ones and are never dropped.
+
+        Returns:
+            list: The ranked job URLs
+        """
+        if any(job_url not in self.scores and job_url not in self._unavailable for job_url in job_urls):
+            self.score(job_urls)
+        scored = sorted((job_url for job_url in job_urls if job_url in self.scores), key=lambda job_url: -self.scores[job_url])
+        kept = [job_url for job_url in scored if self.scores[job_url] >= self.min_score]
+        dropped = len(scored) - len(kept)
+        if dropped:
+            logger.info(f"Skipping {dropped} job(s) with relevance below {self.min_score}")
+        return kept + [job_url for job_url in job_urls if job_url not in self.scores]
+
+    def log_ranking(self, job_urls, limit=20):
+        """
+        Prints the best scored jobs of job_urls
+        """
+        logger.info(f"\n=== Relevance Ranking: {len(job_urls)} jobs ===")
+        for index, job_url in enumerate(job_urls[:limit]):
+            score = self.scores.get(job_url)
+            logger.info(f"{index + 1:>3}. {'   -' if score is None else f'{score:.2f}'}  {job_url}")
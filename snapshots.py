@@ -0,0 +1,272 @@
+# pylint: disable=locally-disabled, line-too-long, logging-fstring-interpolation, broad-exception-caught
+"""
+Page snapshot recorder and offline replay harness.
+
+The recorder stores the DOM of every wizard step gzip-compressed and content addressed
+(data/snapshots/blobs/<sha256>.html.gz) together with a per-job manifest of the steps and the
+actions that were run on them (data/snapshots/jobs/<job_id>.json).
+
+The replay harness serves those snapshots from a local HTTP server and loads them into a headless
+browser so a filler can be run and timed without going through the live application flow:
+
+    python snapshots.py list <job_id>
+    python snapshots.py replay <job_id> <step> <filler_name> [--repeat N]
+    python snapshots.py diff <digest_a> <digest_b>
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from clock import get_clock
+
+SNAPSHOT_DIR = 'data/snapshots'
+
+logger = logging.getLogger('__name__')
+
+
+class SnapshotRecorder:
+    """
+    This class records the DOM of each wizard step and the actions taken on it for one job.
+    """
+    def __init__(self, job_id, job_url='', root=SNAPSHOT_DIR):
+        self.job_id = job_id
+        self.job_url = job_url
+        self.root = root
+        self.steps = []
+        os.makedirs(os.path.join(root, 'blobs'), exist_ok=True)
+        os.makedirs(os.path.join(root, 'jobs'), exist_ok=True)
+
+    def record(self, driver, label, fingerprint=None, actions=None):
+        """
+        Saves the current DOM and appends the step to the job manifest
+
+        Args:
+            driver: WebDriver instance
+            label (str): Name of the step (usually the page type)
+            fingerprint (dict): Page fingerprint of the step, if known
+            actions (list): Names of the fillers run on this step
+
+        Returns:
+            str: Content digest of the stored DOM, or None if recording failed
+        """
+        try:
+            digest = store_blob(driver.page_source, self.root)
+            self.steps.append({
+                'step': len(self.steps),
+                'label': label,
+                'url': driver.current_url,
+                'blob': digest,
+                'signature': (fingerprint or {}).get('signature', ''),
+                'actions': list(actions or []),
+                'recorded_at': get_clock().now().strftime('%Y-%m-%d %H:%M:%S'),
+            })
+            self._write_manifest()
+            return digest
+        except Exception as exc:
+            logger.warning(f"Could not record snapshot for {label}: {repr(exc)}")
+        return None
+
+    def _write_manifest(self):
+        manifest_path = os.path.join(self.root, 'jobs', f'{self.job_id}.json')
+        tmp_path = f'{manifest_path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as manifest_file:
+            json.dump({'job_id': self.job_id, 'job_url': self.job_url, 'steps': self.steps}, manifest_file, indent=2)
+        os.replace(tmp_path, manifest_path)
+
+
+def store_blob(html, root=SNAPSHOT_DIR):
+    """
+    Stores html compressed under its sha256 digest (identical pages are stored once)
+    """
+    data = html.encode('utf-8')
+    digest = hashlib.sha256(data).hexdigest()
+    blob_path = os.path.join(root, 'blobs', f'{digest}.html.gz')
+    if not os.path.exists(blob_path):
+        tmp_path = f'{blob_path}.{threading.get_ident()}.tmp'
+        with gzip.open(tmp_path, 'wb', compresslevel=6) as blob_file:
+            blob_file.write(data)
+        os.replace(tmp_path, blob_path)
+    return digest
+
+
+def load_blob(digest, root=SNAPSHOT_DIR):
+    """
+    Returns the html stored under digest
+    """
+    with gzip.open(os.path.join(root, 'blobs', f'{digest}.html.gz'), 'rb') as blob_file:
+        return blob_file.read().decode('utf-8')
+
+
+def load_manifest(job_id, root=SNAPSHOT_DIR):
+    """
+    Returns the manifest recorded for job_id
+    """
+    with open(os.path.join(root, 'jobs', f'{job_id}.json'), encoding='utf-8') as manifest_file:
+        return json.load(manifest_file)
+
+
+def make_offline_html(html):
+    """
+    Strips scripts and external resources so a snapshot renders without reaching the tenant
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    for tag in soup.find_all(['script', 'iframe', 'noscript']):
+        tag.decompose()
+    for tag in soup.find_all('link', rel=lambda rel: rel and 'stylesheet' not in rel):
+        tag.decompose()
+    return str(soup)
+
+
+def structure_signature(html):
+    """
+    Returns the set of automation ids / element ids in a page, used for structure diffs between tenants
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    signature = set()
+    for tag in soup.find_all(attrs={'data-automation-id': True}):
+        signature.add(f"{tag.name}[data-automation-id={tag['data-automation-id']}]")
+    for tag in soup.find_all(id=True):
+        signature.add(f"{tag.name}#{tag['id']}")
+    return signature
+
+
+def diff_structure(html_a, html_b):
+    """
+    Compares the structure of two pages
+
+    Returns:
+        dict: Elements only present in the first page ('removed') and only in the second one ('added')
+    """
+    signature_a = structure_signature(html_a)
+    signature_b = structure_signature(html_b)
+    return {'removed': sorted(signature_a - signature_b), 'added': sorted(signature_b - signature_a)}
+
+
+def serve_snapshots(root=SNAPSHOT_DIR):
+    """
+    Starts a local file server for the snapshots on a free port, serving /<digest>.html
+
+    Returns:
+        tuple: (server, base_url) - call server.shutdown() when done
+    """
+    import http.server
+
+    class SnapshotRequestHandler(http.server.BaseHTTPRequestHandler):
+        """
+        Serves the offline version of a stored snapshot
+        """
+        def do_GET(self):
+            digest = self.path.strip('/').split('.', 1)[0]
+            try:
+                body = make_offline_html(load_blob(digest, root)).encode('utf-8')
+            except FileNotFoundError:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+            return
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), SnapshotRequestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def make_headless_driver():
+    """
+    Makes a headless Chrome for replays
+    """
+    from selenium import webdriver
+
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless=new')
+    options.add_argument('--window-size=1920,1080')
+    return webdriver.Chrome(options=options)
+
+
+def replay(job_id, step, filler, root=SNAPSHOT_DIR, repeat=1):
+    """
+    Loads a recorded step into a headless browser and runs filler(driver) on it
+
+    Args:
+        job_id (str): Job whose manifest to use
+        step (int): Index of the step in the manifest
+        filler (callable): Function taking the driver, e.g. check_and_fill_voluntry_disclosures
+        repeat (int): Number of timed runs (the page is reloaded before each run)
+
+    Returns:
+        list: Duration of each run in seconds
+    """
+    manifest = load_manifest(job_id, root)
+    digest = manifest['steps'][step]['blob']
+    server, base_url = serve_snapshots(root)
+    driver = make_headless_driver()
+    durations = []
+    try:
+        for _ in range(repeat):
+            driver.get(f'{base_url}/{digest}.html')
+            started = time.perf_counter()
+            filler(driver)
+            durations.append(time.perf_counter() - started)
+            logger.info(f"Replayed {getattr(filler, '__name__', filler)} on step {step} of {job_id} in {durations[-1]:.2f}s")
+    finally:
+        driver.quit()
+        server.shutdown()
+    return durations
+
+
+def main():
+    """
+    Command line entry point
+    """
+    parser = argparse.ArgumentParser(description='Inspect and replay recorded wizard snapshots')
+    parser.add_argument('--root', default=SNAPSHOT_DIR)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    list_parser = commands.add_parser('list', help='List the recorded steps of a job')
+    list_parser.add_argument('job_id')
+
+    replay_parser = commands.add_parser('replay', help='Run a filler on a recorded step')
+    replay_parser.add_argument('job_id')
+    replay_parser.add_argument('step', type=int)
+    replay_parser.add_argument('filler', help='Name of a function in my_work_day_job_applier')
+    replay_parser.add_argument('--repeat', type=int, default=1)
+
+    diff_parser = commands.add_parser('diff', help='Structure diff of two recorded pages')
+    diff_parser.add_argument('digest_a')
+    diff_parser.add_argument('digest_b')
+
+    args = parser.parse_args()
+
+    if args.command == 'list':
+        for step in load_manifest(args.job_id, args.root)['steps']:
+            print(f"{step['step']:>3}  {step['label']:<24} {step['blob'][:12]}  {', '.join(step['actions'])}")
+    elif args.command == 'replay':
+        import my_work_day_job_applier
+        filler = getattr(my_work_day_job_applier, args.filler)
+        durations = replay(args.job_id, args.step, filler, args.root, args.repeat)
+        print(f"{args.filler}: best {min(durations):.2f}s, mean {sum(durations) / len(durations):.2f}s over {len(durations)} run(s)")
+    elif args.command == 'diff':
+        diff = diff_structure(load_blob(args.digest_a, args.root), load_blob(args.digest_b, args.root))
+        for element in diff['removed']:
+            print(f"- {element}")
+        for element in diff['added']:
+            print(f"+ {element}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,371 @@
+# pylint: disable=locally-disabled, line-too-long, logging-fstring-interpolation, broad-exception-caught
+"""
+Worker resource supervision.
+
+Tracks the browser process tree (driver, browser and its helpers) and temporary profile directories
+of every worker, enforces RSS and age limits, reaps browsers left behind by crashed runs and reports
+per-worker resource usage. Process inspection needs psutil; without it only temp-profile cleanup and
+driver.quit() are done.
+"""
+
+import glob
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - optional dependency
+    psutil = None
+
+logger = logging.getLogger('__name__')
+
+DRIVER_PROCESS_NAMES = ('chromedriver', 'geckodriver')
+# Command line markers of browsers started by a WebDriver
+AUTOMATION_MARKERS = ('--enable-automation', '--test-type=webdriver', '-marionette', '--marionette')
+# Assumed size of a browser before any has been measured
+DEFAULT_BROWSER_MB = 1024
+# Temporary profiles created by Selenium, chromedriver and geckodriver
+TEMP_PROFILE_PATTERNS = ('rust_mozprofile*', '.org.chromium.Chromium.*', '.com.google.Chrome.*', 'scoped_dir*', 'tmp*/webdriver-py-profilecopy', 'workday-profile-*')
+# Profiles cloned by this tool (firefox_profile.CLONE_PREFIX) - the only ones removed when it cannot be
+# checked which directories live processes use
+OWN_PROFILE_PATTERNS = ('workday-profile-*',)
+
+
+def _is_temp_path(path):
+    """
+    Only directories inside the system temp directory are ever removed
+    """
+    temp_root = os.path.realpath(tempfile.gettempdir())
+    real_path = os.path.realpath(path)
+    return real_path != temp_root and real_path.startswith(temp_root + os.sep)
+
+
+def _profile_dirs_from_cmdline(cmdline):
+    """
+    Extracts the profile directory a browser was started with
+    """
+    dirs = []
+    for index, arg in enumerate(cmdline):
+        if arg.startswith('--user-data-dir='):
+            dirs.append(arg.split('=', 1)[1])
+        elif arg in ('-profile', '--profile') and index + 1 < len(cmdline):
+            dirs.append(cmdline[index + 1])
+    return dirs
+
+
+def _temp_paths_in_use():
+    """
+    Temp directories referenced on the command line of any live process (profiles, extensions), None
+    without psutil
+    """
+    if psutil is None:
+        return None
+    temp_root = os.path.realpath(tempfile.gettempdir())
+    in_use = set()
+    for process in psutil.process_iter(['cmdline']):
+        try:
+            cmdline = process.info['cmdline'] or []
+        except psutil.Error:
+            continue
+        args = _profile_dirs_from_cmdline(cmdline) + [arg.split('=', 1)[-1] for arg in cmdline]
+        in_use.update(os.path.realpath(arg) for arg in args if arg and os.path.realpath(arg).startswith(temp_root + os.sep))
+    return in_use
+
+
+def _is_in_use(path, in_use):
+    """
+    True if path or anything inside it is in in_use
+    """
+    return any(used == path or used.startswith(path + os.sep) for used in in_use)
+
+
+class WorkerResources:
+    """
+    This class holds what one worker's browser owns: its process tree root and temp directories.
+    """
+    def __init__(self, worker, driver, root_pid, temp_dirs):
+        self.worker = worker
+        self.driver = driver
+        self.root_pid = root_pid
+        self.temp_dirs = set(temp_dirs)
+        self.started_at = time.monotonic()
+        self.peak_rss_mb = 0.0
+        self.kill_reason = ''
+
+    def processes(self):
+        """
+        Live processes of the browser tree (empty without psutil)
+        """
+        if psutil is None or not self.root_pid:
+            return []
+        try:
+            root = psutil.Process(self.root_pid)
+            return [root] + root.children(recursive=True)
+        except psutil.Error:
+            return []
+
+    def usage(self):
+        """
+        Current RSS (MB), age (s) and process count of the tree
+        """
+        rss = 0
+        processes = self.processes()
+        for process in processes:
+            try:
+                rss += process.memory_info().rss
+                for profile_dir in _profile_dirs_from_cmdline(process.cmdline()):
+                    if _is_temp_path(profile_dir):
+                        self.temp_dirs.add(profile_dir)
+            except psutil.Error:
+                continue
+        rss_mb = rss / (1024 * 1024)
+        self.peak_rss_mb = max(self.peak_rss_mb, rss_mb)
+        return {'rss_mb': round(rss_mb, 1), 'peak_rss_mb': round(self.peak_rss_mb, 1), 'age_s': round(time.monotonic() - self.started_at), 'processes': len(processes)}
+
+
+class BrowserSupervisor:
+    """
+    This class supervises the browsers of all workers. A monitor thread enforces the RSS and age limits by
+    killing the offending browser tree; release() tears a worker's browser down completely.
+    """
+    def __init__(self, max_rss_mb, max_age_seconds, poll_interval=10):
+        self.max_rss_mb = max_rss_mb
+        self.max_age_seconds = max_age_seconds
+        self.poll_interval = poll_interval
+        self.workers = {}
+        self.history = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._warned = False
+
+    def register(self, worker, driver):
+        """
+        Starts tracking the browser of a worker (call right after the driver is created)
+        """
+        if psutil is None and not self._warned:
+            self._warned = True
+            logger.warning("psutil is not installed - browser RSS/age limits and orphan reaping are disabled")
+        service_process = getattr(getattr(driver, 'service', None), 'process', None)
+        root_pid = getattr(service_process, 'pid', None)
+        resources = WorkerResources(worker, driver, root_pid, [])
+        resources.usage()
+        with self._lock:
+            self.workers[worker] = resources
+        return resources
+
+    def transfer(self, worker, new_worker):
+        """
+        Hands a tracked browser over to another worker (e.g. a prefetched one to the worker that uses it).
+        The age limit counts from the hand-over.
+        """
+        with self._lock:
+            resources = self.workers.pop(worker, None)
+            if resources is None:
+                return None
+            resources.worker = new_worker
+            resources.started_at = time.monotonic()
+            self.workers[new_worker] = resources
+        return resources
+
+    def available_memory_mb(self):
+        """
+        Memory available for new processes, None without psutil
+        """
+        if psutil is None:
+            return None
+        return psutil.virtual_memory().available / (1024 * 1024)
+
+    def expected_browser_mb(self):
+        """
+        Largest peak RSS of a browser seen so far (DEFAULT_BROWSER_MB before the first measurement)
+        """
+        with self._lock:
+            peaks = [usage['peak_rss_mb'] for usage in self.history] + [resources.peak_rss_mb for resources in self.workers.values()]
+        return max([peak for peak in peaks if peak] or [DEFAULT_BROWSER_MB])
+
+    def kill_reason(self, worker):
+        """
+        Why the supervisor killed the worker's browser, empty if it did not
+        """
+        with self._lock:
+            resources = self.workers.get(worker)
+        return resources.kill_reason if resources else ''
+
+    def _kill_tree(self, resources):
+        processes = resources.processes()
+        for process in reversed(processes):
+            try:
+                process.kill()
+            except psutil.Error:
+                continue
+        if processes:
+            psutil.wait_procs(processes, timeout=5)
+
+    def release(self, worker):
+        """
+        Quits the worker's browser, kills whatever survived and removes its temp profiles
+
+        Returns:
+            dict: Final resource usage of the worker, None if it was not tracked
+        """
+        with self._lock:
+            resources = self.workers.pop(worker, None)
+        if resources is None:
+            return None
+
+        usage = resources.usage()
+        try:
+            resources.driver.quit()
+        except Exception:
+            pass
+        self._kill_tree(resources)
+        for temp_dir in resources.temp_dirs:
+            if _is_temp_path(temp_dir):
+                shutil.rmtree(temp_dir, ignore_errors=True)
+
+        usage.update({'worker': worker, 'kill_reason': resources.kill_reason})
+        with self._lock:
+            self.history.append(usage)
+        logger.info(f"Worker {worker} released - peak RSS {usage['peak_rss_mb']} MB, age {usage['age_s']}s, {usage['processes']} processes")
+        return usage
+
+    def usage(self):
+        """
+        Current resource usage per worker
+        """
+        with self._lock:
+            workers = list(self.workers.values())
+        return {resources.worker: resources.usage() for resources in workers}
+
+    def enforce_limits(self):
+        """
+        Kills browser trees above the RSS or age limit
+        """
+        with self._lock:
+            workers = list(self.workers.values())
+        for resources in workers:
+            usage = resources.usage()
+            if self.max_rss_mb and usage['rss_mb'] > self.max_rss_mb:
+                resources.kill_reason = f"Browser killed - RSS {usage['rss_mb']} MB over limit of {self.max_rss_mb} MB"
+            elif self.max_age_seconds and usage['age_s'] > self.max_age_seconds:
+                resources.kill_reason = f"Browser killed - running for {usage['age_s']}s, limit is {self.max_age_seconds}s"
+            else:
+                continue
+            logger.error(f"Worker {resources.worker}: {resources.kill_reason}")
+            self._kill_tree(resources)
+
+    def _monitor(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.enforce_limits()
+            except Exception as exc:
+                logger.warning(f"Resource monitor failed: {repr(exc)}")
+
+    def start(self):
+        """
+        Starts the monitor thread (once)
+        """
+        if psutil is not None and self._thread is None:
+            self._thread = threading.Thread(target=self._monitor, name='browser-supervisor', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops the monitor thread
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_interval)
+            self._thread = None
+        self._stop.clear()
+
+    def reap_orphans(self):
+        """
+        Kills WebDriver drivers and automated browsers whose parent process is gone and that no worker tracks
+
+        Returns:
+            int: Number of processes killed
+        """
+        if psutil is None:
+            return 0
+        with self._lock:
+            tracked = {process.pid for resources in self.workers.values() for process in resources.processes()}
+
+        orphans = []
+        username = psutil.Process().username()
+        for process in psutil.process_iter(['pid', 'name', 'cmdline', 'ppid', 'username']):
+            try:
+                info = process.info
+                if info['pid'] in tracked or info['username'] != username:
+                    continue
+                name = (info['name'] or '').lower()
+                cmdline = info['cmdline'] or []
+                is_driver = any(driver_name in name for driver_name in DRIVER_PROCESS_NAMES)
+                is_automated_browser = any(marker in cmdline for marker in AUTOMATION_MARKERS)
+                parent_alive = info['ppid'] not in (0, 1) and psutil.pid_exists(info['ppid'])
+                if (is_driver or is_automated_browser) and not parent_alive:
+                    orphans.append(process)
+            except psutil.Error:
+                continue
+
+        for process in orphans:
+            try:
+                for child in process.children(recursive=True):
+                    child.kill()
+                process.kill()
+                logger.info(f"Reaped orphaned process {process.pid} ({process.info['name']})")
+            except psutil.Error:
+                continue
+        return len(orphans)
+
+    def clean_temp_profiles(self, min_age_seconds=600):
+        """
+        Removes temp profiles left behind by earlier runs. A profile's mtime does not change while its browser
+        runs, so a directory is only removed when no live process (other runs, the user's own browser) has
+        it on its command line; without psutil only the profiles cloned by this tool are considered.
+
+        Returns:
+            int: Number of directories removed
+        """
+        with self._lock:
+            in_use = {os.path.realpath(temp_dir) for resources in self.workers.values() for temp_dir in resources.temp_dirs}
+        live_paths = _temp_paths_in_use()
+        if live_paths is not None:
+            in_use |= live_paths
+
+        removed = 0
+        now = time.time()
+        for pattern in TEMP_PROFILE_PATTERNS if live_paths is not None else OWN_PROFILE_PATTERNS:
+            for path in glob.glob(os.path.join(tempfile.gettempdir(), pattern)):
+                # Remove the whole mkdtemp() directory around a Selenium profile copy
+                if path.endswith('webdriver-py-profilecopy'):
+                    path = os.path.dirname(path)
+                try:
+                    if _is_in_use(os.path.realpath(path), in_use) or now - os.path.getmtime(path) < min_age_seconds:
+                        continue
+                except OSError:
+                    continue
+                if os.path.isdir(path) and _is_temp_path(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                    removed += 1
+        if removed:
+            logger.info(f"Removed {removed} leftover temporary browser profiles")
+        return removed
+
+    def report(self):
+        """
+        Logs the resource usage of every released and running worker
+        """
+        logger.info("\n=== Worker Resource Usage ===")
+        with self._lock:
+            history = list(self.history)
+        for usage in history:
+            logger.info(f"{usage['worker']}: peak RSS {usage['peak_rss_mb']} MB, age {usage['age_s']}s{' - ' + usage['kill_reason'] if usage['kill_reason'] else ''}")
+        for worker, usage in self.usage().items():
+            logger.info(f"{worker} (running): RSS {usage['rss_mb']} MB, age {usage['age_s']}s, {usage['processes']} processes")
@@ -0,0 +1,113 @@
+# pylint: disable=locally-disabled, line-too-long, logging-fstring-interpolation, broad-exception-caught
+"""
+Persistent per-tenant key/value store backed by a JSON file.
+
+Tenants are Workday hosts (e.g. relx.wd3.myworkdayjobs.com). Everything learned about a tenant
+(form schema, dropdown options, typeahead resolutions, navigation patterns) is kept here so later
+applications to the same tenant can skip work.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from urllib.parse import urlparse
+
+from file_lock import FileLock
+
+logger = logging.getLogger('__name__')
+
+
+def get_tenant(url):
+    """
+    Returns the tenant (Workday host) of a url
+    """
+    return urlparse(url or '').netloc.lower()
+
+
+def posting_path(job_url):
+    """
+    Path of a job posting up to its id, without /apply... and query parameters
+    """
+    return re.sub(r'/apply(/.*)?$', '', urlparse(job_url or '').path.rstrip('/'))
+
+
+class TenantCache:
+    """
+    This class keeps {tenant: {key: value}} in a JSON file. The file is read on first use; every change is
+    merged into the file's current content under a lock file and written back atomically, so processes
+    sharing the cache keep what the others learned.
+    """
+    def __init__(self, file):
+        self.file = file
+        self._data = None
+        self._lock = threading.RLock()
+
+    def _read(self):
+        try:
+            with open(self.file, encoding='utf-8') as cache_file:
+                return json.load(cache_file)
+        except FileNotFoundError:
+            return {}
+        except Exception as exc:
+            logger.warning(f"Could not read tenant cache {self.file}, starting empty - {repr(exc)}")
+            return {}
+
+    def _load(self):
+        if self._data is None:
+            self._data = self._read()
+        return self._data
+
+    def _save(self, change):
+        """
+        Applies change(data) to the current content of the file and writes it back, returns what change returned
+        """
+        directory = os.path.dirname(self.file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with FileLock(f'{self.file}.lock'):
+            data = self._read()
+            result = change(data)
+            tmp_path = f'{self.file}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as cache_file:
+                json.dump(data, cache_file, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.file)
+        self._data = data
+        return result
+
+    def get(self, tenant, key, default=None):
+        """
+        Returns the value stored for tenant/key
+        """
+        with self._lock:
+            return self._load().get(tenant, {}).get(key, default)
+
+    def set(self, tenant, key, value):
+        """
+        Stores value for tenant/key and persists the cache
+        """
+        def change(data):
+            data.setdefault(tenant, {})[key] = value
+
+        with self._lock:
+            self._save(change)
+
+    def update(self, tenant, key, mapping):
+        """
+        Merges mapping into the dict stored for tenant/key and persists the cache
+        """
+        def change(data):
+            current = data.setdefault(tenant, {}).setdefault(key, {})
+            current.update(mapping)
+            return current
+
+        with self._lock:
+            return self._save(change)
+
+    def tenants(self):
+        """
+        Returns all tenants in the cache
+        """
+        with self._lock:
+            return list(self._load())